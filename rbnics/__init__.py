@@ -24,6 +24,7 @@ from rbnics.utils.config import config
 
 # Import the minimum subset of RBniCS required to run tutorials
 from rbnics.eim.problems import DEIM, EIM, ExactParametrizedFunctions
+from rbnics.problems.base import OnlineEvaluationEngine
 from rbnics.problems.elliptic import EllipticCoerciveCompliantProblem, EllipticCoerciveProblem, EllipticProblem
 from rbnics.problems.elliptic_optimal_control import EllipticOptimalControlProblem
 from rbnics.problems.navier_stokes import NavierStokesProblem
@@ -34,7 +35,7 @@ from rbnics.problems.parabolic import ParabolicCoerciveProblem, ParabolicProblem
 from rbnics.problems.stokes import StokesProblem
 from rbnics.problems.stokes_optimal_control import StokesOptimalControlProblem
 from rbnics.problems.stokes_unsteady import StokesUnsteadyProblem
-from rbnics.sampling.distributions import DrawFrom, EquispacedDistribution, LogEquispacedDistribution, LogUniformDistribution, UniformDistribution
+from rbnics.sampling.distributions import DrawFrom, EquispacedDistribution, HaltonDistribution, LatinHypercubeDistribution, LogEquispacedDistribution, LogUniformDistribution, SobolDistribution, UniformDistribution
 from rbnics.scm.problems import ExactStabilityFactor, SCM
 from rbnics.shape_parametrization.problems import AffineShapeParametrization, ShapeParametrization
 from rbnics.utils.decorators import CustomizeReducedProblemFor, CustomizeReductionMethodFor, exact_problem
@@ -46,6 +47,7 @@ __all__ += [
     'EIM',
     'ExactParametrizedFunctions',
     # rbnics.problems
+    'OnlineEvaluationEngine',
     'EllipticCoerciveCompliantProblem',
     'EllipticCoerciveProblem',
     'EllipticOptimalControlProblem',
@@ -62,8 +64,11 @@ __all__ += [
     # rbnics.sampling
     'DrawFrom',
     'EquispacedDistribution',
+    'HaltonDistribution',
+    'LatinHypercubeDistribution',
     'LogEquispacedDistribution',
     'LogUniformDistribution',
+    'SobolDistribution',
     'UniformDistribution',
     # rbnics.scm
     'ExactStabilityFactor',
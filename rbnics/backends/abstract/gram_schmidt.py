@@ -28,3 +28,9 @@ class GramSchmidt(object, metaclass=ABCMeta):
     @abstractmethod
     def apply(self, new_basis_function, basis_functions, component=None):
         pass
+        
+    # Apply Gram Schmidt procedure to orthonormalize several new basis functions at once, both with respect
+    # to the provided basis functions matrix and among themselves
+    @abstractmethod
+    def apply_block(self, new_basis_functions, basis_functions, component=None):
+        pass
@@ -34,6 +34,20 @@ class LinearProgramSolver(object, metaclass=ABCMeta):
         """
         pass
         
+    @abstractmethod
+    def set_cost(self, cost):
+        """
+        Replace the cost vector c.
+        """
+        pass
+        
+    @abstractmethod
+    def set_inequality_constraints(self, inequality_constraints_matrix, inequality_constraints_vector):
+        """
+        Replace the inequality constraints A x >= b, preserving bound constraints.
+        """
+        pass
+        
     @abstractmethod
     def solve(self):
         pass
@@ -36,6 +36,11 @@ class LinearSolver(object, metaclass=ABCMeta):
     def solve(self):
         pass
         
+    # Solve for several right-hand sides, reusing the factorization of the left-hand side, and return a list of solutions
+    @abstractmethod
+    def solve_block(self, rhs_block):
+        pass
+        
 class LinearProblemWrapper(object, metaclass=ABCMeta):
     @abstractmethod
     def matrix_eval(self):
@@ -34,6 +34,7 @@ def BasisFunctionsMatrix(backend, wrapping, online_backend, online_wrapping):
             self._components = dict() # of FunctionsList
             self._precomputed_sub_components = Cache() # from tuple to FunctionsList
             self._precomputed_slices = Cache() # from tuple to FunctionsList
+            self._precomputed_dense_matrix = None # dense matrix storing all basis functions, possibly built by backends for block linear algebra
             self._components_name = list() # filled in by init
             self._component_name_to_basis_component_index = ComponentNameToBasisComponentIndexDict() # filled in by init
             self._component_name_to_basis_component_length = OnlineSizeDict()
@@ -58,6 +59,8 @@ def BasisFunctionsMatrix(backend, wrapping, online_backend, online_wrapping):
                 self._precomputed_sub_components.clear()
                 # Reset precomputed slices
                 self._precomputed_slices.clear()
+                # Reset precomputed dense matrix
+                self._precomputed_dense_matrix = None
                 # Patch FunctionsList.enrich() to update internal attributes
                 def patch_functions_list_enrich(component_name, functions_list):
                     original_functions_list_enrich = functions_list.enrich
@@ -82,6 +85,8 @@ def BasisFunctionsMatrix(backend, wrapping, online_backend, online_wrapping):
                         self._precomputed_slices.clear()
                         # Prepare trivial precomputed slice
                         self._prepare_trivial_precomputed_slice()
+                        # Reset precomputed dense matrix
+                        self._precomputed_dense_matrix = None
                     functions_list.enrich_patch = PatchInstanceMethod(functions_list, "enrich", patched_functions_list_enrich)
                     functions_list.enrich_patch.patch()
                 for component_name in components_name:
@@ -195,6 +200,8 @@ def BasisFunctionsMatrix(backend, wrapping, online_backend, online_wrapping):
             self._precomputed_slices.clear()
             # Prepare trivial precomputed slice
             self._prepare_trivial_precomputed_slice()
+            # Reset precomputed dense matrix
+            self._precomputed_dense_matrix = None
             # Return
             return return_value
             
@@ -255,6 +262,8 @@ def BasisFunctionsMatrix(backend, wrapping, online_backend, online_wrapping):
             assert len(self._components) == 1, "Cannot set components, only single functions. Did you mean to call __getitem__ to extract a component and __setitem__ of a single function on that component?"
             assert len(self._components_name) == 1
             self._components[self._components_name[0]][key] = item
+            # Reset precomputed dense matrix
+            self._precomputed_dense_matrix = None
         
         @overload(None, int)
         def _precompute_slice(self, _, N_stop):
@@ -22,7 +22,7 @@ def evaluate(backend, wrapping, online_backend, online_wrapping):
     class _Evaluate(object):
         @overload(backend.Function.Type(), (backend.ReducedMesh, backend.ReducedVertices))
         def __call__(self, function, at):
-            return wrapping.evaluate_sparse_function_at_dofs(function, at.get_dofs_list())
+            return wrapping.evaluate_sparse_function_at_dofs(function, at.get_dofs_list(), at.get_dofs_list_communication())
         
         @overload(backend.FunctionsList, (backend.ReducedMesh, backend.ReducedVertices))
         def __call__(self, functions_list, at):
@@ -42,20 +42,20 @@ def evaluate(backend, wrapping, online_backend, online_wrapping):
         def __call__(self, parametrized_expression, at):
             # Efficient version, interpolating only on the reduced mesh
             interpolated_expression = wrapping.expression_on_reduced_mesh(parametrized_expression, at)
-            return wrapping.evaluate_sparse_function_at_dofs(interpolated_expression, at.get_reduced_dofs_list())
+            return wrapping.evaluate_sparse_function_at_dofs(interpolated_expression, at.get_reduced_dofs_list(), at.get_reduced_dofs_list_communication())
             """
             # Inefficient version, interpolating on the entire high fidelity mesh
             interpolated_expression = wrapping.expression_on_truth_mesh(parametrized_expression)
-            return wrapping.evaluate_sparse_function_at_dofs(interpolated_expression, at.get_dofs_list())
+            return wrapping.evaluate_sparse_function_at_dofs(interpolated_expression, at.get_dofs_list(), at.get_dofs_list_communication())
             """
         
         @overload(backend.Matrix.Type(), backend.ReducedMesh)
         def __call__(self, matrix, at):
-            return wrapping.evaluate_and_vectorize_sparse_matrix_at_dofs(matrix, at.get_dofs_list())
+            return wrapping.evaluate_and_vectorize_sparse_matrix_at_dofs(matrix, at.get_dofs_list(), at.get_dofs_list_communication())
         
         @overload(backend.Vector.Type(), backend.ReducedMesh)
         def __call__(self, vector, at):
-            return wrapping.evaluate_sparse_vector_at_dofs(vector, at.get_dofs_list())
+            return wrapping.evaluate_sparse_vector_at_dofs(vector, at.get_dofs_list(), at.get_dofs_list_communication())
         
         @overload(backend.TensorsList, backend.ReducedMesh)
         def __call__(self, tensors_list, at):
@@ -78,9 +78,9 @@ def evaluate(backend, wrapping, online_backend, online_wrapping):
             (assembled_form, form_rank) = wrapping.form_on_reduced_function_space(parametrized_tensor, at)
             assert form_rank in (1, 2)
             if form_rank == 2:
-                return wrapping.evaluate_and_vectorize_sparse_matrix_at_dofs(assembled_form, at.get_reduced_dofs_list())
+                return wrapping.evaluate_and_vectorize_sparse_matrix_at_dofs(assembled_form, at.get_reduced_dofs_list(), at.get_reduced_dofs_list_communication())
             elif form_rank == 1:
-                return wrapping.evaluate_sparse_vector_at_dofs(assembled_form, at.get_reduced_dofs_list())
+                return wrapping.evaluate_sparse_vector_at_dofs(assembled_form, at.get_reduced_dofs_list(), at.get_reduced_dofs_list_communication())
             else: # impossible to arrive here anyway thanks to the assert
                 raise ValueError("Invalid form rank")
             """
@@ -88,9 +88,9 @@ def evaluate(backend, wrapping, online_backend, online_wrapping):
             (assembled_form, form_rank) = wrapping.form_on_truth_function_space(parametrized_tensor)
             assert form_rank in (1, 2)
             if form_rank == 2:
-                return wrapping.evaluate_and_vectorize_sparse_matrix_at_dofs(assembled_form, at.get_dofs_list())
+                return wrapping.evaluate_and_vectorize_sparse_matrix_at_dofs(assembled_form, at.get_dofs_list(), at.get_dofs_list_communication())
             elif form_rank == 1:
-                return wrapping.evaluate_sparse_vector_at_dofs(assembled_form, at.get_dofs_list())
+                return wrapping.evaluate_sparse_vector_at_dofs(assembled_form, at.get_dofs_list(), at.get_dofs_list_communication())
             else: # impossible to arrive here anyway thanks to the assert
                 raise ValueError("Invalid form rank")
             """
@@ -30,19 +30,34 @@ def GramSchmidt(backend, wrapping):
             self.inner_product = inner_product
             
         def apply(self, new_basis_function, basis_functions, component=None):
+            return self.apply_block([new_basis_function], basis_functions, component)[0]
+            
+        def apply_block(self, new_basis_functions, basis_functions, component=None):
             inner_product = self.inner_product
             
             transpose = backend.transpose
             
-            new_basis_function = self._extend_or_restrict_if_needed(new_basis_function, component)
-
-            for b in basis_functions:
-                new_basis_function = wrapping.gram_schmidt_projection_step(new_basis_function, inner_product, b, transpose)
-            norm_new_basis_function = sqrt(transpose(new_basis_function)*inner_product*new_basis_function)
-            if norm_new_basis_function != 0.:
-                new_basis_function /= norm_new_basis_function
+            new_basis_functions = [self._extend_or_restrict_if_needed(new_basis_function, component) for new_basis_function in new_basis_functions]
+            # Local rows of old basis functions, stored once as columns of a dense array, which will also store
+            # the new basis functions as soon as they are orthonormalized
+            previous_basis_functions_local_array = wrapping.gram_schmidt_block_local_array(basis_functions, new_basis_functions)
+            N_old = previous_basis_functions_local_array.shape[1] - len(new_basis_functions)
+            orthonormalized_new_basis_functions = list()
+            for (n, new_basis_function) in enumerate(new_basis_functions):
+                # Classical Gram-Schmidt with respect to old basis functions and to the new basis functions already
+                # orthonormalized, requiring only one product with the inner product matrix. The procedure is
+                # carried out twice (reorthogonalization), which guarantees orthogonality up to machine precision
+                if N_old + n > 0:
+                    for _ in range(2):
+                        inner_product_times_new_basis_function = wrapping.matrix_mul_vector(inner_product, wrapping.function_to_vector(new_basis_function))
+                        new_basis_function = wrapping.gram_schmidt_block_projection_step(new_basis_function, inner_product_times_new_basis_function, previous_basis_functions_local_array[:, :N_old + n])
+                norm_new_basis_function = sqrt(transpose(new_basis_function)*inner_product*new_basis_function)
+                if norm_new_basis_function != 0.:
+                    new_basis_function /= norm_new_basis_function
+                wrapping.gram_schmidt_block_store(new_basis_function, previous_basis_functions_local_array, N_old + n)
+                orthonormalized_new_basis_functions.append(new_basis_function)
                 
-            return new_basis_function
+            return orthonormalized_new_basis_functions
             
         @overload(backend.Function.Type(), (None, str))
         def _extend_or_restrict_if_needed(self, function, component):
@@ -17,7 +17,8 @@
 #
 
 from math import sqrt
-from numpy import abs, cumsum as compute_retained_energy, isclose, sum as compute_total_energy
+from numpy import abs, asarray, cumsum as compute_retained_energy, diag, isclose, sum as compute_total_energy, zeros
+from numpy.linalg import svd
 from rbnics.utils.io import ExportableList
 
 # Class containing the implementation of the POD
@@ -34,17 +35,108 @@ def ProperOrthogonalDecompositionBase(backend, wrapping, online_backend, online_
             # Declare a list to store eigenvalues
             self.eigenvalues = ExportableList("text")
             self.retained_energy = ExportableList("text")
+            # Incremental SVD is disabled by default, see set_incremental_svd_rank
+            self.incremental_svd_rank = None
             
         def clear(self):
             self.snapshots_matrix.clear()
             self.eigenvalues = ExportableList("text")
             self.retained_energy = ExportableList("text")
+            if self.incremental_svd_rank is not None:
+                self._init_incremental_svd()
+            
+        def set_incremental_svd_rank(self, incremental_svd_rank):
+            """
+            Switch to an incremental SVD, which processes snapshots one at a time while storing
+            at most incremental_svd_rank modes, rather than the whole snapshots matrix.
+            """
+            assert len(self.snapshots_matrix) == 0, "Incremental SVD must be enabled before storing snapshots"
+            assert incremental_svd_rank > 0
+            self.incremental_svd_rank = incremental_svd_rank
+            self._init_incremental_svd()
+            
+        def _init_incremental_svd(self):
+            self.incremental_svd_modes = SnapshotsContainerType(self.space, *self.args)
+            self.incremental_svd_singular_values = zeros(0)
+            self.incremental_svd_right_singular_vectors = zeros((0, 0))
+            self.incremental_svd_total_energy = 0.
             
         # No implementation is provided for store_snapshot, because
         # it has different interface for the standard POD and
-        # the tensor one.
+        # the tensor one. Derived classes supporting the incremental SVD
+        # should call _store_snapshot_incrementally instead of enriching
+        # the snapshots matrix when incremental_svd_rank is not None.
+        
+        # Brand's update of the thin SVD of the (inner product weighted) snapshots matrix:
+        # given the current modes U and singular values s, the new snapshot is split in its
+        # projection p = U^T X snapshot and in the residual r = snapshot - U p, then the small matrix
+        #     K = [diag(s) p; 0 ||r||]
+        # is decomposed as K = U_K s_K V_K^T, so that the updated modes are [U, r/||r||] U_K,
+        # and the updated right singular vectors are [V 0; 0 1] V_K.
+        def _store_snapshot_incrementally(self, snapshot, component, weight):
+            # Store (weighted) copies of the snapshot, which may actually contain several functions
+            # (e.g., a time trajectory), and process them one at a time. Copies are overwritten with residuals
+            snapshots = SnapshotsContainerType(self.space, *self.args)
+            snapshots.enrich(snapshot, component, weight)
+            for residual in snapshots:
+                self._store_function_incrementally(residual)
+                
+        def _store_function_incrementally(self, residual):
+            inner_product = self.inner_product
+            transpose = backend.transpose
+            modes = self.incremental_svd_modes
+            singular_values = self.incremental_svd_singular_values
+            right_singular_vectors = self.incremental_svd_right_singular_vectors
+            assert inner_product is not None
+            
+            self.incremental_svd_total_energy += abs(transpose(residual)*inner_product*residual)
+            
+            # Compute projection and residual, orthogonalizing twice for stability
+            k = len(modes)
+            if k > 0:
+                projection = asarray(transpose(modes)*inner_product*residual)
+                for _ in range(2):
+                    for mode in modes:
+                        residual = wrapping.gram_schmidt_projection_step(residual, inner_product, mode, transpose)
+            else:
+                projection = zeros(0)
+            residual_norm = sqrt(abs(transpose(residual)*inner_product*residual))
+            if residual_norm > 1.e-12*sqrt(self.incremental_svd_total_energy):
+                residual /= residual_norm
+            else:
+                residual_norm = 0.
+            
+            # Decompose the small matrix K
+            K = zeros((k + 1, k + 1))
+            K[:k, :k] = diag(singular_values)
+            K[:k, k] = projection
+            K[k, k] = residual_norm
+            (U_K, singular_values_K, V_K_T) = svd(K)
+            
+            # Truncate to the target rank, discarding vanishing singular values
+            new_k = min(self.incremental_svd_rank, k + 1)
+            while new_k > 0 and singular_values_K[new_k - 1] <= 1.e-12*singular_values_K[0]:
+                new_k -= 1
+            rotation = online_backend.OnlineMatrix(k + 1, new_k)
+            for i in range(k + 1):
+                for j in range(new_k):
+                    rotation[i, j] = U_K[i, j]
+            
+            # Update modes, singular values and right singular vectors
+            extended_modes = SnapshotsContainerType(self.space, *self.args)
+            extended_modes.enrich(modes, copy=False)
+            extended_modes.enrich(residual, copy=False)
+            self.incremental_svd_modes = extended_modes*rotation
+            self.incremental_svd_singular_values = singular_values_K[:new_k]
+            extended_right_singular_vectors = zeros((right_singular_vectors.shape[0] + 1, k + 1))
+            extended_right_singular_vectors[:-1, :k] = right_singular_vectors
+            extended_right_singular_vectors[-1, k] = 1.
+            self.incremental_svd_right_singular_vectors = extended_right_singular_vectors.dot(V_K_T.T[:, :new_k])
                 
         def apply(self, Nmax, tol):
+            if self.incremental_svd_rank is not None:
+                return self._apply_incremental_svd(Nmax, tol)
+            
             inner_product = self.inner_product
             snapshots_matrix = self.snapshots_matrix
             transpose = backend.transpose
@@ -97,10 +189,44 @@ def ProperOrthogonalDecompositionBase(backend, wrapping, online_backend, online_
             N += 1
             
             return (self.eigenvalues[:N], eigenvectors, basis_functions, N)
+            
+        # Eigenvectors of the correlation matrix are the right singular vectors of the (truncated)
+        # incremental SVD. Moreover, the retained energy is computed with respect to the energy of
+        # all stored snapshots, including the one discarded by truncation.
+        def _apply_incremental_svd(self, Nmax, tol):
+            modes = self.incremental_svd_modes
+            right_singular_vectors = self.incremental_svd_right_singular_vectors
+            
+            basis_functions = BasisContainerType(self.space, *self.args)
+            
+            Neigs = len(modes)
+            Nmax = min(Nmax, Neigs)
+            assert len(self.eigenvalues) == 0
+            self.eigenvalues.extend([singular_value**2 for singular_value in self.incremental_svd_singular_values])
+            
+            total_energy = self.incremental_svd_total_energy
+            retained_energy = compute_retained_energy(self.eigenvalues)
+            assert len(self.retained_energy) == 0
+            if total_energy > 0.:
+                self.retained_energy.extend([retained_energy_i/total_energy for retained_energy_i in retained_energy])
+            else:
+                self.retained_energy.extend([1. for _ in range(Neigs)]) # trivial case, all snapshots are zero
+            
+            eigenvectors = list()
+            for N in range(Nmax):
+                eigvector = online_backend.OnlineFunction(right_singular_vectors.shape[0])
+                eigvector.vector()[:] = right_singular_vectors[:, N]
+                eigenvectors.append(eigvector)
+                basis_functions.enrich(modes[N])
+                if self.retained_energy[N] > 1. - tol:
+                    break
+            N += 1
+            
+            return (self.eigenvalues[:N], eigenvectors, basis_functions, N)
                 
         def print_eigenvalues(self, N=None):
             if N is None:
-                N = len(self.snapshots_matrix)
+                N = len(self.eigenvalues)
             for i in range(N):
                 print("lambda_" + str(i) + " = " + str(self.eigenvalues[i]))
             
@@ -35,11 +35,8 @@ class Error(RuntimeError):
 class LinearProgramSolver(AbstractLinearProgramSolver):
     def __init__(self, cost, inequality_constraints_matrix, inequality_constraints_vector, bounds):
         self.Q = len(cost)
-        # Store cost
-        self.cost = cvxopt.matrix(cost)
-        # Store inequality constraints matrix, also including a 2*Q x 2*Q submatrix for bound constraints
-        self.inequality_constraints_matrix = cvxopt.matrix(vstack((- inequality_constraints_matrix, - eye(self.Q), eye(self.Q))))
-        # Store inequality constraints vector, also including 2*Q rows for bound constraints
+        # Store bound constraints, i.e. a 2*Q x Q submatrix and the corresponding 2*Q rows of the vector.
+        # These are copied only once into the inequality constraints storage of each size, see _get_storage
         assert len(bounds) == self.Q
         bounds_lower = zeros(self.Q)
         bounds_upper = zeros(self.Q)
@@ -47,7 +44,37 @@ class LinearProgramSolver(AbstractLinearProgramSolver):
             assert bounds_q[0] <= bounds_q[1]
             bounds_lower[q] = bounds_q[0]
             bounds_upper[q] = bounds_q[1]
-        self.inequality_constraints_vector = cvxopt.matrix(hstack((- inequality_constraints_vector, bounds_lower, bounds_upper)))
+        self.bounds_matrix = vstack((- eye(self.Q), eye(self.Q)))
+        self.bounds_vector = hstack((- bounds_lower, bounds_upper))
+        # Storage for inequality constraints (also including bound constraints), over the number of constraints
+        self._storage = dict()
+        # Store cost and inequality constraints
+        self.set_cost(cost)
+        self.set_inequality_constraints(inequality_constraints_matrix, inequality_constraints_vector)
+        
+    def set_cost(self, cost):
+        assert len(cost) == self.Q
+        self.cost = cvxopt.matrix(cost)
+        
+    # Inequality constraints are updated in place in a storage which already contains bound constraints, so that
+    # a linear program can be reused (e.g. by SCM for different parameters) without reassemblying the whole problem
+    def set_inequality_constraints(self, inequality_constraints_matrix, inequality_constraints_vector):
+        M = inequality_constraints_matrix.shape[0]
+        assert inequality_constraints_matrix.shape[1] == self.Q
+        assert len(inequality_constraints_vector) == M
+        (self.inequality_constraints_matrix, self.inequality_constraints_vector) = self._get_storage(M)
+        if M > 0:
+            self.inequality_constraints_matrix[:M, :] = cvxopt.matrix(- inequality_constraints_matrix)
+            self.inequality_constraints_vector[:M] = cvxopt.matrix(- inequality_constraints_vector)
+        
+    def _get_storage(self, M):
+        if M not in self._storage:
+            inequality_constraints_matrix = cvxopt.matrix(0., (M + 2*self.Q, self.Q))
+            inequality_constraints_matrix[M:, :] = cvxopt.matrix(self.bounds_matrix)
+            inequality_constraints_vector = cvxopt.matrix(0., (M + 2*self.Q, 1))
+            inequality_constraints_vector[M:] = cvxopt.matrix(self.bounds_vector)
+            self._storage[M] = (inequality_constraints_matrix, inequality_constraints_vector)
+        return self._storage[M]
         
     def solve(self):
         result = cvxopt.solvers.lp(self.cost, self.inequality_constraints_matrix, self.inequality_constraints_vector, solver="glpk", options={"glpk": {"msg_lev": "GLP_MSG_OFF"}})
@@ -23,11 +23,11 @@ from rbnics.backends.basic import GramSchmidt as BasicGramSchmidt
 from rbnics.backends.dolfin.function import Function
 from rbnics.backends.dolfin.matrix import Matrix
 from rbnics.backends.dolfin.transpose import transpose
-from rbnics.backends.dolfin.wrapping import function_extend_or_restrict, function_from_ufl_operators, get_function_subspace, gram_schmidt_projection_step
+from rbnics.backends.dolfin.wrapping import function_extend_or_restrict, function_from_ufl_operators, function_to_vector, get_function_subspace, gram_schmidt_block_local_array, gram_schmidt_block_projection_step, gram_schmidt_block_store, matrix_mul_vector
 from rbnics.utils.decorators import BackendFor, dict_of, ModuleWrapper, overload
 
 backend = ModuleWrapper(Function, transpose)
-wrapping = ModuleWrapper(function_extend_or_restrict, get_function_subspace, gram_schmidt_projection_step)
+wrapping = ModuleWrapper(function_extend_or_restrict, function_to_vector, get_function_subspace, gram_schmidt_block_local_array, gram_schmidt_block_projection_step, gram_schmidt_block_store, matrix_mul_vector)
 GramSchmidt_Base = BasicGramSchmidt(backend, wrapping)
 
 @BackendFor("dolfin", inputs=(FunctionSpace, (Form, Matrix.Type()), (str, None)))
@@ -41,4 +41,5 @@ class HighOrderProperOrthogonalDecomposition(HighOrderProperOrthogonalDecomposit
         HighOrderProperOrthogonalDecomposition_Base.__init__(self, V, None, empty_tensor)
         
     def store_snapshot(self, snapshot):
+        assert self.incremental_svd_rank is None, "Incremental SVD is not available for high order POD"
         self.snapshots_matrix.enrich(snapshot)
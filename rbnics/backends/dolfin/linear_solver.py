@@ -16,6 +16,7 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from petsc4py import PETSc
 from ufl import Form
 from dolfin import assemble, DirichletBC, PETScLUSolver
 from rbnics.backends.abstract import LinearSolver as AbstractLinearSolver, LinearProblemWrapper
@@ -24,6 +25,7 @@ from rbnics.backends.dolfin.function import Function
 from rbnics.backends.dolfin.matrix import Matrix
 from rbnics.backends.dolfin.parametrized_tensor_factory import ParametrizedTensorFactory
 from rbnics.backends.dolfin.vector import Vector
+from rbnics.backends.dolfin.wrapping import to_petsc4py
 from rbnics.backends.dolfin.wrapping.dirichlet_bc import ProductOutputDirichletBC
 from rbnics.utils.decorators import BackendFor, dict_of, list_of, overload
 
@@ -35,7 +37,9 @@ class LinearSolver(AbstractLinearSolver):
         self._init_lhs(lhs, bcs)
         self._init_rhs(rhs, bcs)
         self._apply_bcs(bcs)
+        self._bcs = bcs
         self._linear_solver = "default"
+        self._lu_solver = None # created (and factorized) at the first solve, and reused by the following ones
         self.monitor = None
         
     @overload(LinearProblemWrapper, Function.Type())
@@ -61,23 +65,26 @@ class LinearSolver(AbstractLinearSolver):
         # the original references when applying bcs
         self.lhs = lhs.copy()
         
+    def _init_rhs(self, rhs, bcs):
+        self.rhs = self._evaluate_rhs(rhs, bcs)
+        
     @overload
-    def _init_rhs(self, rhs: Form, bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)):
-        self.rhs = assemble(rhs)
+    def _evaluate_rhs(self, rhs: Form, bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)):
+        return assemble(rhs)
         
     @overload
-    def _init_rhs(self, rhs: ParametrizedTensorFactory, bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)):
-        self.rhs = evaluate(rhs)
+    def _evaluate_rhs(self, rhs: ParametrizedTensorFactory, bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)):
+        return evaluate(rhs)
         
     @overload
-    def _init_rhs(self, rhs: Vector.Type(), bcs: None):
-        self.rhs = rhs
+    def _evaluate_rhs(self, rhs: Vector.Type(), bcs: None):
+        return rhs
         
     @overload
-    def _init_rhs(self, rhs: Vector.Type(), bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC))):
+    def _evaluate_rhs(self, rhs: Vector.Type(), bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC))):
         # Create a copy of rhs, in order not to change
         # the original references when applying bcs
-        self.rhs = rhs.copy()
+        return rhs.copy()
         
     @overload
     def _apply_bcs(self, bcs: None):
@@ -94,14 +101,84 @@ class LinearSolver(AbstractLinearSolver):
             for bc in bcs[key]:
                 bc.apply(self.lhs, self.rhs)
                 
+    @overload
+    def _apply_bcs_to_rhs(self, rhs: Vector.Type(), bcs: None):
+        pass
+        
+    @overload
+    def _apply_bcs_to_rhs(self, rhs: Vector.Type(), bcs: (list_of(DirichletBC), ProductOutputDirichletBC)):
+        for bc in bcs:
+            bc.apply(rhs)
+            
+    @overload
+    def _apply_bcs_to_rhs(self, rhs: Vector.Type(), bcs: (dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC))):
+        for key in bcs:
+            for bc in bcs[key]:
+                bc.apply(rhs)
+                
     def set_parameters(self, parameters):
         assert len(parameters) in (0, 1)
         if len(parameters) == 1:
             assert "linear_solver" in parameters
-        self._linear_solver = parameters.get("linear_solver", "default")
+        linear_solver = parameters.get("linear_solver", "default")
+        if linear_solver != self._linear_solver:
+            self._linear_solver = linear_solver
+            self._lu_solver = None
+        
+    def _get_lu_solver(self):
+        if self._lu_solver is None:
+            self._lu_solver = PETScLUSolver(self._linear_solver)
+            self._lu_solver.set_operator(self.lhs)
+        return self._lu_solver
         
     def solve(self):
-        solver = PETScLUSolver(self._linear_solver)
-        solver.solve(self.lhs, self.solution.vector(), self.rhs)
+        self._get_lu_solver().solve(self.solution.vector(), self.rhs)
         if self.monitor is not None:
             self.monitor(self.solution)
+            
+    def solve_block(self, rhs_block):
+        """
+        Solve the linear system for each right-hand side in rhs_block, reusing the factorization of the left-hand side
+        (which is computed only once, even across several calls). Right-hand sides are solved at once as a dense block,
+        if supported by the LU solver, otherwise one at a time. The solution provided to the constructor is not changed.
+        
+        :param rhs_block: list of right-hand sides, of the same types accepted by the constructor.
+        :return: list of solutions.
+        """
+        rhs_block = [self._evaluate_rhs(rhs, self._bcs) for rhs in rhs_block]
+        for rhs in rhs_block:
+            self._apply_bcs_to_rhs(rhs, self._bcs)
+        solutions = [Function(self.solution.function_space()) for _ in rhs_block]
+        lu_solver = self._get_lu_solver()
+        if len(rhs_block) > 1:
+            try:
+                self._solve_dense_block(lu_solver, rhs_block, solutions)
+            except PETSc.Error: # dense right-hand sides are not supported by the LU solver
+                for (rhs, solution) in zip(rhs_block, solutions):
+                    lu_solver.solve(solution.vector(), rhs)
+        elif len(rhs_block) == 1:
+            lu_solver.solve(solutions[0].vector(), rhs_block[0])
+        if self.monitor is not None:
+            for solution in solutions:
+                self.monitor(solution)
+        return solutions
+        
+    def _solve_dense_block(self, lu_solver, rhs_block, solutions):
+        ksp = lu_solver.ksp()
+        ksp.setUp() # carry out the factorization, unless already available
+        factor = ksp.getPC().getFactorMatrix()
+        rhs_vec = to_petsc4py(rhs_block[0])
+        (row_start, row_end) = rhs_vec.getOwnershipRange()
+        rows = range(row_start, row_end)
+        columns = range(len(rhs_block))
+        B = PETSc.Mat().createDense(((row_end - row_start, rhs_vec.getSize()), (None, len(rhs_block))), comm=rhs_vec.getComm())
+        B.setUp()
+        for (j, rhs) in enumerate(rhs_block):
+            B.setValues(rows, [j], to_petsc4py(rhs).getArray().reshape(-1, 1))
+        B.assemble()
+        X = B.duplicate()
+        factor.matSolve(B, X)
+        X_values = X.getValues(rows, columns)
+        for (j, solution) in enumerate(solutions):
+            solution.vector().set_local(X_values[:, j])
+            solution.vector().apply("insert")
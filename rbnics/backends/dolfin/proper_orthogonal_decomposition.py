@@ -23,8 +23,8 @@ from rbnics.backends.basic import ProperOrthogonalDecompositionBase as BasicProp
 from rbnics.backends.dolfin.functions_list import FunctionsList
 from rbnics.backends.dolfin.matrix import Matrix
 from rbnics.backends.dolfin.snapshots_matrix import SnapshotsMatrix
-from rbnics.backends.dolfin.wrapping import get_mpi_comm
-from rbnics.backends.online import OnlineEigenSolver
+from rbnics.backends.dolfin.wrapping import get_mpi_comm, gram_schmidt_projection_step
+from rbnics.backends.online import OnlineEigenSolver, OnlineFunction, OnlineMatrix
 from rbnics.utils.decorators import BackendFor, ModuleWrapper
 
 def transpose(arg):
@@ -32,8 +32,8 @@ def transpose(arg):
     return backend_transpose(arg)
 
 backend = ModuleWrapper(transpose)
-wrapping = ModuleWrapper(get_mpi_comm)
-online_backend = ModuleWrapper(OnlineEigenSolver=OnlineEigenSolver)
+wrapping = ModuleWrapper(get_mpi_comm, gram_schmidt_projection_step)
+online_backend = ModuleWrapper(OnlineEigenSolver=OnlineEigenSolver, OnlineFunction=OnlineFunction, OnlineMatrix=OnlineMatrix)
 online_wrapping = ModuleWrapper()
 ProperOrthogonalDecomposition_Base = BasicProperOrthogonalDecomposition(backend, wrapping, online_backend, online_wrapping, AbstractProperOrthogonalDecomposition, SnapshotsMatrix, FunctionsList)
 
@@ -43,4 +43,7 @@ class ProperOrthogonalDecomposition(ProperOrthogonalDecomposition_Base):
         ProperOrthogonalDecomposition_Base.__init__(self, V, inner_product, component)
         
     def store_snapshot(self, snapshot, component=None, weight=None):
-        self.snapshots_matrix.enrich(snapshot, component, weight)
+        if self.incremental_svd_rank is not None:
+            self._store_snapshot_incrementally(snapshot, component, weight)
+        else:
+            self.snapshots_matrix.enrich(snapshot, component, weight)
@@ -163,6 +163,14 @@ def BasicReducedMesh(backend, wrapping):
             self.reduced_mesh_reduced_dofs_list__dof_map_reader_mapping = dict() # from N to tuple (of size len(V))
             # ... which will be initialized as needed in the save and load methods
             
+            # Communication patterns to gather values at DOFs (of the full and reduced mesh) on every processor
+            self._dofs_list_communication = dict() # from N to SparseDofsCommunication
+            self._reduced_dofs_list_communication = dict() # from N to SparseDofsCommunication
+            if copy_from is not None:
+                self._dofs_list_communication = copy_from._dofs_list_communication
+                self._reduced_dofs_list_communication = copy_from._reduced_dofs_list_communication
+            # ... which will be initialized as needed in the evaluate methods
+            
             # == The following members are related to auxiliary basis functions for nonlinear terms. == #
             # Spaces for auxiliary basis functions
             self._auxiliary_reduced_function_space = dict() # from (problem, component) to dict from N to FunctionSpace
@@ -347,9 +355,13 @@ def BasicReducedMesh(backend, wrapping):
             logger.log(DEBUG, "Updating auxiliary function interpolator for " + auxiliary_problem.name() + ", " + str(component) + ", " + str(index))
             assert index not in self._auxiliary_function_interpolator[key]
             auxiliary_reduced_V = self.get_auxiliary_reduced_function_space(auxiliary_problem, component, index)
+            auxiliary_dofs_to_reduced_dofs = self._auxiliary_dofs_to_reduced_dofs[key][index]
+            communication = wrapping.SparseDofsCommunication(list(auxiliary_dofs_to_reduced_dofs.keys()))
+            reduced_communication = wrapping.SparseDofsCommunication(list(auxiliary_dofs_to_reduced_dofs.values()))
             self._auxiliary_function_interpolator[key][index] = lambda fun: wrapping.evaluate_sparse_function_at_dofs(
-                fun, self._auxiliary_dofs_to_reduced_dofs[key][index].keys(),
-                auxiliary_reduced_V, self._auxiliary_dofs_to_reduced_dofs[key][index].values()
+                fun, auxiliary_dofs_to_reduced_dofs.keys(),
+                auxiliary_reduced_V, auxiliary_dofs_to_reduced_dofs.values(),
+                communication, reduced_communication
             )
             
         def _update_auxiliary_basis_functions_matrix(self, auxiliary_problem, component, index=None):
@@ -765,6 +777,18 @@ def BasicReducedMesh(backend, wrapping):
             index = self._get_dict_index(index)
             return self.reduced_mesh_reduced_dofs_list[index]
             
+        def get_dofs_list_communication(self, index=None):
+            index = self._get_dict_index(index)
+            if index not in self._dofs_list_communication:
+                self._dofs_list_communication[index] = wrapping.SparseDofsCommunication([dofs[0] for dofs in self.get_dofs_list(index)])
+            return self._dofs_list_communication[index]
+            
+        def get_reduced_dofs_list_communication(self, index=None):
+            index = self._get_dict_index(index)
+            if index not in self._reduced_dofs_list_communication:
+                self._reduced_dofs_list_communication[index] = wrapping.SparseDofsCommunication([reduced_dofs[0] for reduced_dofs in self.get_reduced_dofs_list(index)])
+            return self._reduced_dofs_list_communication[index]
+            
         def get_auxiliary_reduced_function_space(self, auxiliary_problem, component, index=None):
             index = self._get_dict_index(index)
             return self._auxiliary_reduced_function_space[auxiliary_problem, component][index]
@@ -795,8 +819,9 @@ def BasicReducedMesh(backend, wrapping):
 from rbnics.backends.dolfin.basis_functions_matrix import BasisFunctionsMatrix
 from rbnics.backends.dolfin.wrapping import build_dof_map_reader_mapping, build_dof_map_writer_mapping, create_submesh, convert_meshfunctions_to_submesh, convert_functionspace_to_submesh, evaluate_basis_functions_matrix_at_dofs, evaluate_sparse_function_at_dofs, map_functionspaces_between_mesh_and_submesh
 from rbnics.backends.dolfin.wrapping.get_auxiliary_problem_for_non_parametrized_function import AuxiliaryProblemForNonParametrizedFunction
+from rbnics.backends.dolfin.wrapping.sparse_dofs_communication import SparseDofsCommunication
 backend = ModuleWrapper(BasisFunctionsMatrix)
-wrapping = ModuleWrapper(AuxiliaryProblemForNonParametrizedFunction, build_dof_map_reader_mapping, build_dof_map_writer_mapping, create_submesh, convert_meshfunctions_to_submesh, convert_functionspace_to_submesh, evaluate_sparse_function_at_dofs, map_functionspaces_between_mesh_and_submesh, evaluate_basis_functions_matrix_at_dofs=evaluate_basis_functions_matrix_at_dofs)
+wrapping = ModuleWrapper(AuxiliaryProblemForNonParametrizedFunction, build_dof_map_reader_mapping, build_dof_map_writer_mapping, create_submesh, convert_meshfunctions_to_submesh, convert_functionspace_to_submesh, evaluate_sparse_function_at_dofs, map_functionspaces_between_mesh_and_submesh, SparseDofsCommunication, evaluate_basis_functions_matrix_at_dofs=evaluate_basis_functions_matrix_at_dofs)
 ReducedMesh_Base = BasicReducedMesh(backend, wrapping)
 
 @BackendFor("dolfin", inputs=(FunctionSpace, ))
@@ -96,6 +96,12 @@ def BasicReducedVertices(backend, wrapping):
         def get_reduced_dofs_list(self, index=None):
             return self._reduced_mesh.get_reduced_dofs_list(index)
             
+        def get_dofs_list_communication(self, index=None):
+            return self._reduced_mesh.get_dofs_list_communication(index)
+            
+        def get_reduced_dofs_list_communication(self, index=None):
+            return self._reduced_mesh.get_reduced_dofs_list_communication(index)
+            
         def get_auxiliary_reduced_function_space(self, auxiliary_problem, component, index=None):
             return self._reduced_mesh.get_auxiliary_reduced_function_space(auxiliary_problem, component, index)
             
@@ -23,6 +23,7 @@ from rbnics.backends.dolfin.wrapping.assemble_operator_for_restriction import as
 from rbnics.backends.dolfin.wrapping.assemble_operator_for_stability_factor import assemble_operator_for_stability_factor
 from rbnics.backends.dolfin.wrapping.assemble_operator_for_supremizers import assemble_operator_for_supremizers
 from rbnics.backends.dolfin.wrapping.basis_functions_matrix_mul import basis_functions_matrix_mul_online_matrix, basis_functions_matrix_mul_online_vector
+from rbnics.backends.dolfin.wrapping.basis_functions_matrix_transpose_mul import basis_functions_matrix_to_dense_matrix, basis_functions_matrix_to_local_array, basis_functions_matrix_transpose_mul_matrix_mul_basis_functions_matrix, basis_functions_matrix_transpose_mul_vector
 from rbnics.backends.dolfin.wrapping.compute_theta_for_derivative import compute_theta_for_derivative
 from rbnics.backends.dolfin.wrapping.compute_theta_for_derivatives import compute_theta_for_derivatives
 from rbnics.backends.dolfin.wrapping.compute_theta_for_restriction import compute_theta_for_restriction
@@ -68,7 +69,7 @@ from rbnics.backends.dolfin.wrapping.get_global_dof_coordinates import get_globa
 from rbnics.backends.dolfin.wrapping.get_global_dof_to_local_dof_map import get_global_dof_to_local_dof_map
 from rbnics.backends.dolfin.wrapping.get_local_dof_to_component_map import get_local_dof_to_component_map
 from rbnics.backends.dolfin.wrapping.get_mpi_comm import get_mpi_comm
-from rbnics.backends.dolfin.wrapping.gram_schmidt_projection_step import gram_schmidt_projection_step
+from rbnics.backends.dolfin.wrapping.gram_schmidt_projection_step import gram_schmidt_block_local_array, gram_schmidt_block_projection_step, gram_schmidt_block_store, gram_schmidt_projection_step
 from rbnics.backends.dolfin.wrapping.is_parametrized import is_parametrized
 from rbnics.backends.dolfin.wrapping.is_problem_solution import is_problem_solution
 from rbnics.backends.dolfin.wrapping.is_problem_solution_dot import is_problem_solution_dot
@@ -97,6 +98,10 @@ __all__ = [
     'assemble_operator_for_supremizers',
     'basis_functions_matrix_mul_online_matrix',
     'basis_functions_matrix_mul_online_vector',
+    'basis_functions_matrix_to_dense_matrix',
+    'basis_functions_matrix_to_local_array',
+    'basis_functions_matrix_transpose_mul_matrix_mul_basis_functions_matrix',
+    'basis_functions_matrix_transpose_mul_vector',
     'build_dof_map_reader_mapping',
     'build_dof_map_writer_mapping',
     'compute_theta_for_derivative',
@@ -145,6 +150,9 @@ __all__ = [
     'get_global_dof_to_local_dof_map',
     'get_local_dof_to_component_map',
     'get_mpi_comm',
+    'gram_schmidt_block_local_array',
+    'gram_schmidt_block_projection_step',
+    'gram_schmidt_block_store',
     'gram_schmidt_projection_step',
     'is_parametrized',
     'is_parametrized_constant',
@@ -17,24 +17,28 @@
 #
 
 from dolfin import Function, FunctionSpace
+from numpy import asarray
+from rbnics.backends.dolfin.wrapping.basis_functions_matrix_transpose_mul import basis_functions_matrix_to_local_array
 
+# Reconstruction is carried out as a GEMV (or GEMM) with the local rows of the dense matrix storing basis functions
 def basis_functions_matrix_mul_online_matrix(basis_functions_matrix, online_matrix, BasisFunctionsMatrixType):
     space = basis_functions_matrix.space
     assert isinstance(space, FunctionSpace)
     
     output = BasisFunctionsMatrixType(space)
     assert isinstance(online_matrix.M, dict)
+    N = sum(basis_functions_matrix._component_name_to_basis_component_length.values())
+    if N > 0:
+        basis_functions_local_array = basis_functions_matrix_to_local_array(basis_functions_matrix)
     j = 0
     for col_component_name in basis_functions_matrix._components_name:
         for _ in range(online_matrix.M[col_component_name]):
-            assert len(online_matrix[:, j]) == sum(len(functions_list) for functions_list in basis_functions_matrix._components)
+            assert len(online_matrix[:, j]) == N
             output_j = Function(space)
-            i = 0
-            for row_component_name in basis_functions_matrix._components_name:
-                for fun_i in basis_functions_matrix._components[row_component_name]:
-                    output_j.vector().add_local(fun_i.vector().get_local()*online_matrix[i, j])
-                    i += 1
-            output_j.vector().apply("add")
+            if N > 0:
+                online_matrix_j = asarray([online_matrix[i, j] for i in range(N)])
+                output_j.vector().set_local(basis_functions_local_array.dot(online_matrix_j))
+                output_j.vector().apply("insert")
             output.enrich(output_j)
             j += 1
     return output
@@ -44,13 +48,11 @@ def basis_functions_matrix_mul_online_vector(basis_functions_matrix, online_vect
     assert isinstance(space, FunctionSpace)
     
     output = Function(space)
-    if sum(basis_functions_matrix._component_name_to_basis_component_length.values()) == 0:
+    N = sum(basis_functions_matrix._component_name_to_basis_component_length.values())
+    if N == 0:
         return output
     else:
-        i = 0
-        for component_name in basis_functions_matrix._components_name:
-            for fun_i in basis_functions_matrix._components[component_name]:
-                output.vector().add_local(fun_i.vector().get_local()*online_vector[i])
-                i += 1
-        output.vector().apply("add")
+        online_vector = asarray([online_vector[i] for i in range(N)])
+        output.vector().set_local(basis_functions_matrix_to_local_array(basis_functions_matrix).dot(online_vector))
+        output.vector().apply("insert")
         return output
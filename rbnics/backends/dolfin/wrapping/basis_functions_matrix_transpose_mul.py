@@ -0,0 +1,64 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from mpi4py.MPI import SUM
+from numpy import arange, column_stack, zeros
+from petsc4py import PETSc
+from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
+
+# Store all basis functions as columns of a (tall and skinny) PETSc dense matrix, which is cached by the
+# basis functions matrix until it is enriched or changed
+def basis_functions_matrix_to_dense_matrix(basis_functions_matrix):
+    if basis_functions_matrix._precomputed_dense_matrix is None:
+        functions = [fun_j for component_name in basis_functions_matrix._components_name for fun_j in basis_functions_matrix._components[component_name]]
+        assert len(functions) > 0
+        vec = to_petsc4py(functions[0])
+        dense_matrix = PETSc.Mat().createDense(((vec.getLocalSize(), vec.getSize()), (PETSc.DECIDE, len(functions))), comm=vec.getComm())
+        dense_matrix.setUp()
+        (row_start, row_end) = vec.getOwnershipRange()
+        rows = arange(row_start, row_end, dtype=PETSc.IntType)
+        columns = arange(len(functions), dtype=PETSc.IntType)
+        dense_matrix.setValues(rows, columns, column_stack([fun_j.vector().get_local() for fun_j in functions]))
+        dense_matrix.assemble()
+        basis_functions_matrix._precomputed_dense_matrix = dense_matrix
+    return basis_functions_matrix._precomputed_dense_matrix
+    
+# Local rows of the dense matrix storing basis functions, as a numpy array
+def basis_functions_matrix_to_local_array(basis_functions_matrix):
+    return basis_functions_matrix_to_dense_matrix(basis_functions_matrix).getDenseArray()
+    
+def _basis_functions_matrix_length(basis_functions_matrix):
+    return sum(basis_functions_matrix._component_name_to_basis_component_length.values())
+    
+def basis_functions_matrix_transpose_mul_vector(basis_functions_matrix, vector):
+    if _basis_functions_matrix_length(basis_functions_matrix) == 0:
+        return zeros(0)
+    output = basis_functions_matrix_to_local_array(basis_functions_matrix).T.dot(vector.get_local())
+    return basis_functions_matrix.mpi_comm.allreduce(output, op=SUM)
+    
+# Compute A Z2 by MatMatMult, and then the (small) product Z1^T (A Z2) as a local GEMM followed by a reduction,
+# so that the result is available on every processor
+def basis_functions_matrix_transpose_mul_matrix_mul_basis_functions_matrix(basis_functions_matrix, matrix, other_basis_functions_matrix):
+    M = _basis_functions_matrix_length(basis_functions_matrix)
+    N = _basis_functions_matrix_length(other_basis_functions_matrix)
+    if M == 0 or N == 0:
+        return zeros((M, N))
+    matrix_times_other_basis_functions_matrix = to_petsc4py(matrix).matMult(basis_functions_matrix_to_dense_matrix(other_basis_functions_matrix))
+    output = basis_functions_matrix_to_local_array(basis_functions_matrix).T.dot(matrix_times_other_basis_functions_matrix.getDenseArray())
+    matrix_times_other_basis_functions_matrix.destroy()
+    return basis_functions_matrix.mpi_comm.allreduce(output, op=SUM)
@@ -16,50 +16,49 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from mpi4py.MPI import MAX
+from numpy import array
 from petsc4py import PETSc
 from dolfin import Function
 from rbnics.backends.dolfin.wrapping.evaluate_sparse_vector_at_dofs import evaluate_sparse_vector_at_dofs
+from rbnics.backends.dolfin.wrapping.sparse_dofs_communication import SparseDofsCommunication
 from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
 
-def evaluate_sparse_function_at_dofs(input_function, dofs_list, output_V=None, reduced_dofs_list=None):
+def evaluate_sparse_function_at_dofs(input_function, dofs_list, output_V=None, reduced_dofs_list=None, communication=None, reduced_communication=None):
     assert (
         (output_V is None)
             ==
         (reduced_dofs_list is None)
     )
     if output_V is None:
-        return evaluate_sparse_vector_at_dofs(input_function.vector(), dofs_list)
+        assert reduced_communication is None
+        return evaluate_sparse_vector_at_dofs(input_function.vector(), dofs_list, communication)
     else:
         vec = to_petsc4py(input_function.vector())
         output_function = Function(output_V)
         out = to_petsc4py(output_function.vector())
-        _evaluate_sparse_function_at_dofs(vec, dofs_list, out, reduced_dofs_list)
+        _evaluate_sparse_function_at_dofs(vec, dofs_list, out, reduced_dofs_list, communication, reduced_communication)
         return output_function
     
-def _evaluate_sparse_function_at_dofs(vec, dofs_list, out, reduced_dofs_list):
+def _evaluate_sparse_function_at_dofs(vec, dofs_list, out, reduced_dofs_list, communication=None, reduced_communication=None):
+    if communication is None:
+        communication = SparseDofsCommunication(tuple(dofs_list))
+    if reduced_communication is None:
+        reduced_communication = SparseDofsCommunication(tuple(reduced_dofs_list))
+    assert len(communication.rows) == len(reduced_communication.rows)
     vec_row_start, vec_row_end = vec.getOwnershipRange()
     out_row_start, out_row_end = out.getOwnershipRange()
     mpi_comm = vec.comm.tompi4py()
-    for (i, reduced_i) in zip(dofs_list, reduced_dofs_list):
-        out_index = None
-        vec_i_processor = -1
-        if i >= vec_row_start and i < vec_row_end:
-            out_index = vec.getValue(i)
-            vec_i_processor = mpi_comm.rank
-        vec_i_processor = mpi_comm.allreduce(vec_i_processor, op=MAX)
-        assert vec_i_processor >= 0
-        out_reduced_i_processor = -1
-        if reduced_i >= out_row_start and reduced_i < out_row_end:
-            out_reduced_i_processor = mpi_comm.rank
-        out_reduced_i_processor = mpi_comm.allreduce(vec_i_processor, op=MAX)
-        assert out_reduced_i_processor >= 0
-        if vec_i_processor != out_reduced_i_processor:
-            if mpi_comm.rank == vec_i_processor:
-                mpi_comm.send(out_index, dest=out_reduced_i_processor)
-            if mpi_comm.rank == out_reduced_i_processor:
-                out_index = mpi_comm.recv(source=vec_i_processor)
-        if mpi_comm.rank == out_reduced_i_processor:
-            out.setValues(reduced_i, out_index, addv=PETSc.InsertMode.INSERT)
+    # Gather all values on every processor
+    vec_owned_rows = communication.get_owned_rows(vec_row_start, vec_row_end)
+    if len(vec_owned_rows) > 0:
+        vec_owned_values = vec.getValues(vec_owned_rows)
+    else:
+        vec_owned_values = array([], dtype=float)
+    values = communication.allgather_values(mpi_comm, vec_owned_values)
+    # Set the values owned by the current processor in the output vector
+    out_owned_positions = reduced_communication.get_owned_positions(out_row_start, out_row_end)
+    out_owned_rows = reduced_communication.rows[out_owned_positions].astype(PETSc.IntType)
+    if len(out_owned_rows) > 0:
+        out.setValues(out_owned_rows, values[out_owned_positions], addv=PETSc.InsertMode.INSERT)
     out.assemble()
     out.ghostUpdate()
@@ -16,25 +16,27 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from mpi4py.MPI import MAX
+from numpy import array
+from rbnics.backends.dolfin.wrapping.sparse_dofs_communication import SparseDofsCommunication
 from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
 from rbnics.backends.online import OnlineVector
 
-def evaluate_sparse_vector_at_dofs(sparse_vector, dofs_list):
+def evaluate_sparse_vector_at_dofs(sparse_vector, dofs_list, communication=None):
     vec = to_petsc4py(sparse_vector)
     row_start, row_end = vec.getOwnershipRange()
     out_size = len(dofs_list)
     out = OnlineVector(out_size)
     mpi_comm = vec.comm.tompi4py()
-    for (index, dofs) in enumerate(dofs_list):
-        assert len(dofs) == 1
-        i = dofs[0]
-        out_index = None
-        vec_i_processor = -1
-        if i >= row_start and i < row_end:
-            out_index = vec.getValue(i)
-            vec_i_processor = mpi_comm.rank
-        vec_i_processor = mpi_comm.allreduce(vec_i_processor, op=MAX)
-        assert vec_i_processor >= 0
-        out[index] = mpi_comm.bcast(out_index, root=vec_i_processor)
+    if communication is None:
+        rows = list()
+        for dofs in dofs_list:
+            assert len(dofs) == 1
+            rows.append(dofs[0])
+        communication = SparseDofsCommunication(rows)
+    owned_rows = communication.get_owned_rows(row_start, row_end)
+    if len(owned_rows) > 0:
+        owned_values = vec.getValues(owned_rows)
+    else:
+        owned_values = array([], dtype=float)
+    out[:] = communication.allgather_values(mpi_comm, owned_values)
     return out
@@ -24,8 +24,9 @@ def functions_list_mul_online_matrix(functions_list, online_matrix, FunctionsLis
     
     output = FunctionsListType(space)
     assert isinstance(online_matrix.M, int)
-    for j in range(online_matrix.M):
-        assert len(online_matrix[:, j]) == len(functions_list)
+    assert isinstance(online_matrix.N, int)
+    assert online_matrix.M == len(functions_list)
+    for j in range(online_matrix.N):
         output_j = Function(space)
         for (i, fun_i) in enumerate(functions_list):
             output_j.vector().add_local(fun_i.vector().get_local()*online_matrix[i, j])
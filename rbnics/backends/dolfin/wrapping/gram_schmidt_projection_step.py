@@ -16,7 +16,34 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from mpi4py.MPI import SUM
+from numpy import empty
+from rbnics.backends.dolfin.wrapping.basis_functions_matrix_transpose_mul import _basis_functions_matrix_length, basis_functions_matrix_to_local_array
+from rbnics.backends.dolfin.wrapping.get_mpi_comm import get_mpi_comm
+
 def gram_schmidt_projection_step(new_basis, inner_product, old_basis, transpose):
     new_basis.vector().add_local(- (transpose(new_basis)*inner_product*old_basis) * old_basis.vector().get_local())
     new_basis.vector().apply("add")
     return new_basis
+
+# Dense array storing the local rows of old basis functions as its first columns, copied at once from the dense matrix
+# cached by the basis functions matrix, and leaving room for new basis functions, to be stored by gram_schmidt_block_store
+def gram_schmidt_block_local_array(old_basis_functions, new_basis_functions):
+    N_old = _basis_functions_matrix_length(old_basis_functions)
+    local_array = empty((new_basis_functions[0].vector().local_size(), N_old + len(new_basis_functions)))
+    if N_old > 0:
+        local_array[:, :N_old] = basis_functions_matrix_to_local_array(old_basis_functions)
+    return local_array
+    
+def gram_schmidt_block_store(new_basis, local_array, index):
+    local_array[:, index] = new_basis.vector().get_local()
+
+# Classical Gram-Schmidt projection against all previous basis functions at once, given the product of the inner product
+# matrix with the new basis function and the local rows of previous basis functions: coefficients are computed by a single
+# dense product with their transpose
+def gram_schmidt_block_projection_step(new_basis, inner_product_times_new_basis, previous_basis_functions_local_array):
+    coefficients = previous_basis_functions_local_array.T.dot(inner_product_times_new_basis.get_local())
+    coefficients = get_mpi_comm(new_basis).allreduce(coefficients, op=SUM)
+    new_basis.vector().add_local(- previous_basis_functions_local_array.dot(coefficients))
+    new_basis.vector().apply("add")
+    return new_basis
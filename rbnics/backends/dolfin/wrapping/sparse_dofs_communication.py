@@ -0,0 +1,60 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from numpy import arange, array, ascontiguousarray, empty, flatnonzero, int64, sort
+
+# Communication pattern to gather the values of a list of rows of a distributed tensor on every processor,
+# with a single collective call. Positions (in the list of rows) of the rows owned by the current processor
+# are computed at the first evaluation, while the number of rows owned by each processor and the positions
+# of all rows in the gathered values are computed at the first gather. Both are then reused by later evaluations,
+# which must involve tensors with the same parallel layout. Instances are stored by reduced meshes, alongside
+# the corresponding list of DOFs.
+class SparseDofsCommunication(object):
+    def __init__(self, rows):
+        self.rows = array(rows, dtype=int64).reshape(-1)
+        self._ownership_range = None
+        self._owned_positions = None
+        self._counts = None
+        self._gathered_positions = None
+    
+    def get_owned_positions(self, row_start, row_end):
+        if self._ownership_range is None:
+            self._ownership_range = (row_start, row_end)
+            self._owned_positions = flatnonzero((self.rows >= row_start) & (self.rows < row_end)).astype(int64)
+        else:
+            assert self._ownership_range == (row_start, row_end), "Tensors with different parallel layouts cannot share the same communication pattern"
+        return self._owned_positions
+    
+    def get_owned_rows(self, row_start, row_end):
+        return self.rows[self.get_owned_positions(row_start, row_end)]
+    
+    def allgather_values(self, mpi_comm, owned_values):
+        assert self._owned_positions is not None, "Please call get_owned_positions() first"
+        if self._counts is None:
+            self._counts = empty(mpi_comm.size, dtype=int64)
+            mpi_comm.Allgather(array([len(self._owned_positions)], dtype=int64), self._counts)
+            self._gathered_positions = empty(self._counts.sum(), dtype=int64)
+            mpi_comm.Allgatherv(self._owned_positions, (self._gathered_positions, self._counts))
+            assert len(self._gathered_positions) == len(self.rows) and (sort(self._gathered_positions) == arange(len(self.rows))).all(), "Each row should be owned by exactly one processor"
+        owned_values = ascontiguousarray(owned_values, dtype=float)
+        assert len(owned_values) == len(self._owned_positions)
+        gathered_values = empty(len(self._gathered_positions))
+        mpi_comm.Allgatherv(owned_values, (gathered_values, self._counts))
+        values = empty(len(self.rows))
+        values[self._gathered_positions] = gathered_values
+        return values
@@ -28,6 +28,7 @@ def LinearSolver(backend, wrapping):
             self._init_lhs(lhs)
             self._init_rhs(rhs)
             self._apply_bcs(bcs)
+            self._bcs = bcs
             preserve_solution_attributes(self.lhs, self.solution, self.rhs)
             self.monitor = None
             
@@ -75,4 +76,18 @@ def LinearSolver(backend, wrapping):
             bcs.apply_to_vector(self.rhs)
             bcs.apply_to_matrix(self.lhs)
             
+        # Apply boundary conditions to a right-hand side other than the one provided to the constructor
+        # (e.g. when solving for a block of right-hand sides), leaving the left-hand side unchanged
+        @overload
+        def _apply_bcs_to_rhs(self, rhs: backend.Vector.Type(), bcs: None):
+            pass
+            
+        @overload
+        def _apply_bcs_to_rhs(self, rhs: backend.Vector.Type(), bcs: ThetaType):
+            DirichletBC(bcs).apply_to_vector(rhs)
+            
+        @overload
+        def _apply_bcs_to_rhs(self, rhs: backend.Vector.Type(), bcs: DictOfThetaType):
+            DirichletBC(bcs, rhs._component_name_to_basis_component_index, rhs.N).apply_to_vector(rhs)
+            
     return LinearSolver_Class
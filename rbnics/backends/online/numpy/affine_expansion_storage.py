@@ -16,13 +16,16 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from numpy import empty, nditer as AffineExpansionStorageContent_Iterator, zeros
 from rbnics.backends.online.basic import AffineExpansionStorage as BasicAffineExpansionStorage
+from rbnics.backends.online.basic.wrapping import slice_to_array, slice_to_size
 from rbnics.backends.online.numpy.copy import function_copy, tensor_copy
 from rbnics.backends.online.numpy.function import Function
 from rbnics.backends.online.numpy.matrix import Matrix
 from rbnics.backends.online.numpy.vector import Vector
 from rbnics.backends.online.numpy.wrapping import function_load, function_save, tensor_load, tensor_save
 from rbnics.utils.decorators import BackendFor, ModuleWrapper, tuple_of
+from rbnics.utils.io import ComponentNameToBasisComponentIndexDict, MemmapIO as ContentAsTensorIO, OnlineSizeDict
 
 backend = ModuleWrapper(Function, Matrix, Vector)
 wrapping = ModuleWrapper(function_load, function_save, tensor_load, tensor_save, function_copy=function_copy, tensor_copy=tensor_copy)
@@ -31,4 +34,244 @@ AffineExpansionStorage_Base = BasicAffineExpansionStorage(backend, wrapping)
 @BackendFor("numpy", inputs=((int, tuple_of(Matrix.Type()), tuple_of(Vector.Type())), (int, None)))
 class AffineExpansionStorage(AffineExpansionStorage_Base):
     def __init__(self, arg1, arg2=None):
+        # Contiguous storage of the content of all matrices (or vectors) in the affine expansion, of shape
+        # (Q, M, N) [or (Q, N)] for one dimensional storage and (Q1, Q2, M, N) [or (Q1, Q2, N)] for two dimensional storage.
+        # Matrices (or vectors) in the affine expansion are then views of this contiguous storage.
+        self._content_as_tensor = None
+        # Storage possibly larger than the current size of matrices (or vectors), of which _content_as_tensor is a view,
+        # allowing to enlarge the affine expansion without reallocating it
+        self._content_as_tensor_with_capacity = None
         AffineExpansionStorage_Base.__init__(self, arg1, arg2)
+        
+    def __setitem__(self, key, item):
+        if key == self._smallest_key: # a new affine expansion is going to be stored
+            self._content_as_tensor = None
+            self._content_as_tensor_with_capacity = None
+        AffineExpansionStorage_Base.__setitem__(self, key, item)
+        if key == self._largest_key: # the affine expansion has been completely stored
+            self._init_content_as_tensor()
+            
+    def save(self, directory, filename):
+        # Contiguous storage is saved to a single file, rather than to a folder containing a file for each item
+        if self._content_as_tensor is not None:
+            item = self._content[self._smallest_key]
+            if isinstance(item, Matrix.Type()):
+                header = {"content_item_type": "matrix", "content_item_shape": (item.M, item.N)}
+            else:
+                header = {"content_item_type": "vector", "content_item_shape": item.N}
+            header["component_name_to_basis_component_index"] = self._component_name_to_basis_component_index
+            header["component_name_to_basis_component_length"] = self._component_name_to_basis_component_length
+            ContentAsTensorIO.save_file(_header_to_literal(header), self._content_as_tensor, directory, filename)
+        else:
+            ContentAsTensorIO.remove_file(directory, filename)
+            AffineExpansionStorage_Base.save(self, directory, filename)
+            
+    def load(self, directory, filename):
+        if ContentAsTensorIO.exists_file(directory, filename):
+            if self._is_loaded(): # avoid loading multiple times
+                return False
+            self._load_content_as_tensor(directory, filename)
+            return True
+        loaded = AffineExpansionStorage_Base.load(self, directory, filename)
+        if loaded and self._content.size > 0:
+            self._init_content_as_tensor()
+        return loaded
+        
+    def _load_content_as_tensor(self, directory, filename):
+        (header, self._content_as_tensor) = ContentAsTensorIO.load_file(directory, filename)
+        header = _header_from_literal(header)
+        self._content_as_tensor_with_capacity = self._content_as_tensor
+        assert self._content_as_tensor.shape[:len(self._content.shape)] == self._content.shape
+        # Items are views of the (memory mapped) contiguous storage
+        assert header["content_item_type"] in ("matrix", "vector")
+        for index in self._content_indices():
+            if header["content_item_type"] == "matrix":
+                (M, N) = header["content_item_shape"]
+                self._content[index] = Matrix.Type()(M, N, self._content_as_tensor[index])
+            else:
+                N = header["content_item_shape"]
+                self._content[index] = Vector.Type()(N, self._content_as_tensor[index])
+            if header["component_name_to_basis_component_index"] is not None:
+                self._content[index]._component_name_to_basis_component_index = header["component_name_to_basis_component_index"]
+            if header["component_name_to_basis_component_length"] is not None:
+                self._content[index]._component_name_to_basis_component_length = header["component_name_to_basis_component_length"]
+        self._component_name_to_basis_component_index = header["component_name_to_basis_component_index"]
+        self._component_name_to_basis_component_length = header["component_name_to_basis_component_length"]
+        # Reset precomputed slices
+        self._precomputed_slices.clear()
+        self._prepare_trivial_precomputed_slice(self._content[self._smallest_key])
+        
+    def _init_content_as_tensor(self):
+        # Store contiguously only matrices or vectors, all with the same shape
+        items = [self._content[index] for index in self._content_indices()]
+        if (
+            len(items) == 0
+                or
+            not (
+                all(isinstance(item, Matrix.Type()) for item in items)
+                    or
+                all(isinstance(item, Vector.Type()) for item in items)
+            )
+        ):
+            self._content_as_tensor = None
+            return
+        item_shape = items[0].content.shape
+        if not all(item.content.shape == item_shape for item in items):
+            self._content_as_tensor = None
+            return
+        # Copy the content to the contiguous storage, and replace the content of each item with a view
+        self._content_as_tensor = empty(self._content.shape + item_shape)
+        for (index, item) in zip(self._content_indices(), items):
+            self._content_as_tensor[index] = item.content
+            item.content = self._content_as_tensor[index]
+        self._content_as_tensor_with_capacity = self._content_as_tensor
+        
+    def enlarge(self, *size):
+        """
+        Enlarge all matrices (or vectors) in the affine expansion to size (M, N) (or N), preserving their current
+        content in the leading block and filling in new entries with zeros. Spare capacity is allocated on reallocation,
+        so that repeated enlargements by a few rows and columns (e.g., after each basis enrichment) do not copy the whole
+        affine expansion every time. Only single component matrices (or vectors) are supported, since new rows and
+        columns are appended at the end. Returns NotImplemented if the affine expansion is not stored contiguously.
+        """
+        if self._content_as_tensor is None:
+            return NotImplemented
+        items = [self._content[index] for index in self._content_indices()]
+        if isinstance(items[0], Matrix.Type()):
+            assert len(size) == 2
+            item_sizes = (items[0].M, items[0].N)
+        else:
+            assert len(size) == 1
+            item_sizes = (items[0].N, )
+        if any(isinstance(item_size, dict) and len(item_size) > 1 for item_size in item_sizes):
+            return NotImplemented
+        storage_dim = len(self._content.shape)
+        old_shape = self._content_as_tensor.shape[storage_dim:]
+        assert all(new_i >= old_i for (new_i, old_i) in zip(size, old_shape))
+        # Reallocate (with twice the required capacity) only if the current capacity is not enough
+        capacity = self._content_as_tensor_with_capacity.shape[storage_dim:]
+        if any(new_i > capacity_i for (new_i, capacity_i) in zip(size, capacity)):
+            new_capacity = tuple(max(new_i, 2*capacity_i) for (new_i, capacity_i) in zip(size, capacity))
+            content_as_tensor_with_capacity = zeros(self._content.shape + new_capacity)
+            content_as_tensor_with_capacity[(slice(None), )*storage_dim + tuple(slice(0, old_i) for old_i in old_shape)] = self._content_as_tensor
+            self._content_as_tensor_with_capacity = content_as_tensor_with_capacity
+        self._content_as_tensor = self._content_as_tensor_with_capacity[(slice(None), )*storage_dim + tuple(slice(0, new_i) for new_i in size)]
+        # Clean up entries outside of the leading block, which are not guaranteed to be zero if a previous enlargement
+        # has been followed by a complete reassignment of the affine expansion
+        if len(size) == 2:
+            self._content_as_tensor[(slice(None), )*storage_dim + (slice(old_shape[0], None), slice(None))] = 0.
+            self._content_as_tensor[(slice(None), )*storage_dim + (slice(None, old_shape[0]), slice(old_shape[1], None))] = 0.
+        else:
+            self._content_as_tensor[(slice(None), )*storage_dim + (slice(old_shape[0], None), )] = 0.
+        # Replace items with enlarged views
+        def enlarged_size(item_size, new_size):
+            if isinstance(item_size, dict):
+                return OnlineSizeDict([(component_name, new_size) for component_name in item_size.keys()])
+            else:
+                return new_size
+        for (index, item) in zip(self._content_indices(), items):
+            enlarged_sizes = [enlarged_size(item_size, new_size) for (item_size, new_size) in zip(item_sizes, size)]
+            self._content[index] = type(item)(*enlarged_sizes, self._content_as_tensor[index])
+        # Update auxiliary storage for __getitem__ slicing and reset precomputed slices
+        first_item = self._content[self._smallest_key]
+        self._component_name_to_basis_component_index = first_item._component_name_to_basis_component_index
+        self._component_name_to_basis_component_length = first_item._component_name_to_basis_component_length
+        self._precomputed_slices.clear()
+        self._prepare_trivial_precomputed_slice(first_item)
+        
+    def _content_indices(self):
+        it = AffineExpansionStorageContent_Iterator(self._content, flags=["multi_index", "refs_ok"], op_flags=["readonly"])
+        indices = list()
+        while not it.finished:
+            indices.append(it.multi_index)
+            it.iternext()
+        return indices
+        
+    def __getitem__(self, key):
+        if self._content_as_tensor is not None and isinstance(key, (slice, tuple)) and all(isinstance(key_i, slice) for key_i in (key if isinstance(key, tuple) else (key, ))):
+            output = self._getitem_as_view(key)
+            if output is not None:
+                return output
+        return AffineExpansionStorage_Base.__getitem__(self, key)
+        
+    def _getitem_as_view(self, key):
+        """
+        Return the subtensors of size "key" for every element in content, as views of the contiguous storage.
+        This is only possible if the rows and columns selected by "key" are contiguous, as it
+        happens for instance for single component problems.
+        """
+        first_item = self._content[self._smallest_key]
+        slices = slice_to_array(first_item, key, self._component_name_to_basis_component_length, self._component_name_to_basis_component_index)
+        if slices in self._precomputed_slices:
+            return self._precomputed_slices[slices]
+        # Convert indices to (basic) slices, if possible
+        indices = (slices, ) if isinstance(first_item, Vector.Type()) else slices
+        view_key = list()
+        for indices_i in indices:
+            start_i = indices_i[0] if len(indices_i) > 0 else 0
+            if indices_i != tuple(range(start_i, start_i + len(indices_i))):
+                return None
+            view_key.append(slice(start_i, start_i + len(indices_i)))
+        view_key = tuple(view_key)
+        # Prepare output storage, sharing the contiguous storage
+        output = AffineExpansionStorage.__new__(type(self), *self._content.shape)
+        output.__init__(*self._content.shape)
+        output._content_as_tensor = self._content_as_tensor[(slice(None), )*len(self._content.shape) + view_key]
+        size = slice_to_size(first_item, key, self._component_name_to_basis_component_length)
+        for index in self._content_indices():
+            item = self._content[index]
+            if isinstance(item, Matrix.Type()):
+                output_item = type(item)(size[0], size[1], output._content_as_tensor[index])
+                # Preserve auxiliary attributes related to basis functions matrix, as in Matrix.__getitem__
+                output_item._component_name_to_basis_component_index = item._component_name_to_basis_component_index
+                if (
+                    item._component_name_to_basis_component_length[0] is None
+                        and
+                    item._component_name_to_basis_component_length[1] is None
+                ):
+                    output_item._component_name_to_basis_component_length = (None, None)
+                else:
+                    output_item._component_name_to_basis_component_length = tuple(size)
+            else:
+                output_item = type(item)(size[0], output._content_as_tensor[index])
+                # Preserve auxiliary attributes related to basis functions matrix, as in Vector.__getitem__
+                output_item._component_name_to_basis_component_index = item._component_name_to_basis_component_index
+                if item._component_name_to_basis_component_length is None:
+                    output_item._component_name_to_basis_component_length = None
+                else:
+                    output_item._component_name_to_basis_component_length = size[0]
+            output._content[index] = output_item
+        # Mark output storage as completely filled in
+        output._previous_key = output._largest_key
+        output._component_name_to_basis_component_index = output._content[output._smallest_key]._component_name_to_basis_component_index
+        output._component_name_to_basis_component_length = output._content[output._smallest_key]._component_name_to_basis_component_length
+        output._prepare_trivial_precomputed_slice(output._content[output._smallest_key])
+        self._precomputed_slices[slices] = output
+        return output
+        
+# The header of the contiguous storage may only contain literals, hence dicts of sizes and of component indices
+# (possibly in a tuple, for matrices) are stored as their type name and list of items
+_header_dict_types = {
+    "ComponentNameToBasisComponentIndexDict": ComponentNameToBasisComponentIndexDict,
+    "OnlineSizeDict": OnlineSizeDict
+}
+
+def _header_to_literal(value):
+    if isinstance(value, tuple):
+        return tuple(_header_to_literal(value_i) for value_i in value)
+    elif isinstance(value, (ComponentNameToBasisComponentIndexDict, OnlineSizeDict)):
+        return {"type": type(value).__name__, "items": list(value.items())}
+    elif isinstance(value, dict):
+        return {key: _header_to_literal(value_key) for (key, value_key) in value.items()}
+    else:
+        return value
+        
+def _header_from_literal(value):
+    if isinstance(value, tuple):
+        return tuple(_header_from_literal(value_i) for value_i in value)
+    elif isinstance(value, dict) and value.keys() == {"type", "items"}:
+        return _header_dict_types[value["type"]](value["items"])
+    elif isinstance(value, dict):
+        return {key: _header_from_literal(value_key) for (key, value_key) in value.items()}
+    else:
+        return value
@@ -18,14 +18,23 @@
 
 from rbnics.backends.abstract import FunctionsList as AbstractFunctionsList
 from rbnics.backends.basic import GramSchmidt as BasicGramSchmidt
+from rbnics.backends.online.numpy.copy import function_copy
 from rbnics.backends.online.numpy.function import Function
 from rbnics.backends.online.numpy.matrix import Matrix
 from rbnics.backends.online.numpy.transpose import transpose
-from rbnics.backends.online.numpy.wrapping import gram_schmidt_projection_step
+from rbnics.backends.online.numpy.wrapping import function_to_vector, gram_schmidt_block_local_array, gram_schmidt_block_projection_step, gram_schmidt_block_store, matrix_mul_vector
 from rbnics.utils.decorators import BackendFor, ModuleWrapper
 
+# Online functions have no components, hence they are only copied
+def function_extend_or_restrict(function, function_components, space, space_components, weight, copy):
+    assert function_components is None
+    assert space_components is None
+    assert weight is None
+    assert copy is True
+    return function_copy(function)
+    
 backend = ModuleWrapper(Function, transpose)
-wrapping = ModuleWrapper(gram_schmidt_projection_step)
+wrapping = ModuleWrapper(function_extend_or_restrict, function_to_vector, gram_schmidt_block_local_array, gram_schmidt_block_projection_step, gram_schmidt_block_store, matrix_mul_vector)
 GramSchmidt_Base = BasicGramSchmidt(backend, wrapping)
 
 @BackendFor("numpy", inputs=(AbstractFunctionsList, Matrix.Type(), (str, None)))
@@ -16,13 +16,15 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from numpy.linalg import solve
+from numpy import empty
 from rbnics.backends.abstract import LinearProblemWrapper
 from rbnics.backends.online.basic import LinearSolver as BasicLinearSolver
+from rbnics.backends.online.numpy.copy import function_copy, tensor_copy
 from rbnics.backends.online.numpy.function import Function
 from rbnics.backends.online.numpy.matrix import Matrix
 from rbnics.backends.online.numpy.transpose import DelayedTransposeWithArithmetic
 from rbnics.backends.online.numpy.vector import Vector
+from rbnics.backends.online.numpy.wrapping import factorize
 from rbnics.utils.decorators import BackendFor, DictOfThetaType, ModuleWrapper, ThetaType
 
 backend = ModuleWrapper(Function, Matrix, Vector)
@@ -35,7 +37,26 @@ class LinearSolver(LinearSolver_Base):
         assert len(parameters) == 0, "NumPy linear solver does not accept parameters yet"
         
     def solve(self):
-        solution = solve(self.lhs, self.rhs)
+        solution = factorize(self.lhs).solve(self.rhs)
         self.solution.vector()[:] = solution
         if self.monitor is not None:
             self.monitor(self.solution)
+            
+    def solve_block(self, rhs_block):
+        rhs_block_content = empty((self.lhs.content.shape[0], len(rhs_block)))
+        for (j, rhs) in enumerate(rhs_block):
+            if isinstance(rhs, DelayedTransposeWithArithmetic):
+                rhs = rhs.evaluate()
+            else:
+                rhs = tensor_copy(rhs)
+            self._apply_bcs_to_rhs(rhs, self._bcs)
+            rhs_block_content[:, j] = rhs
+        solutions_content = factorize(self.lhs).solve(rhs_block_content)
+        solutions = list()
+        for j in range(len(rhs_block)):
+            solution = function_copy(self.solution)
+            solution.vector()[:] = solutions_content[:, j]
+            if self.monitor is not None:
+                self.monitor(solution)
+            solutions.append(solution)
+        return solutions
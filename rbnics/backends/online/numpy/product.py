@@ -16,6 +16,7 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from numpy import einsum, tensordot
 from rbnics.backends.online.basic import product as basic_product
 from rbnics.backends.online.numpy.affine_expansion_storage import AffineExpansionStorage
 from rbnics.backends.online.numpy.function import Function
@@ -33,4 +34,28 @@ wrapping = ModuleWrapper(DelayedTransposeWithArithmetic=DelayedTransposeWithArit
 # even though this one actually carries out both the sum and the product!
 @backend_for("numpy", inputs=(ThetaType, (AffineExpansionStorage, NonAffineExpansionStorage), ThetaType + (None,)))
 def product(thetas, operators, thetas2=None):
-    return product_base(thetas, operators, thetas2)
+    if isinstance(operators, AffineExpansionStorage) and operators._content_as_tensor is not None:
+        return _product_as_tensor_contraction(thetas, operators, thetas2)
+    else:
+        return product_base(thetas, operators, thetas2)
+    
+# Carry out the sum of products as a single contraction on the contiguous storage of the affine expansion
+def _product_as_tensor_contraction(thetas, operators, thetas2):
+    order = operators.order()
+    assert order in (1, 2)
+    if order == 1:
+        assert thetas2 is None
+        assert len(thetas) == len(operators)
+        first_operator = operators[0]
+        output_content = tensordot(thetas, operators._content_as_tensor, axes=1)
+    else:
+        assert thetas2 is not None
+        first_operator = operators[0, 0]
+        output_content = einsum("i,ij...,j->...", thetas, operators._content_as_tensor, thetas2)
+    if isinstance(first_operator, Matrix.Type()):
+        output = Matrix.Type()(first_operator.M, first_operator.N, output_content)
+    else:
+        assert isinstance(first_operator, Vector.Type())
+        output = Vector.Type()(first_operator.N, output_content)
+    first_operator._arithmetic_operations_preserve_attributes(output, other_order=0)
+    return ProductOutput(output)
@@ -20,16 +20,17 @@ from rbnics.backends.abstract import FunctionsList as AbstractFunctionsList
 from rbnics.backends.abstract import ProperOrthogonalDecomposition as AbstractProperOrthogonalDecomposition
 from rbnics.backends.basic import ProperOrthogonalDecompositionBase as BasicProperOrthogonalDecomposition
 from rbnics.backends.online.numpy.eigen_solver import EigenSolver
+from rbnics.backends.online.numpy.function import Function
 from rbnics.backends.online.numpy.functions_list import FunctionsList
 from rbnics.backends.online.numpy.matrix import Matrix
 from rbnics.backends.online.numpy.snapshots_matrix import SnapshotsMatrix
 from rbnics.backends.online.numpy.transpose import transpose
-from rbnics.backends.online.numpy.wrapping import get_mpi_comm
+from rbnics.backends.online.numpy.wrapping import get_mpi_comm, gram_schmidt_projection_step
 from rbnics.utils.decorators import BackendFor, ModuleWrapper
 
 backend = ModuleWrapper(transpose)
-wrapping = ModuleWrapper(get_mpi_comm)
-online_backend = ModuleWrapper(OnlineEigenSolver=EigenSolver)
+wrapping = ModuleWrapper(get_mpi_comm, gram_schmidt_projection_step)
+online_backend = ModuleWrapper(OnlineEigenSolver=EigenSolver, OnlineFunction=Function, OnlineMatrix=Matrix)
 online_wrapping = ModuleWrapper()
 ProperOrthogonalDecomposition_Base = BasicProperOrthogonalDecomposition(backend, wrapping, online_backend, online_wrapping, AbstractProperOrthogonalDecomposition, SnapshotsMatrix, FunctionsList)
 
@@ -39,4 +40,7 @@ class ProperOrthogonalDecomposition(ProperOrthogonalDecomposition_Base):
         ProperOrthogonalDecomposition_Base.__init__(self, basis_functions, inner_product, component)
         
     def store_snapshot(self, snapshot, component=None, weight=None):
-        self.snapshots_matrix.enrich(snapshot, component, weight)
+        if self.incremental_svd_rank is not None:
+            self._store_snapshot_incrementally(snapshot, component, weight)
+        else:
+            self.snapshots_matrix.enrich(snapshot, component, weight)
@@ -16,7 +16,7 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from numpy import arange, isclose, linspace
+from numpy import arange, array_equal, empty, isclose, linspace
 try:
     from assimulo.solvers import IDA
     from assimulo.problem import Implicit_Problem
@@ -31,6 +31,7 @@ from rbnics.backends.online.numpy.copy import function_copy
 from rbnics.backends.online.numpy.function import Function
 from rbnics.backends.online.numpy.linear_solver import LinearSolver
 from rbnics.backends.online.numpy.nonlinear_solver import NonlinearSolver, NonlinearProblemWrapper
+from rbnics.backends.online.numpy.wrapping import Factorization
 from rbnics.utils.decorators import BackendFor
 
 @BackendFor("numpy", inputs=(TimeDependentProblemWrapper, Function.Type(), Function.Type(), (Function.Type(), None)))
@@ -40,6 +41,7 @@ class TimeStepping(AbstractTimeStepping):
         ic = problem_wrapper.ic_eval()
         if ic is not None:
             assign(solution, ic)
+        self._ic_eval = problem_wrapper.ic_eval
         self.problem = _TimeDependentProblem(problem_wrapper.residual_eval, solution, solution_dot, problem_wrapper.bc_eval, problem_wrapper.jacobian_eval, problem_wrapper.set_time)
         self._monitor_callback = problem_wrapper.monitor
         self.solver = self.problem.create_solver({"problem_type": "linear"})
@@ -52,6 +54,13 @@ class TimeStepping(AbstractTimeStepping):
     def solve(self):
         self.solver.solve()
         
+    # Solve n_problems linear problems at once (e.g. the same problem for several parameters), where set_problem(i)
+    # is called before any evaluation related to the i-th problem. Return a list (over problems) of lists (over monitor
+    # times) of solutions.
+    def solve_batch(self, set_problem, n_problems):
+        assert isinstance(self.solver, _ScipyImplicitEuler), "Batched solves are only available for the implicit Euler integrator"
+        return self.solver.solve_batch(self._ic_eval, set_problem, n_problems)
+        
 class _TimeDependentProblem(object):
     def __init__(self, residual_eval, solution, solution_dot, bc_eval, jacobian_eval, set_time):
         self.residual_eval = residual_eval
@@ -104,12 +113,14 @@ class _ScipyImplicitEuler(object):
         # Setup solver
         if problem_type == "linear":
             self.minus_solution_previous_over_dt = function_copy(solution)
+            self._lhs = None # left-hand side of the previous time step
+            self._lhs_content = None # copy of its content, before boundary conditions were applied
             class _LinearSolver(LinearSolver):
                 def __init__(self_, t):
                     self.set_time(t)
                     self.minus_solution_previous_over_dt.vector()[:] = self.solution_previous.vector()
                     self.minus_solution_previous_over_dt.vector()[:] /= - self._time_step_size
-                    lhs = self.jacobian_eval(t, self.zero, self.zero, 1./self._time_step_size)
+                    lhs = self._lhs_eval(t)
                     rhs = - self.residual_eval(t, self.zero, self.minus_solution_previous_over_dt)
                     bcs_t = self.bc_eval(t)
                     LinearSolver.__init__(self_, lhs, self.solution, rhs, bcs_t)
@@ -147,6 +158,20 @@ class _ScipyImplicitEuler(object):
         self._monitor_initial_time = None
         self._monitor_time_step_size = None
         self._time_step_size = None
+        self._time_invariant_lhs = None
+        
+    # Left-hand side of the linear system at time t. If it does not depend on time (either because the time_invariant_lhs
+    # parameter has been set to True, or because it is found to be equal to the one of the previous time step), the
+    # left-hand side of the previous time step is returned, so that the linear solver only factorizes it once
+    def _lhs_eval(self, t):
+        if self._time_invariant_lhs is True and self._lhs is not None:
+            return self._lhs
+        lhs = self.jacobian_eval(t, self.zero, self.zero, 1./self._time_step_size)
+        if self._time_invariant_lhs is None and self._lhs is not None and array_equal(lhs.content, self._lhs_content):
+            return self._lhs
+        self._lhs = lhs
+        self._lhs_content = lhs.content.copy()
+        return lhs
         
     def _monitor(self, t, solution, solution_dot):
         if self._monitor_callback is not None:
@@ -180,12 +205,15 @@ class _ScipyImplicitEuler(object):
                     self._report = print_time
                 else:
                     self._report = None
+            elif key == "time_invariant_lhs":
+                assert value in (None, True, False) # None to detect it at each time step
+                self._time_invariant_lhs = value
             elif key == "time_step_size":
                 self._time_step_size = value
             else:
                 raise ValueError("Invalid paramater passed to _ScipyImplicitEuler object.")
                 
-    def solve(self):
+    def _prepare_time_arrays(self):
         # Prepar time array
         assert self._max_time_steps is not None or self._time_step_size is not None
         if self._time_step_size is not None:
@@ -211,6 +239,13 @@ class _ScipyImplicitEuler(object):
         assert isclose(all_t[monitor_first_index], self._monitor_initial_time, atol=0.1*self._time_step_size)
         monitor_step = int(round(monitor_dt_consistency))
         monitor_t = all_t[monitor_first_index::monitor_step]
+        return (all_t, monitor_t)
+        
+    def solve(self):
+        (all_t, monitor_t) = self._prepare_time_arrays()
+        if self.problem_type == "linear":
+            self._lhs = None
+            self._lhs_content = None
         # Solve
         if all_t[0] in monitor_t:
             self._monitor(all_t[0], self.solution, self.solution_dot)
@@ -226,6 +261,80 @@ class _ScipyImplicitEuler(object):
             if t in monitor_t:
                 self._monitor(t, self.solution, self.solution_dot)
             self.solution_previous.vector()[:] = self.solution.vector()
+            
+    # Integrate n_problems linear problems at once, storing their solutions as columns of a block. As in _lhs_eval,
+    # left-hand sides are re-evaluated at each time step (unless the time_invariant_lhs parameter has been set to True)
+    # and refactorized only when any of them changes. Problems sharing the same left-hand side (e.g. when its thetas
+    # do not depend on the parameters) are solved together, as a single system with several right-hand sides
+    def solve_batch(self, ic_eval, set_problem, n_problems):
+        assert self.problem_type == "linear"
+        (all_t, monitor_t) = self._prepare_time_arrays()
+        N = self.solution.vector().N
+        # Initial conditions
+        solutions = empty((N, n_problems))
+        for i in range(n_problems):
+            set_problem(i)
+            ic = ic_eval()
+            if ic is not None:
+                solutions[:, i] = ic.vector()
+            else:
+                solutions[:, i] = 0.
+        solutions_over_time = [list() for _ in range(n_problems)]
+        
+        def store_solutions(t):
+            if t in monitor_t:
+                for i in range(n_problems):
+                    solution = Function(N)
+                    solution.vector()[:] = solutions[:, i]
+                    solutions_over_time[i].append(solution)
+        
+        store_solutions(all_t[0])
+        # Solve
+        lhs = [None]*n_problems # with boundary conditions applied
+        lhs_content = [None]*n_problems # copies of their content, before boundary conditions were applied
+        factorizations = list() # of (factorization, problems indices) pairs
+        rhs = empty((N, n_problems))
+        for t in all_t[1:]:
+            if self._report is not None:
+                self._report(t)
+            for i in range(n_problems):
+                set_problem(i)
+                self.set_time(t)
+                self.minus_solution_previous_over_dt.vector()[:] = solutions[:, i]
+                self.minus_solution_previous_over_dt.vector()[:] /= - self._time_step_size
+                rhs_i = - self.residual_eval(t, self.zero, self.minus_solution_previous_over_dt)
+                bcs_t = self._dirichlet_bc(self.bc_eval(t), rhs_i)
+                bcs_t.apply_to_vector(rhs_i)
+                rhs[:, i] = rhs_i
+                if lhs[i] is None or self._time_invariant_lhs is not True:
+                    lhs_i = self.jacobian_eval(t, self.zero, self.zero, 1./self._time_step_size)
+                    if (
+                        lhs[i] is None or self._time_invariant_lhs is False
+                            or not array_equal(lhs_i.content, lhs_content[i])
+                    ):
+                        lhs_content[i] = lhs_i.content.copy()
+                        bcs_t.apply_to_matrix(lhs_i)
+                        lhs[i] = lhs_i
+                        factorizations = list()
+            if len(factorizations) == 0:
+                for i in range(n_problems):
+                    for (factorization, indices) in factorizations:
+                        if array_equal(factorization.matrix, lhs[i].content):
+                            indices.append(i)
+                            break
+                    else:
+                        factorizations.append((Factorization(lhs[i]), [i]))
+            for (factorization, indices) in factorizations:
+                solutions[:, indices] = factorization.solve(rhs[:, indices])
+            store_solutions(t)
+        return solutions_over_time
+        
+    @staticmethod
+    def _dirichlet_bc(bcs_t, vector):
+        if isinstance(bcs_t, dict):
+            return DirichletBC(bcs_t, vector._component_name_to_basis_component_index, vector.N)
+        else:
+            return DirichletBC(bcs_t)
         
 if has_IDA:
     class _AssimuloIDA(object):
@@ -345,6 +454,8 @@ if has_IDA:
                     self._relative_tolerance = value
                 elif key == "report":
                     self._report = True
+                elif key == "time_invariant_lhs":
+                    pass
                 elif key == "time_step_size":
                     self._time_step_size = value
                 else:
@@ -25,12 +25,12 @@ from rbnics.backends.online.numpy.matrix import Matrix
 from rbnics.backends.online.numpy.non_affine_expansion_storage import NonAffineExpansionStorage
 from rbnics.backends.online.numpy.tensors_list import TensorsList
 from rbnics.backends.online.numpy.vector import Vector
-from rbnics.backends.online.numpy.wrapping import function_to_vector, matrix_mul_vector, vector_mul_vector, vectorized_matrix_inner_vectorized_matrix
+from rbnics.backends.online.numpy.wrapping import basis_functions_matrix_transpose_mul_matrix_mul_basis_functions_matrix, basis_functions_matrix_transpose_mul_vector, function_to_vector, matrix_mul_vector, vector_mul_vector, vectorized_matrix_inner_vectorized_matrix
 from rbnics.utils.decorators import backend_for, ModuleWrapper
 
 backend = ModuleWrapper(BasisFunctionsMatrix, Function, FunctionsList, Matrix, NonAffineExpansionStorage, TensorsList, Vector)
 DelayedTransposeWithArithmetic = BasicDelayedTransposeWithArithmetic(backend)
-wrapping = ModuleWrapper(function_to_vector, matrix_mul_vector, vector_mul_vector, vectorized_matrix_inner_vectorized_matrix, DelayedTransposeWithArithmetic=DelayedTransposeWithArithmetic)
+wrapping = ModuleWrapper(basis_functions_matrix_transpose_mul_matrix_mul_basis_functions_matrix, basis_functions_matrix_transpose_mul_vector, function_to_vector, matrix_mul_vector, vector_mul_vector, vectorized_matrix_inner_vectorized_matrix, DelayedTransposeWithArithmetic=DelayedTransposeWithArithmetic)
 online_backend = ModuleWrapper(OnlineMatrix=Matrix, OnlineVector=Vector)
 online_wrapping = ModuleWrapper()
 transpose_base = basic_transpose(backend, wrapping, online_backend, online_wrapping)
@@ -0,0 +1,31 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from rbnics.backends.online.numpy.wrapping.function_to_vector import function_to_vector
+from rbnics.backends.online.numpy.wrapping.matrix_mul import matrix_mul_vector
+from rbnics.backends.online.numpy.wrapping.vector_mul import vector_mul_vector
+
+def _basis_functions(basis_functions_matrix):
+    return [fun_i for component_name in basis_functions_matrix._components_name for fun_i in basis_functions_matrix._components[component_name]]
+
+def basis_functions_matrix_transpose_mul_vector(basis_functions_matrix, vector):
+    return [vector_mul_vector(function_to_vector(fun_i), vector) for fun_i in _basis_functions(basis_functions_matrix)]
+    
+def basis_functions_matrix_transpose_mul_matrix_mul_basis_functions_matrix(basis_functions_matrix, matrix, other_basis_functions_matrix):
+    matrix_times_other_basis_functions = [matrix_mul_vector(matrix, function_to_vector(fun_j)) for fun_j in _basis_functions(other_basis_functions_matrix)]
+    return [[vector_mul_vector(function_to_vector(fun_i), matrix_times_fun_j) for matrix_times_fun_j in matrix_times_other_basis_functions] for fun_i in _basis_functions(basis_functions_matrix)]
@@ -0,0 +1,91 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import warnings
+from numpy import absolute, allclose, array_equal, asarray, diag, finfo, tril, triu
+from numpy.linalg import LinAlgError
+from pylru import lrucache
+from scipy.linalg import cho_factor, cho_solve, LinAlgWarning, lu_factor, lu_solve, solve_triangular
+
+# Factorization of a reduced matrix, which can be reused to solve for several right-hand sides (either
+# one at a time, or stacked as columns of a matrix). Triangular matrices (e.g. EIM interpolation matrices)
+# are not factorized at all, symmetric positive definite matrices are factorized by Cholesky, and all
+# remaining matrices by LU with partial pivoting
+class Factorization(object):
+    def __init__(self, matrix):
+        self.matrix = asarray(matrix, dtype=float).copy()
+        assert len(self.matrix.shape) == 2
+        assert self.matrix.shape[0] == self.matrix.shape[1]
+        # Entries below the roundoff level of the matrix are neglected when detecting its structure
+        tolerance = 100*finfo(float).eps*absolute(self.matrix).max(initial=0.)
+        if absolute(triu(self.matrix, 1)).max(initial=0.) <= tolerance:
+            self.structure = "lower triangular"
+            self._check_triangular_diagonal()
+        elif absolute(tril(self.matrix, -1)).max(initial=0.) <= tolerance:
+            self.structure = "upper triangular"
+            self._check_triangular_diagonal()
+        else:
+            self.structure = None
+            if allclose(self.matrix, self.matrix.T, rtol=0., atol=tolerance):
+                try:
+                    self._factors = cho_factor(self.matrix)
+                except LinAlgError: # not positive definite
+                    pass
+                else:
+                    self.structure = "symmetric positive definite"
+            if self.structure is None:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", LinAlgWarning)
+                    self._factors = lu_factor(self.matrix)
+                if (diag(self._factors[0]) == 0.).any():
+                    raise LinAlgError("Singular matrix")
+                self.structure = "general"
+                
+    def _check_triangular_diagonal(self):
+        if (diag(self.matrix) == 0.).any():
+            raise LinAlgError("Singular matrix")
+        
+    def solve(self, rhs):
+        rhs = asarray(rhs, dtype=float)
+        if self.structure == "lower triangular":
+            return solve_triangular(self.matrix, rhs, lower=True)
+        elif self.structure == "upper triangular":
+            return solve_triangular(self.matrix, rhs, lower=False)
+        elif self.structure == "symmetric positive definite":
+            return cho_solve(self._factors, rhs)
+        else:
+            return lu_solve(self._factors, rhs)
+            
+# Factorizations are cached by matrix identity, so that matrices which are stored and reused (e.g. inner products,
+# constant operators in time stepping, EIM interpolation matrices) are factorized only once. Since matrices may also
+# be changed in place, a cached factorization is only reused if the content of the matrix is unchanged as well,
+# which is much cheaper to check than computing a new factorization
+_factorizations_cache = lrucache(32)
+
+def factorize(matrix):
+    content = asarray(matrix, dtype=float)
+    try:
+        factorization = _factorizations_cache[id(matrix)]
+    except KeyError:
+        pass
+    else:
+        if factorization.matrix.shape == content.shape and array_equal(factorization.matrix, content):
+            return factorization
+    factorization = Factorization(content)
+    _factorizations_cache[id(matrix)] = factorization
+    return factorization
@@ -16,6 +16,19 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from numpy import column_stack
+
 def gram_schmidt_projection_step(new_basis, inner_product, old_basis, transpose):
     new_basis.vector()[:] -= (transpose(new_basis)*inner_product*old_basis) * old_basis.vector()
     return new_basis
+
+# Old basis functions are stored as the first columns, while the remaining ones will be overwritten by gram_schmidt_block_store
+def gram_schmidt_block_local_array(old_basis_functions, new_basis_functions):
+    return column_stack([basis.vector() for basis in list(old_basis_functions) + list(new_basis_functions)])
+    
+def gram_schmidt_block_store(new_basis, local_array, index):
+    local_array[:, index] = new_basis.vector()
+
+def gram_schmidt_block_projection_step(new_basis, inner_product_times_new_basis, previous_basis_functions_local_array):
+    new_basis.vector()[:] -= previous_basis_functions_local_array.dot(previous_basis_functions_local_array.T.dot(inner_product_times_new_basis))
+    return new_basis
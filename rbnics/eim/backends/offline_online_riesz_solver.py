@@ -17,7 +17,6 @@
 #
 
 from numbers import Number
-from rbnics.backends import LinearSolver
 from rbnics.backends.basic.wrapping import DelayedLinearSolver, DelayedProduct
 from rbnics.eim.backends.offline_online_switch import OfflineOnlineSwitch
 from rbnics.utils.cache import cache
@@ -52,26 +51,40 @@ def OfflineOnlineRieszSolver(problem_name):
             
             @overload
             def solve(self, rhs: object):
+                return self.solve_block([(rhs, )])[0]
+                    
+            @overload
+            def solve(self, coef: Number, matrix: object, basis_function: object):
+                return self.solve_block([(coef, matrix, basis_function)])[0]
+                
+            # Solve for several Riesz representors at once: if not delayed, the inner product is factorized only once
+            def solve_block(self, solve_block_args):
                 problem = self.problem
-                args = (problem._riesz_solve_inner_product, problem._riesz_solve_storage, rhs, problem._riesz_solve_homogeneous_dirichlet_bc)
+                rhs_block = [self._rhs(*args) for args in solve_block_args]
+                if len(rhs_block) == 0:
+                    return list()
                 if not self.delay:
-                    solver = LinearSolver(*args)
-                    solver.set_parameters(problem._linear_solver_parameters)
-                    solver.solve()
-                    return problem._riesz_solve_storage
+                    return problem._get_riesz_solve_linear_solver(rhs_block[0]).solve_block(rhs_block)
                 else:
-                    solver = DelayedLinearSolver(*args)
-                    solver.set_parameters(problem._linear_solver_parameters)
-                    return solver
+                    solvers = list()
+                    for rhs in rhs_block:
+                        solver = DelayedLinearSolver(problem._riesz_solve_inner_product, problem._riesz_solve_storage, rhs, problem._riesz_solve_homogeneous_dirichlet_bc)
+                        solver.set_parameters(problem._linear_solver_parameters)
+                        solvers.append(solver)
+                    return solvers
                     
             @overload
-            def solve(self, coef: Number, matrix: object, basis_function: object):
+            def _rhs(self, rhs: object):
+                return rhs
+                
+            @overload
+            def _rhs(self, coef: Number, matrix: object, basis_function: object):
                 if not self.delay:
-                    rhs = coef*matrix*basis_function
+                    return coef*matrix*basis_function
                 else:
                     rhs = DelayedProduct(coef)
                     rhs *= matrix
                     rhs *= basis_function
-                return self.solve(rhs)
+                    return rhs
             
     return _OfflineOnlineRieszSolver
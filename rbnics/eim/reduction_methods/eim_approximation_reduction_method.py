@@ -17,8 +17,11 @@
 #
 
 import os
+from numpy import argmax, array, asarray, zeros
+from scipy.linalg import solve_triangular
 from rbnics.reduction_methods.base import ReductionMethod
 from rbnics.backends import abs, evaluate, max
+from rbnics.backends.online import OnlineFunction
 from rbnics.utils.decorators import snapshot_links_to_cache
 from rbnics.utils.io import ErrorAnalysisTable, Folders, GreedySelectedParametersList, GreedyErrorEstimatorsList, SpeedupAnalysisTable, TextBox, TextLine, Timer
 from rbnics.utils.test import PatchInstanceMethod
@@ -245,19 +248,13 @@ class EIMApproximationReductionMethod(ReductionMethod):
             print("interpolation error on interpolation locations for current mu =", abs(maximum_error_on_interpolation_locations))
         
         # Carry out the actual greedy search
-        def solve_and_computer_error(mu):
-            self.EIM_approximation.set_mu(mu)
-            
-            self.EIM_approximation.solve()
-            self.EIM_approximation.snapshot = self.load_snapshot()
-            (_, maximum_error, _) = self.EIM_approximation.compute_maximum_interpolation_error()
-            return abs(maximum_error)
-            
         if self.EIM_approximation.N == 0:
             print("find initial mu")
         else:
             print("find next mu")
-        (error_max, error_argmax) = self.training_set.max(solve_and_computer_error)
+        maximum_errors = self._compute_maximum_interpolation_errors_on_training_set()
+        error_argmax = int(argmax(maximum_errors))
+        error_max = float(maximum_errors[error_argmax])
         self.EIM_approximation.set_mu(self.training_set[error_argmax])
         self.greedy_selected_parameters.append(self.training_set[error_argmax])
         self.greedy_selected_parameters.save(self.folder["post_processing"], "mu_greedy")
@@ -280,6 +277,31 @@ class EIMApproximationReductionMethod(ReductionMethod):
                 self.tol = 1.
             return (0., 0.)
     
+    # Compute the maximum interpolation error for all parameters in the training set (which is
+    # not distributed, and whose ordering is the same of the snapshots container). Rather than solving
+    # the interpolation problem for one parameter at a time (which would require to evaluate the parametrized
+    # expression at the interpolation locations), the stored snapshots are evaluated at the interpolation locations,
+    # and the (lower triangular) interpolation system is solved for all parameters at once
+    def _compute_maximum_interpolation_errors_on_training_set(self):
+        N = self.EIM_approximation.N
+        if N > 0:
+            basis_functions = self.EIM_approximation.basis_functions[:N]
+            interpolation_locations = self.EIM_approximation.interpolation_locations[:N]
+            interpolation_matrix = asarray(self.EIM_approximation.interpolation_matrix[0][:N, :N])
+            snapshots_on_interpolation_locations = array([asarray(evaluate(snapshot, interpolation_locations)) for snapshot in self.snapshots_container]).T
+            interpolation_coefficients = solve_triangular(interpolation_matrix, snapshots_on_interpolation_locations, lower=True)
+        maximum_errors = zeros(len(self.snapshots_container))
+        for (mu_index, snapshot) in enumerate(self.snapshots_container):
+            if N > 0:
+                interpolation_coefficients_mu = OnlineFunction(N)
+                interpolation_coefficients_mu.vector()[:] = interpolation_coefficients[:, mu_index]
+                error = snapshot - basis_functions*interpolation_coefficients_mu
+            else:
+                error = snapshot
+            (maximum_error, _) = max(abs(error))
+            maximum_errors[mu_index] = abs(maximum_error)
+        return maximum_errors
+    
     # Compute the error of the empirical interpolation approximation with respect to the
     # exact function over the testing set
     def error_analysis(self, N_generator=None, filename=None, **kwargs):
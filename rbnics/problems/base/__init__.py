@@ -32,6 +32,7 @@ from rbnics.problems.base.nonlinear_time_dependent_pod_galerkin_reduced_problem
 from rbnics.problems.base.nonlinear_time_dependent_problem import NonlinearTimeDependentProblem
 from rbnics.problems.base.nonlinear_time_dependent_rb_reduced_problem import NonlinearTimeDependentRBReducedProblem
 from rbnics.problems.base.nonlinear_time_dependent_reduced_problem import NonlinearTimeDependentReducedProblem
+from rbnics.problems.base.online_evaluation_engine import OnlineEvaluationEngine
 from rbnics.problems.base.parametrized_differential_problem import ParametrizedDifferentialProblem
 from rbnics.problems.base.parametrized_problem import ParametrizedProblem
 from rbnics.problems.base.parametrized_reduced_differential_problem import ParametrizedReducedDifferentialProblem
@@ -60,6 +61,7 @@ __all__ = [
     'NonlinearTimeDependentProblem',
     'NonlinearTimeDependentRBReducedProblem',
     'NonlinearTimeDependentReducedProblem',
+    'OnlineEvaluationEngine',
     'ParametrizedDifferentialProblem',
     'ParametrizedProblem',
     'ParametrizedReducedDifferentialProblem',
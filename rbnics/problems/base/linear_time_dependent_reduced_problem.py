@@ -16,6 +16,7 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from rbnics.backends.online import OnlineFunction, OnlineTimeStepping
 from rbnics.problems.base.linear_reduced_problem import LinearReducedProblem
 from rbnics.problems.base.time_dependent_reduced_problem import TimeDependentReducedProblem
 from rbnics.utils.decorators import PreserveClassName, RequiredBaseDecorators
@@ -30,6 +31,31 @@ def LinearTimeDependentReducedProblem(ParametrizedReducedDifferentialProblem_Der
             ParametrizedReducedDifferentialProblem_DerivedClass.__init__(self, truth_problem, **kwargs)
             # Set the problem type in time stepping parameters
             self._time_stepping_parameters["problem_type"] = "linear"
+            
+        def solve_batch(self, mus, N=None, **kwargs):
+            """
+            Perform an online solve for each parameter in mus, integrating all of them at once in time.
+            Left-hand sides are re-evaluated at each time step, and refactorized only when they change, unless
+            they have been declared not to depend on time through set_time_invariant_lhs(True).
+            Solutions are neither cached nor stored as the current solution.
+            
+            :param mus: list of parameters.
+            :param N: dimension of the reduced problem.
+            :return: list (one for each parameter) of reduced solutions over time.
+            """
+            N, kwargs = self._online_size_from_kwargs(N, **kwargs)
+            N += self.N_bc
+            mu = self.mu
+            problem_solver = self.ProblemSolver(self, N, **kwargs)
+            solver = OnlineTimeStepping(problem_solver, OnlineFunction(N), OnlineFunction(N))
+            solver.set_parameters(self._time_stepping_parameters)
+            
+            def set_problem(i):
+                self.set_mu(mus[i])
+                
+            solutions_over_time = solver.solve_batch(set_problem, len(mus))
+            self.set_mu(mu)
+            return solutions_over_time
         
     # return value (a class) for the decorator
     return LinearTimeDependentReducedProblem_Class
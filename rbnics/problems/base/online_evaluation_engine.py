@@ -0,0 +1,241 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import sys
+from io import TextIOWrapper
+from math import isnan
+from numbers import Number
+from socketserver import StreamRequestHandler, TCPServer, UnixStreamServer
+from numpy import asarray, full, nan
+from rbnics.problems.base.parametrized_reduced_differential_problem import ParametrizedReducedDifferentialProblem
+
+class OnlineEvaluationEngine(object):
+    """
+    Long-lived online evaluation engine, which answers batches of parameter queries
+    using a reduced problem whose online data has been loaded only once.
+    
+    :param reduced_problem: reduced problem, as returned by the offline() method of a reduction method.
+    """
+    
+    def __init__(self, reduced_problem):
+        assert isinstance(reduced_problem, ParametrizedReducedDifferentialProblem)
+        # Solutions of time dependent problems are time series, which cannot be collected in a single row of an array
+        assert not hasattr(reduced_problem, "set_time"), "Time dependent problems are not supported"
+        self.reduced_problem = reduced_problem
+        # Make sure that online data are available (this is a no-op if they have already been loaded)
+        self.reduced_problem.init("online")
+        
+    def evaluate(self, mus, N=None, tolerance=None, quantities=("solution", "output", "error_estimator")):
+        """
+        Evaluate the reduced problem for each parameter in mus.
+        
+        :param mus: array of parameters, one row for each parameter.
+        :param N: dimension of the reduced problem. Defaults to the full reduced basis size.
+        :param tolerance: if provided (instead of N), the smallest N for which the error estimator is
+            below tolerance is selected independently for each parameter.
+        :param quantities: quantities to be returned, among "solution", "output" and "error_estimator".
+        :return: dict of arrays, one row for each parameter. The "N" entry contains the dimension employed
+            for each parameter, while reduced solutions of different dimensions are padded with nan.
+        """
+        if N is not None and tolerance is not None:
+            raise ValueError("You cannot provide both N and tolerance")
+        for quantity in quantities:
+            if quantity not in ("solution", "output", "error_estimator"):
+                raise ValueError("Invalid quantity " + str(quantity))
+        if tolerance is not None and not self._has_error_estimator():
+            raise ValueError("An error estimator is required to select N from a tolerance")
+        mus = self._preprocess_mus(mus)
+        
+        # Error estimators for the full reduced basis size are computed for all parameters at once,
+        # possibly with a vectorized implementation provided by the reduced problem
+        if (
+            tolerance is None and (N is None or N == self.reduced_problem.N)
+                and "error_estimator" in quantities and hasattr(self.reduced_problem, "estimate_error_batch")
+        ):
+            error_estimators = self.reduced_problem.estimate_error_batch(mus)
+            quantities = tuple(quantity for quantity in quantities if quantity != "error_estimator")
+        else:
+            error_estimators = None
+            
+        # Solve and evaluate for each parameter
+        results = list()
+        for (i, mu) in enumerate(mus):
+            self.reduced_problem.set_mu(mu)
+            if tolerance is not None:
+                N_mu = self._N_from_tolerance(tolerance)
+            else:
+                N_mu = N
+            results.append(self._evaluate_at_current_mu(N_mu, quantities))
+            if error_estimators is not None:
+                results[-1]["error_estimator"] = error_estimators[i]
+        if error_estimators is not None:
+            quantities = quantities + ("error_estimator", )
+            
+        # Collect results in arrays
+        return self._results_to_arrays(results, quantities)
+        
+    def _preprocess_mus(self, mus):
+        mus = asarray(mus, dtype=float)
+        if mus.ndim == 1:
+            mus = mus.reshape(1, -1)
+        if mus.ndim != 2:
+            raise ValueError("Parameters should be provided as a two dimensional array")
+        if mus.shape[1] != len(self.reduced_problem.mu_range):
+            raise ValueError("Each parameter should have length " + str(len(self.reduced_problem.mu_range)))
+        return [tuple(mu) for mu in mus.tolist()]
+        
+    def _has_error_estimator(self):
+        return hasattr(self.reduced_problem, "estimate_error")
+        
+    def _N_max(self):
+        N = self.reduced_problem.N
+        if isinstance(N, dict):
+            return min(N.values()) # a common integer size is used for all components
+        else:
+            return N
+            
+    # Bisection on N, assuming that the error estimator is non increasing with N (which is the case
+    # for nested reduced spaces in all practical cases). If the tolerance cannot be met, the full
+    # reduced basis size is returned.
+    def _N_from_tolerance(self, tolerance):
+        N_min = 1
+        N_max = self._N_max()
+        while N_min < N_max:
+            N_mid = (N_min + N_max)//2
+            self.reduced_problem.solve(N_mid)
+            if self.reduced_problem.estimate_error() <= tolerance:
+                N_max = N_mid
+            else:
+                N_min = N_mid + 1
+        return N_max
+        
+    def _evaluate_at_current_mu(self, N, quantities):
+        result = dict()
+        if len(quantities) == 0 and not isinstance(self.reduced_problem.N, dict):
+            # Nothing to evaluate but the dimension, hence avoid solving
+            result["N"] = (N if N is not None else self.reduced_problem.N) + self.reduced_problem.N_bc
+            return result
+        solution = self.reduced_problem.solve(N)
+        result["N"] = solution.N
+        if "solution" in quantities:
+            result["solution"] = asarray(solution.vector())
+        if "output" in quantities:
+            output = self.reduced_problem.compute_output()
+            assert output is NotImplemented or isinstance(output, Number), "Only scalar outputs are supported"
+            result["output"] = output if output is not NotImplemented else nan
+        if "error_estimator" in quantities:
+            if self._has_error_estimator():
+                result["error_estimator"] = self.reduced_problem.estimate_error()
+            else:
+                result["error_estimator"] = nan
+        return result
+        
+    def _results_to_arrays(self, results, quantities):
+        arrays = dict()
+        if isinstance(self.reduced_problem.N, dict):
+            arrays["N"] = asarray([sum(result["N"].values()) for result in results], dtype=int)
+        else:
+            arrays["N"] = asarray([result["N"] for result in results], dtype=int)
+        if "solution" in quantities:
+            max_size = max([len(result["solution"]) for result in results], default=0)
+            arrays["solution"] = full((len(results), max_size), nan)
+            for (i, result) in enumerate(results):
+                arrays["solution"][i, :len(result["solution"])] = result["solution"]
+        for quantity in ("output", "error_estimator"):
+            if quantity in quantities:
+                arrays[quantity] = asarray([result[quantity] for result in results], dtype=float)
+        return arrays
+        
+    def serve(self, input_stream=None, output_stream=None):
+        """
+        Serve batches of queries read from input_stream (defaults to stdin), writing
+        answers on output_stream (defaults to stdout). Each query is a JSON object on a single line, e.g.
+            {"mu": [[1.0, 2.0], [3.0, 4.0]], "N": 10}
+        or
+            {"mu": [[1.0, 2.0], [3.0, 4.0]], "tolerance": 1.e-3, "quantities": ["output", "error_estimator"]}
+        and each answer is a JSON object on a single line, containing either the evaluated
+        arrays as lists (with nan converted to null) or an "error" entry.
+        """
+        if input_stream is None:
+            input_stream = sys.stdin
+        if output_stream is None:
+            output_stream = sys.stdout
+        for line in input_stream:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            answer = self._answer(line)
+            output_stream.write(answer + "\n")
+            output_stream.flush()
+            
+    def serve_on_socket(self, address):
+        """
+        Serve batches of queries on a local socket, using the same line based JSON protocol of serve().
+        
+        :param address: either a (host, port) tuple for a TCP socket, or a path for a Unix domain socket.
+        Connections are served one at a time, since the reduced problem is not thread safe.
+        """
+        engine = self
+        
+        class Handler(StreamRequestHandler):
+            def handle(self):
+                engine.serve(self.rfile, TextIOWrapper(self.wfile, encoding="utf-8", write_through=True))
+                
+        if isinstance(address, tuple):
+            Server = TCPServer
+        else:
+            Server = UnixStreamServer
+        with Server(address, Handler) as server:
+            server.serve_forever()
+            
+    def _answer(self, line):
+        # Invalid queries are reported to the client with an error entry, while any other exception is propagated
+        try:
+            query = json.loads(line)
+            if not isinstance(query, dict):
+                raise TypeError("Query should be a JSON object")
+            if "mu" not in query:
+                raise ValueError("Query should contain the mu entry")
+            kwargs = dict()
+            for key in ("N", "tolerance"):
+                if key in query:
+                    kwargs[key] = query[key]
+            if "N" in kwargs and not isinstance(kwargs["N"], int):
+                raise TypeError("N should be an integer")
+            if "tolerance" in kwargs and not isinstance(kwargs["tolerance"], Number):
+                raise TypeError("tolerance should be a number")
+            if "quantities" in query:
+                if not isinstance(query["quantities"], list):
+                    raise TypeError("quantities should be a list")
+                kwargs["quantities"] = tuple(query["quantities"])
+            arrays = self.evaluate(query["mu"], **kwargs)
+        except (TypeError, ValueError) as e: # also includes json.JSONDecodeError
+            return json.dumps({"error": type(e).__name__ + ": " + str(e)})
+        else:
+            return json.dumps({key: _nan_to_none(value.tolist()) for (key, value) in arrays.items()})
+            
+def _nan_to_none(value):
+    if isinstance(value, list):
+        return [_nan_to_none(v) for v in value]
+    elif isinstance(value, float) and isnan(value):
+        return None
+    else:
+        return value
@@ -22,7 +22,7 @@ from math import sqrt
 from numpy import isclose
 from rbnics.problems.base.parametrized_problem import ParametrizedProblem
 from rbnics.backends import assign, BasisFunctionsMatrix, copy, product, sum, transpose
-from rbnics.backends.online import OnlineAffineExpansionStorage, OnlineFunction, OnlineLinearSolver
+from rbnics.backends.online import OnlineAffineExpansionStorage, OnlineFunction, OnlineLinearSolver, OnlineMatrix, OnlineVector
 from rbnics.utils.cache import Cache
 from rbnics.utils.decorators import StoreMapFromProblemToReducedProblem, sync_setters
 from rbnics.utils.io import OnlineSizeDict
@@ -90,6 +90,10 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
         self.truth_problem = truth_problem
         # Basis functions matrix
         self.basis_functions = None # BasisFunctionsMatrix
+        # Incremental projection of reduced operators, which reuses the projection computed before the latest enrichment
+        # (enabled by the reduction method, see RBReduction.set_incremental_projection)
+        self._incremental_projection = False
+        self._incremental_projection_cache = dict() # from (term, q) or inner product term to previously projected data
         # I/O
         self.folder["basis"] = os.path.join(self.folder_prefix, "basis")
         self.folder["reduced_operators"] = os.path.join(self.folder_prefix, "reduced_operators")
@@ -699,10 +703,8 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
                 assert self.Q[term] == self.truth_problem.Q[term]
                 for q in range(self.Q[term]):
                     assert self.terms_order[term] in (0, 1, 2)
-                    if self.terms_order[term] == 2:
-                        self.operator[term][q] = transpose(self.basis_functions)*self.truth_problem.operator[term][q]*self.basis_functions
-                    elif self.terms_order[term] == 1:
-                        self.operator[term][q] = transpose(self.basis_functions)*self.truth_problem.operator[term][q]
+                    if self.terms_order[term] in (1, 2):
+                        self.operator[term][q] = self._project_operator((term, q), self.truth_problem.operator[term][q], self.terms_order[term])
                     elif self.terms_order[term] == 0:
                         self.operator[term][q] = self.truth_problem.operator[term][q]
                     else:
@@ -715,14 +717,14 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
                     assert component in self.components
                     assert len(self.inner_product[component]) == 1 # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.inner_product[component]) == 1 # the affine expansion storage contains only the inner product matrix
-                    self.inner_product[component][0] = transpose(self.basis_functions)*self.truth_problem.inner_product[component][0]*self.basis_functions
+                    self.inner_product[component][0] = self._project_operator(term, self.truth_problem.inner_product[component][0], 2)
                     self.inner_product[component].save(self.folder["reduced_operators"], term)
                     return self.inner_product[component]
                 else:
                     assert len(self.components) == 1 # single component case
                     assert len(self.inner_product) == 1 # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.inner_product) == 1 # the affine expansion storage contains only the inner product matrix
-                    self.inner_product[0] = transpose(self.basis_functions)*self.truth_problem.inner_product[0]*self.basis_functions
+                    self.inner_product[0] = self._project_operator(term, self.truth_problem.inner_product[0], 2)
                     self.inner_product.save(self.folder["reduced_operators"], term)
                     return self.inner_product
             elif term.startswith("projection_inner_product"):
@@ -731,14 +733,14 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
                     assert component in self.components
                     assert len(self.projection_inner_product[component]) == 1 # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.projection_inner_product[component]) == 1 # the affine expansion storage contains only the inner product matrix
-                    self.projection_inner_product[component][0] = transpose(self.basis_functions)*self.truth_problem.projection_inner_product[component][0]*self.basis_functions
+                    self.projection_inner_product[component][0] = self._project_operator(term, self.truth_problem.projection_inner_product[component][0], 2)
                     self.projection_inner_product[component].save(self.folder["reduced_operators"], term)
                     return self.projection_inner_product[component]
                 else:
                     assert len(self.components) == 1 # single component case
                     assert len(self.projection_inner_product) == 1 # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.projection_inner_product) == 1 # the affine expansion storage contains only the inner product matrix
-                    self.projection_inner_product[0] = transpose(self.basis_functions)*self.truth_problem.projection_inner_product[0]*self.basis_functions
+                    self.projection_inner_product[0] = self._project_operator(term, self.truth_problem.projection_inner_product[0], 2)
                     self.projection_inner_product.save(self.folder["reduced_operators"], term)
                     return self.projection_inner_product
             elif term.startswith("dirichlet_bc"):
@@ -786,6 +788,95 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
         else:
             raise ValueError("Invalid stage in assemble_operator().")
     
+    def _project_operator(self, key, truth_operator, order):
+        assert order in (1, 2)
+        # Standard projection, if incremental projection is disabled
+        if not self._incremental_projection:
+            return self._project_operator_from_scratch(truth_operator, order)
+        # Store basis functions of each component
+        basis_functions = dict()
+        N = OnlineSizeDict()
+        for component in self.components:
+            if len(self.components) > 1:
+                basis_functions[component] = list(self.basis_functions[component])
+            else:
+                basis_functions[component] = list(self.basis_functions)
+            N[component] = len(basis_functions[component])
+        # Projections are computed from scratch the first time, if the truth operator has changed, or if the previous basis
+        # functions of each component are not the first ones of the current basis (e.g. because the basis has been cleared
+        # and rebuilt by POD). Note that the cache stores references to (rather than copies of) basis functions, which are
+        # never modified after enrichment
+        cache = self._incremental_projection_cache.get(key)
+        if (
+            cache is None or cache["truth_operator"] is not truth_operator
+                or
+            not all(
+                len(cache["basis_functions"][component]) <= N[component]
+                    and
+                all(previous is current for (previous, current) in zip(cache["basis_functions"][component], basis_functions[component]))
+                for component in self.components
+            )
+        ):
+            reduced_operator = self._project_operator_from_scratch(truth_operator, order)
+            if isinstance(reduced_operator, (OnlineMatrix.Type(), OnlineVector.Type())): # rather than delayed
+                self._incremental_projection_cache[key] = {
+                    "truth_operator": truth_operator,
+                    "basis_functions": basis_functions,
+                    "truth_operator_times_basis_functions": dict(
+                        (component, [None]*N[component]) for component in self.components
+                    ),
+                    "reduced_operator": reduced_operator
+                }
+            else:
+                self._incremental_projection_cache.pop(key, None)
+            return reduced_operator
+        # Flatten basis functions, ordered by component, and mark the ones added since the previous projection
+        N_previous = OnlineSizeDict()
+        flattened_basis_functions = list()
+        new_indices = list()
+        for component in self.components:
+            N_previous[component] = len(cache["basis_functions"][component])
+            new_indices.extend(range(len(flattened_basis_functions) + N_previous[component], len(flattened_basis_functions) + N[component]))
+            flattened_basis_functions.extend(basis_functions[component])
+        if order == 2:
+            # Compute the product of the truth operator with basis functions which have never been multiplied before
+            truth_operator_times_basis_functions = cache["truth_operator_times_basis_functions"]
+            flattened_truth_operator_times_basis_functions = list()
+            for component in self.components:
+                truth_operator_times_basis_functions_component = truth_operator_times_basis_functions[component]
+                truth_operator_times_basis_functions_component.extend([None]*(N[component] - N_previous[component]))
+                for (n, basis_function) in enumerate(basis_functions[component]):
+                    if truth_operator_times_basis_functions_component[n] is None:
+                        truth_operator_times_basis_functions_component[n] = truth_operator*basis_function
+                flattened_truth_operator_times_basis_functions.extend(truth_operator_times_basis_functions_component)
+            # Copy the previously projected block at once, and compute new rows and columns
+            reduced_operator = OnlineMatrix(N, N)
+            reduced_operator[:N_previous, :N_previous] = cache["reduced_operator"]
+            new_indices_set = set(new_indices)
+            for j in new_indices:
+                for (i, basis_function) in enumerate(flattened_basis_functions):
+                    reduced_operator[i, j] = transpose(basis_function)*flattened_truth_operator_times_basis_functions[j]
+                    if i not in new_indices_set:
+                        reduced_operator[j, i] = transpose(flattened_basis_functions[j])*flattened_truth_operator_times_basis_functions[i]
+        else:
+            # Copy previously projected entries at once, and compute new ones
+            reduced_operator = OnlineVector(N)
+            reduced_operator[:N_previous] = cache["reduced_operator"]
+            for i in new_indices:
+                reduced_operator[i] = transpose(flattened_basis_functions[i])*truth_operator
+        # Update cache
+        cache["basis_functions"] = basis_functions
+        cache["reduced_operator"] = reduced_operator
+        return reduced_operator
+        
+    def _project_operator_from_scratch(self, truth_operator, order):
+        if order == 2:
+            return transpose(self.basis_functions)*truth_operator*self.basis_functions
+        elif order == 1:
+            return transpose(self.basis_functions)*truth_operator
+        else:
+            raise ValueError("Invalid order in _project_operator_from_scratch().")
+    
     def _lifting_truth_solve(self, term, i):
         # Since lifting solves for different values of i are associated to the same parameter
         # but with a patched call to compute_theta(), which returns the i-th component, we set
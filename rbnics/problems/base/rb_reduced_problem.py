@@ -19,6 +19,7 @@
 import os
 from abc import ABCMeta, abstractmethod
 from numbers import Number
+from numpy import zeros
 from rbnics.backends import BasisFunctionsMatrix, Function, FunctionsList, LinearSolver, transpose
 from rbnics.backends.online import OnlineAffineExpansionStorage
 from rbnics.utils.decorators import overload, PreserveClassName, RequiredBaseDecorators
@@ -53,6 +54,8 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             self._riesz_solve_storage = Function(self.truth_problem.V)
             self._riesz_solve_inner_product = None # setup by init()
             self._riesz_solve_homogeneous_dirichlet_bc = None # setup by init()
+            self._riesz_solve_linear_solver = None # setup by the first Riesz solve, and kept across greedy iterations
+            self._riesz_solve_linear_solver_inputs = None
             self._error_estimation_inner_product = None # setup by init()
             # I/O
             self.folder["error_estimation"] = os.path.join(self.folder_prefix, "error_estimation")
@@ -131,6 +134,21 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             """
             raise NotImplementedError("The method estimate_relative_error() is problem-specific and needs to be overridden.")
         
+        def estimate_error_batch(self, mus):
+            """
+            Returns error bounds for the reduced solutions associated to each parameter in mus.
+            This default implementation solves and estimates the error one parameter at a time,
+            and it may be overridden by problems which are able to vectorize the computation.
+            """
+            error_estimators = zeros(len(mus))
+            mu_bak = self.mu
+            for (i, mu) in enumerate(mus):
+                self.set_mu(mu)
+                self.solve()
+                error_estimators[i] = self.estimate_error()
+            self.set_mu(mu_bak)
+            return error_estimators
+            
         def estimate_error_output(self):
             """
             It returns an error bound for the current output.
@@ -179,27 +197,32 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             :param term: the forms of the truth problem.
             """
             solver = self.RieszSolver(self)
-            # Compute the Riesz representor
+            # Compute the Riesz representors, solving for all of them at once
             assert self.terms_order[term] in (1, 2)
             if self.terms_order[term] == 1:
+                riesz_term = solver.solve_block([(self.truth_problem.operator[term][q], ) for q in range(self.Q[term])])
                 for q in range(self.Q[term]):
-                    self.riesz[term][q].enrich(
-                        solver.solve(self.truth_problem.operator[term][q])
-                    )
+                    self.riesz[term][q].enrich(riesz_term[q])
                 self.riesz[term].save(self.folder["error_estimation"], "riesz_" + term)
             elif self.terms_order[term] == 2:
+                solve_block_args = list()
+                solve_block_destinations = list() # of (q, component) pairs
                 for q in range(self.Q[term]):
                     if len(self.components) > 1:
                         for component in self.components:
                             for n in range(len(self.riesz[term][q][component]), self.N[component] + self.N_bc[component]):
-                                self.riesz[term][q][component].enrich(
-                                    solver.solve(-1., self.truth_problem.operator[term][q], self.basis_functions[component][n])
-                                )
+                                solve_block_args.append((-1., self.truth_problem.operator[term][q], self.basis_functions[component][n]))
+                                solve_block_destinations.append((q, component))
                     else:
                         for n in range(len(self.riesz[term][q]), self.N + self.N_bc):
-                            self.riesz[term][q].enrich(
-                                solver.solve(-1., self.truth_problem.operator[term][q], self.basis_functions[n])
-                            )
+                            solve_block_args.append((-1., self.truth_problem.operator[term][q], self.basis_functions[n]))
+                            solve_block_destinations.append((q, None))
+                riesz_term = solver.solve_block(solve_block_args)
+                for ((q, component), riesz_term_q_n) in zip(solve_block_destinations, riesz_term):
+                    if component is not None:
+                        self.riesz[term][q][component].enrich(riesz_term_q_n)
+                    else:
+                        self.riesz[term][q].enrich(riesz_term_q_n)
                 self.riesz[term].save(self.folder["error_estimation"], "riesz_" + term)
             else:
                 raise ValueError("Invalid value for order of term " + term)
@@ -210,15 +233,47 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             
             @overload
             def solve(self, rhs: object):
-                problem = self.problem
-                solver = LinearSolver(problem._riesz_solve_inner_product, problem._riesz_solve_storage, rhs, problem._riesz_solve_homogeneous_dirichlet_bc)
-                solver.set_parameters(problem._linear_solver_parameters)
-                solver.solve()
-                return problem._riesz_solve_storage
+                return self.solve_block([(rhs, )])[0]
                 
             @overload
             def solve(self, coef: Number, matrix: object, basis_function: object):
-                return self.solve(coef*matrix*basis_function)
+                return self.solve_block([(coef, matrix, basis_function)])[0]
+                
+            def solve_block(self, solve_block_args):
+                """
+                It solves for several Riesz representors at once, factorizing the inner product only once.
+                
+                :param solve_block_args: list of arguments of solve(), i.e. either (rhs, ) or (coef, matrix, basis_function).
+                :return: list of Riesz representors.
+                """
+                rhs_block = [self._rhs(*args) for args in solve_block_args]
+                if len(rhs_block) == 0:
+                    return list()
+                return self.problem._get_riesz_solve_linear_solver(rhs_block[0]).solve_block(rhs_block)
+                
+            @overload
+            def _rhs(self, rhs: object):
+                return rhs
+                
+            @overload
+            def _rhs(self, coef: Number, matrix: object, basis_function: object):
+                return coef*matrix*basis_function
+                
+        def _get_riesz_solve_linear_solver(self, rhs):
+            """
+            It returns the linear solver for Riesz solves, which is created (and thus factorizes the inner product) only once,
+            unless the inner product or boundary conditions are changed.
+            """
+            inputs = (self._riesz_solve_inner_product, self._riesz_solve_homogeneous_dirichlet_bc)
+            if (
+                self._riesz_solve_linear_solver is None
+                    or
+                any(input_ is not previous_input for (input_, previous_input) in zip(inputs, self._riesz_solve_linear_solver_inputs))
+            ):
+                self._riesz_solve_linear_solver = LinearSolver(inputs[0], self._riesz_solve_storage, rhs, inputs[1])
+                self._riesz_solve_linear_solver_inputs = inputs
+            self._riesz_solve_linear_solver.set_parameters(self._linear_solver_parameters)
+            return self._riesz_solve_linear_solver
                 
         def assemble_error_estimation_operators(self, term, current_stage="online"):
             """
@@ -234,7 +289,9 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
                 assert self.terms_order[term[0]] in (1, 2)
                 assert self.terms_order[term[1]] in (1, 2)
                 assert self.terms_order[term[0]] >= self.terms_order[term[1]], "Please swap the order of " + str(term) + " in self.error_estimation_terms" # otherwise for (term1, term2) of orders (1, 2) we would have a row vector, rather than a column one
-                if self.terms_order[term[0]] == 2 and self.terms_order[term[1]] == 2:
+                if self._assemble_error_estimation_operators_incrementally(term) is not NotImplemented:
+                    pass # operators have been updated in place
+                elif self.terms_order[term[0]] == 2 and self.terms_order[term[1]] == 2:
                     for q0 in range(self.Q[term[0]]):
                         for q1 in range(self.Q[term[1]]):
                             self.error_estimation_operator[term][q0, q1] = transpose(self.riesz[term[0]][q0])*self._error_estimation_inner_product*self.riesz[term[1]][q1]
@@ -255,6 +312,69 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
                 return self.error_estimation_operator[term]
             else:
                 raise ValueError("Invalid stage in assemble_error_estimation_operators().")
-        
+                
+        def _assemble_error_estimation_operators_incrementally(self, term):
+            """
+            It updates operators for error estimation after the Riesz representation has been enriched, computing only
+            inner products which involve new Riesz representers, and storing them in place.
+            Returns NotImplemented if the operators need to be assembled from scratch instead.
+            """
+            if not isinstance(self.error_estimation_operator[term], OnlineAffineExpansionStorage): # e.g. non affine storage
+                return NotImplemented
+            if len(self.components) > 1: # new rows and columns would not be appended at the end
+                return NotImplemented
+            if (self.terms_order[term[0]], self.terms_order[term[1]]) not in ((2, 2), (2, 1)):
+                return NotImplemented
+            if self.error_estimation_operator[term][0, 0] is None: # not assembled yet
+                return NotImplemented
+            X = self._error_estimation_inner_product
+            riesz_0 = self.riesz[term[0]]
+            riesz_1 = self.riesz[term[1]]
+            current_operator = self.error_estimation_operator[term][0, 0]
+            if self.terms_order[term[1]] == 2:
+                N_0_old = _size_as_int(current_operator.M)
+                N_1_old = _size_as_int(current_operator.N)
+                N_0 = len(riesz_0[0])
+                N_1 = len(riesz_1[0])
+                if self.error_estimation_operator[term].enlarge(N_0, N_1) is NotImplemented:
+                    return NotImplemented
+                # Compute matrix-vector products with the inner product matrix only once for each new representer,
+                # rather than once for each pair (q0, q1). New rows use the symmetry of X, since the transpose of a function
+                # times a basis functions matrix is not available
+                X_riesz_1_new = [[X*riesz_1[q1][n] for n in range(N_1_old, N_1)] for q1 in range(self.Q[term[1]])]
+                X_riesz_0_new = [[X*riesz_0[q0][m] for m in range(N_0_old, N_0)] for q0 in range(self.Q[term[0]])]
+                for q0 in range(self.Q[term[0]]):
+                    for q1 in range(self.Q[term[1]]):
+                        operator_q0_q1 = self.error_estimation_operator[term][q0, q1]
+                        # New columns, against all representers in riesz_0
+                        for (n, X_riesz_1_q1_n) in enumerate(X_riesz_1_new[q1], start=N_1_old):
+                            operator_q0_q1[:, n] = transpose(riesz_0[q0])*X_riesz_1_q1_n
+                        # New rows, against old representers in riesz_1 (the remaining entries have been filled in above)
+                        if N_1_old > 0:
+                            for (m, X_riesz_0_q0_m) in enumerate(X_riesz_0_new[q0], start=N_0_old):
+                                operator_q0_q1[m, :N_1_old] = transpose(riesz_1[q1][:N_1_old])*X_riesz_0_q0_m
+            else:
+                N_0_old = _size_as_int(current_operator.N)
+                N_0 = len(riesz_0[0])
+                if self.error_estimation_operator[term].enlarge(N_0) is NotImplemented:
+                    return NotImplemented
+                if N_0 == N_0_old:
+                    return
+                # Compute matrix-vector products with the inner product matrix only once for each q1
+                X_riesz_1 = list()
+                for q1 in range(self.Q[term[1]]):
+                    assert len(riesz_1[q1]) == 1
+                    X_riesz_1.append(X*riesz_1[q1][0])
+                for q0 in range(self.Q[term[0]]):
+                    for q1 in range(self.Q[term[1]]):
+                        operator_q0_q1 = self.error_estimation_operator[term][q0, q1]
+                        operator_q0_q1[N_0_old:N_0] = transpose(riesz_0[q0][N_0_old:N_0])*X_riesz_1[q1]
+            
     # return value (a class) for the decorator
     return RBReducedProblem_Class
+    
+def _size_as_int(size):
+    if isinstance(size, dict):
+        return sum(size.values())
+    else:
+        return size
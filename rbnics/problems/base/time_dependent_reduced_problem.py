@@ -109,6 +109,12 @@ def TimeDependentReducedProblem(ParametrizedReducedDifferentialProblem_DerivedCl
             self.T = T
             self._time_stepping_parameters["final_time"] = T
             
+        # Set whether the left-hand side of the reduced linear system depends on time: True if it does not (so that
+        # it is evaluated and factorized only once), False if it does, None to detect it at each time step
+        def set_time_invariant_lhs(self, time_invariant_lhs):
+            assert time_invariant_lhs in (None, True, False)
+            self._time_stepping_parameters["time_invariant_lhs"] = time_invariant_lhs
+            
         # Initialize data structures required for the online phase
         def init(self, current_stage="online"):
             # Initialize first data structures related to initial conditions
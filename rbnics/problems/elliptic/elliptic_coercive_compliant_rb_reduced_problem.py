@@ -17,7 +17,7 @@
 #
 
 from math import sqrt
-from numpy import isclose
+from numpy import isclose, sqrt as array_sqrt
 from rbnics.problems.elliptic.elliptic_coercive_compliant_problem import EllipticCoerciveCompliantProblem
 from rbnics.problems.elliptic.elliptic_coercive_compliant_reduced_problem import EllipticCoerciveCompliantReducedProblem
 from rbnics.problems.elliptic.elliptic_coercive_rb_reduced_problem import EllipticCoerciveRBReducedProblem
@@ -36,6 +36,16 @@ class EllipticCoerciveCompliantRBReducedProblem(EllipticCoerciveCompliantRBReduc
         assert beta >= 0.
         return sqrt(abs(eps2)/beta)
         
+    # Return error bounds for the reduced solutions associated to a batch of parameters
+    def estimate_error_batch(self, mus):
+        eps2_and_beta = self._get_residual_norm_squared_and_stability_factor_lower_bound_batch(mus)
+        if eps2_and_beta is NotImplemented:
+            return EllipticCoerciveCompliantRBReducedProblem_Base.estimate_error_batch(self, mus)
+        (eps2, beta) = eps2_and_beta
+        assert all(isclose(eps2[eps2 < 0.], 0.))
+        assert all(beta >= 0.)
+        return array_sqrt(abs(eps2)/beta)
+        
     # Return an error bound for the current compliant output
     def estimate_error_output(self):
         return self.estimate_error()**2
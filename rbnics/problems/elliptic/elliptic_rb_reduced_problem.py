@@ -17,8 +17,11 @@
 #
 
 from math import sqrt
-from numpy import isclose
+from numbers import Number
+from numpy import asarray, einsum, empty, isclose, newaxis, sqrt as array_sqrt
+from numpy.linalg import solve as batched_solve
 from rbnics.backends import product, sum, transpose
+from rbnics.backends.online import OnlineMatrix, OnlineVector
 from rbnics.problems.base import LinearRBReducedProblem, ParametrizedReducedDifferentialProblem
 from rbnics.problems.elliptic.elliptic_problem import EllipticProblem
 from rbnics.problems.elliptic.elliptic_reduced_problem import EllipticReducedProblem
@@ -72,3 +75,80 @@ class EllipticRBReducedProblem(EllipticRBReducedProblem_Base):
             + 2.0*(transpose(self._solution)*sum(product(theta_a, self.error_estimation_operator["a", "f"][:N], theta_f)))
             + transpose(self._solution)*sum(product(theta_a, self.error_estimation_operator["a", "a"][:N, :N], theta_a))*self._solution
         )
+        
+    # Return error bounds for the reduced solutions associated to a batch of parameters
+    def estimate_error_batch(self, mus):
+        eps2_and_beta = self._get_residual_norm_squared_and_stability_factor_lower_bound_batch(mus)
+        if eps2_and_beta is NotImplemented:
+            return EllipticRBReducedProblem_Base.estimate_error_batch(self, mus)
+        (eps2, beta) = eps2_and_beta
+        assert all(isclose(eps2[eps2 < 0.], 0.))
+        assert all(beta >= 0.)
+        return array_sqrt(abs(eps2))/beta
+        
+    # Assemble and solve the reduced problems associated to a batch of parameters as a stacked array,
+    # and return the numerator and denominator of the error bound for each parameter
+    def _get_residual_norm_squared_and_stability_factor_lower_bound_batch(self, mus):
+        # Vectorization reproduces the implementations of solve and error estimation provided by the class which
+        # defines estimate_error_batch (i.e., this class or the compliant one), and it is thus not available
+        # if a derived class (e.g., a stabilized reduced problem) customizes them
+        BatchClass = next(Class for Class in type(self).__mro__ if "estimate_error_batch" in Class.__dict__)
+        for method in ("_solve", "estimate_error", "get_residual_norm_squared"):
+            if getattr(type(self), method) is not getattr(BatchClass, method):
+                return NotImplemented
+        # Vectorization is only available for single component problems with affinely decomposed operators
+        if isinstance(self.N, dict):
+            return NotImplemented
+        N = self.N + self.N_bc
+        operator_a = self.operator["a"][:N, :N]
+        operator_f = self.operator["f"][:N]
+        error_estimation_operator_aa = self.error_estimation_operator["a", "a"][:N, :N]
+        error_estimation_operator_af = self.error_estimation_operator["a", "f"][:N]
+        error_estimation_operator_ff = self.error_estimation_operator["f", "f"]
+        Qa = self.Q["a"]
+        Qf = self.Q["f"]
+        if not (
+            all(isinstance(operator_a[qa], OnlineMatrix.Type()) for qa in range(Qa))
+                and
+            all(isinstance(operator_f[qf], OnlineVector.Type()) for qf in range(Qf))
+                and
+            all(isinstance(error_estimation_operator_aa[qa0, qa1], OnlineMatrix.Type()) for qa0 in range(Qa) for qa1 in range(Qa))
+                and
+            all(isinstance(error_estimation_operator_af[qa, qf], OnlineVector.Type()) for qa in range(Qa) for qf in range(Qf))
+                and
+            all(isinstance(error_estimation_operator_ff[qf0, qf1], Number) for qf0 in range(Qf) for qf1 in range(Qf))
+        ):
+            return NotImplemented
+        # Evaluate parameter dependent coefficients, which require calls to user provided (scalar) functions
+        theta_a = empty((len(mus), Qa))
+        theta_f = empty((len(mus), Qf))
+        theta_bc = empty((len(mus), self.N_bc))
+        beta = empty(len(mus))
+        mu_bak = self.mu
+        for (i, mu) in enumerate(mus):
+            self.set_mu(mu)
+            theta_a[i] = self.compute_theta("a")
+            theta_f[i] = self.compute_theta("f")
+            if self.N_bc > 0:
+                theta_bc[i] = self.compute_theta("dirichlet_bc")
+            beta[i] = self.truth_problem.get_stability_factor_lower_bound()
+        self.set_mu(mu_bak)
+        # Assemble all reduced systems as a stack of dense arrays
+        A = einsum("bq,qnm->bnm", theta_a, asarray([asarray(operator_a[qa]) for qa in range(Qa)]))
+        F = einsum("bq,qn->bn", theta_f, asarray([asarray(operator_f[qf]) for qf in range(Qf)]))
+        if self.N_bc > 0:
+            A[:, :self.N_bc, :] = 0.
+            A[:, range(self.N_bc), range(self.N_bc)] = 1.
+            F[:, :self.N_bc] = theta_bc
+        # Solve all reduced systems at once
+        u = batched_solve(A, F[:, :, newaxis])[:, :, 0]
+        # Compute the residual norm squared for all reduced solutions
+        aa = asarray([[asarray(error_estimation_operator_aa[qa0, qa1]) for qa1 in range(Qa)] for qa0 in range(Qa)])
+        af = asarray([[asarray(error_estimation_operator_af[qa, qf]) for qf in range(Qf)] for qa in range(Qa)])
+        ff = asarray([[error_estimation_operator_ff[qf0, qf1] for qf1 in range(Qf)] for qf0 in range(Qf)])
+        eps2 = (
+              einsum("bi,ij,bj->b", theta_f, ff, theta_f, optimize=True)
+            + 2.0*einsum("bn,bi,ijn,bj->b", u, theta_a, af, theta_f, optimize=True)
+            + einsum("bn,bi,ijnm,bj,bm->b", u, theta_a, aa, theta_a, u, optimize=True)
+        )
+        return (eps2, beta)
@@ -44,6 +44,9 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
             self.folder["snapshots"] = os.path.join(self.folder_prefix, "snapshots")
             self.folder["post_processing"] = os.path.join(self.folder_prefix, "post_processing")
             self.label = "POD-Galerkin"
+            # Maximum number of POD modes to be kept in memory while streaming snapshots
+            # through an incremental SVD (None to store all snapshots, see set_incremental_svd_rank)
+            self.incremental_svd_rank = None
             
             # Since we use a POD for each component, it makes sense to possibly have
             # different tolerances for each component.
@@ -88,6 +91,16 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
                     assert isinstance(tol, Number)
             
             self.tol = tol
+            
+        def set_incremental_svd_rank(self, incremental_svd_rank):
+            """
+            It enables a streaming offline phase, in which each snapshot is folded into an incremental SVD
+            as soon as it is computed, rather than being stored in the snapshots matrix. Memory is then bounded
+            by the number of POD modes kept for each component.
+            
+            :param incremental_svd_rank: maximum number of POD modes kept for each component.
+            """
+            self.incremental_svd_rank = incremental_svd_rank
         
         def _init_offline(self):
             # Call parent to initialize inner product and reduced problem
@@ -108,6 +121,14 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
             # Return
             return output
             
+        def _init_incremental_svd(self):
+            if self.incremental_svd_rank is not None:
+                if isinstance(self.POD, dict):
+                    for POD in self.POD.values():
+                        POD.set_incremental_svd_rank(self.incremental_svd_rank)
+                else:
+                    self.POD.set_incremental_svd_rank(self.incremental_svd_rank)
+            
         def offline(self):
             """
             It performs the offline phase of the reduced order model.
@@ -116,6 +137,8 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
             """
             need_to_do_offline_stage = self._init_offline()
             if need_to_do_offline_stage:
+                # Enable the incremental SVD here, rather than in _init_offline, since derived classes may redefine PODs there
+                self._init_incremental_svd()
                 self._offline()
             self._finalize_offline()
             return self.reduced_problem
@@ -19,9 +19,14 @@
 import os
 from math import sqrt
 from logging import DEBUG, getLogger
-from rbnics.backends import GramSchmidt
+from multiprocessing import get_context
+from numpy import argmax, argsort, asarray, full, inf, lexsort, random, setdiff1d, zeros
+from numpy.linalg import norm
+from scipy.spatial import cKDTree as KDTree
+from rbnics.backends import BasisFunctionsMatrix, copy, GramSchmidt
+from rbnics.utils.config import config
 from rbnics.utils.decorators import PreserveClassName, RequiredBaseDecorators, snapshot_links_to_cache
-from rbnics.utils.io import ErrorAnalysisTable, GreedySelectedParametersList, GreedyErrorEstimatorsList, SpeedupAnalysisTable, TextBox, TextLine, Timer
+from rbnics.utils.io import ErrorAnalysisTable, GreedySelectedParametersList, GreedyErrorEstimatorsList, NumpyIO, SpeedupAnalysisTable, TextBox, TextIO, TextLine, Timer
 
 logger = getLogger("rbnics/reduction_methods/base/rb_reduction.py")
 
@@ -50,11 +55,148 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
             self.greedy_selected_parameters = GreedySelectedParametersList()
             self.greedy_error_estimators = GreedyErrorEstimatorsList()
             self.label = "RB"
+            # Number of training parameters for which the error estimator is evaluated at once during the greedy (None to evaluate one parameter at a time)
+            self.greedy_batch_size = None
+            # Settings of the adaptive training set mode of the greedy (None to evaluate the error estimator over the whole training set)
+            self.greedy_adaptive_training_set = None
+            self._active_training_set_indices = None # array of indices in the training set
+            self._active_training_set_random = None # random number generator for exploration
+            # Lazy evaluation of the error estimator during the greedy, and error estimators computed at previous iterations
+            self.greedy_lazy_evaluation = False
+            self._greedy_error_estimator_upper_bounds = None
+            # Number of local processes among which the evaluation of the error estimator during the greedy is distributed (None to disable)
+            self.greedy_process_pool_size = None
+            # Incremental projection of reduced operators after each enrichment of the basis
+            self.incremental_projection = False
+            # Settings of the multiple parameters mode of the greedy, and parameters selected at the latest greedy iteration
+            self.greedy_parameters_per_iteration = 1
+            self.greedy_parameters_separation = 0.
+            self.greedy_truth_solves_process_pool_size = None
+            self.greedy_truth_problem_factory = None
+            self._truth_solves_process_pool = None
+            self._greedy_selected_batch = None # list of (error estimator, training set index) pairs
+            self._greedy_selected_batch_size = 1
+            
+        def set_greedy_batch_size(self, batch_size):
+            """
+            It enables the batched evaluation of the error estimator over the training set during the greedy.
+            
+            :param batch_size: number of training parameters for which reduced solutions and error estimators are computed at once (None to disable).
+            """
+            assert batch_size is None or batch_size > 0
+            self.greedy_batch_size = batch_size
+            
+        def set_greedy_adaptive_training_set(self, initial_size, enrichment_size, exploration_size=0, seed=0):
+            """
+            It enables the adaptive training set mode of the greedy, in which the error estimator is evaluated only over an active subset
+            of the training set. At each iteration, the active set is enriched with the training parameters closest to the active parameters
+            with the largest error estimators, and (optionally) with random training parameters. Once the tolerance is met on the active set,
+            the error estimator is evaluated over the remaining training parameters, so that the tolerance is verified on the whole training set.
+            The initial error estimator, to which the tolerance is relative, is computed over the whole training set as in the standard greedy.
+            
+            :param initial_size: number of randomly chosen training parameters in the initial active set.
+            :param enrichment_size: number of training parameters added to the active set at each iteration by local refinement.
+            :param exploration_size: number of randomly chosen training parameters added to the active set at each iteration.
+            :param seed: seed for random choices, which must be the same on every processor.
+            """
+            assert initial_size > 0
+            assert enrichment_size >= 0
+            assert exploration_size >= 0
+            assert not self.greedy_lazy_evaluation, "Adaptive training set mode is not supported with lazy evaluation"
+            assert self.greedy_parameters_per_iteration == 1, "Adaptive training set mode is not supported with multiple parameters per iteration"
+            self.greedy_adaptive_training_set = {
+                "initial_size": initial_size,
+                "enrichment_size": enrichment_size,
+                "exploration_size": exploration_size,
+                "seed": seed
+            }
+            
+        def set_greedy_lazy_evaluation(self, lazy_evaluation):
+            """
+            It enables the lazy evaluation of the error estimator over the training set during the greedy. Error estimators computed
+            at previous iterations are used as upper bounds of the current ones, since in practice they do not increase as the reduced
+            basis is enriched: training parameters are evaluated in order of decreasing upper bound, and only until the maximum is confirmed.
+            
+            :param lazy_evaluation: True to enable, False to disable.
+            """
+            assert lazy_evaluation is False or self.greedy_adaptive_training_set is None, "Lazy evaluation is not supported in adaptive training set mode"
+            assert lazy_evaluation is False or self.greedy_parameters_per_iteration == 1, "Lazy evaluation is not supported with multiple parameters per iteration"
+            self.greedy_lazy_evaluation = lazy_evaluation
+            
+        def set_greedy_process_pool_size(self, process_pool_size):
+            """
+            It distributes the evaluation of the error estimator over the training set during the greedy among a pool of local processes.
+            Reduced operators are shared with (rather than copied to) the worker processes, which are forked at each greedy iteration.
+            Since worker processes are forked after MPI initialization, this is only available in serial runs, and only if the error
+            estimator is purely online: problems decorated with ExactStabilityFactor (truth eigenproblems), EIM, DEIM or
+            ExactParametrizedFunctions (truth interpolation or assembly, and parallel communication) or SCM (whose cache would be
+            updated only in the worker processes) are not supported.
+            
+            :param process_pool_size: number of local worker processes (None to disable).
+            """
+            assert process_pool_size is None or process_pool_size > 0
+            if process_pool_size is not None:
+                from rbnics.eim.problems import DEIM, EIM, ExactParametrizedFunctions # cannot import at global scope due to cyclic dependence
+                from rbnics.scm.problems import ExactStabilityFactor, SCM # cannot import at global scope due to cyclic dependence
+                ProblemDecorators = getattr(self.truth_problem, "ProblemDecorators", list())
+                assert all([Algorithm not in ProblemDecorators for Algorithm in (DEIM, EIM, ExactParametrizedFunctions, ExactStabilityFactor, SCM)]), "A pool of local processes is not supported for problems decorated with DEIM, EIM, ExactParametrizedFunctions, ExactStabilityFactor or SCM, since their error estimator requires truth computations or updates caches"
+            self.greedy_process_pool_size = process_pool_size
+            
+        def set_incremental_projection(self, incremental_projection):
+            """
+            It enables the incremental projection of reduced operators: after each greedy iteration, only the rows and columns
+            associated to the new basis functions are computed, while the remaining entries are copied from the previous iteration.
+            Operators are projected from scratch whenever the previous basis functions are not the first ones of the current basis
+            (e.g., because the basis has been rebuilt by POD). Products of truth operators with basis functions are stored to this end,
+            which (at least) doubles the truth memory occupied by the basis functions.
+            
+            :param incremental_projection: True to enable, False to disable.
+            """
+            self.incremental_projection = incremental_projection
+            if self.reduced_problem is not None:
+                self.reduced_problem._incremental_projection = incremental_projection
+                self.reduced_problem._incremental_projection_cache.clear()
+            
+        def set_greedy_multiple_parameters(self, parameters_per_iteration, separation=0.1, truth_solves_process_pool_size=None, truth_problem_factory=None):
+            """
+            It enables the selection of several parameters at each greedy iteration: training parameters are considered in order of
+            decreasing error estimator, and selected only if they are well separated from the ones already selected. Truth problems
+            for all selected parameters are solved, and the basis is enriched with all corresponding snapshots at once, so that reduced
+            operators and error estimation operators are built once for each iteration rather than once for each snapshot.
+            
+            :param parameters_per_iteration: maximum number of parameters selected at each iteration.
+            :param separation: minimum distance between selected parameters, relative to the diameter of the parameter range.
+            :param truth_solves_process_pool_size: number of local worker processes solving the truth problems concurrently (None to disable).
+                Worker processes store truth solutions in the disk cache of the truth problem, from which they are then loaded.
+                Worker processes are spawned (rather than forked, since MPI and PETSc have already been initialized), and are only available in serial runs.
+            :param truth_problem_factory: picklable function (e.g., defined at module level) without arguments, which returns the truth problem
+                to be solved by each worker process, with the same name and parameter range of the one being reduced.
+            """
+            assert parameters_per_iteration > 0
+            assert separation >= 0.
+            assert truth_solves_process_pool_size is None or truth_solves_process_pool_size > 0
+            assert parameters_per_iteration == 1 or not self.greedy_lazy_evaluation, "Multiple parameters per iteration are not supported with lazy evaluation"
+            assert parameters_per_iteration == 1 or self.greedy_adaptive_training_set is None, "Multiple parameters per iteration are not supported in adaptive training set mode"
+            assert truth_solves_process_pool_size is None or "disk" in config.get("problems", "cache"), "Concurrent truth solves require the disk cache of truth solutions"
+            assert truth_solves_process_pool_size is None or truth_problem_factory is not None, "Concurrent truth solves require a truth problem factory"
+            self.greedy_parameters_per_iteration = parameters_per_iteration
+            self.greedy_parameters_separation = separation
+            self.greedy_truth_solves_process_pool_size = truth_solves_process_pool_size
+            self.greedy_truth_problem_factory = truth_problem_factory
             
         def _init_offline(self):
             # Call parent to initialize inner product and reduced problem
             output = DifferentialProblemReductionMethod_DerivedClass._init_offline(self)
             
+            # Enable incremental projection of reduced operators, if requested
+            self.set_incremental_projection(self.incremental_projection)
+            
+            # Start from a new active training set, in adaptive training set mode, and with no upper bounds, in lazy evaluation mode
+            self._active_training_set_indices = None
+            self._greedy_error_estimator_upper_bounds = None
+            self._greedy_selected_batch = None
+            self._greedy_selected_batch_size = 1
+            
             # Declare a new GS for each basis component
             if len(self.truth_problem.components) > 1:
                 self.GS = dict()
@@ -77,8 +219,14 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
             :return: reduced_problem where all offline data are stored.
             """
             need_to_do_offline_stage = self._init_offline()
+            if not need_to_do_offline_stage and self._offline_checkpoint_is_available():
+                self._init_offline_from_checkpoint()
+                need_to_do_offline_stage = True
             if need_to_do_offline_stage:
-                self._offline()
+                try:
+                    self._offline()
+                finally:
+                    self._close_truth_solves_process_pool()
             self._finalize_offline()
             return self.reduced_problem
             
@@ -87,27 +235,59 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
             print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase begins", fill="="))
             print("")
             
-            # Initialize first parameter to be used
-            self.reduced_problem.build_reduced_operators()
-            self.reduced_problem.build_error_estimation_operators()
-            (absolute_error_estimator_max, relative_error_estimator_max) = self.greedy()
-            print("initial maximum absolute error estimator over training set =", absolute_error_estimator_max)
-            print("initial maximum relative error estimator over training set =", relative_error_estimator_max)
-            
+            if len(self.greedy_selected_parameters) == 0:
+                self._save_offline_checkpoint(None)
+                
+                # Initialize first parameter to be used
+                self.reduced_problem.build_reduced_operators()
+                self.reduced_problem.build_error_estimation_operators()
+                (absolute_error_estimator_max, relative_error_estimator_max) = self.greedy()
+                print("initial maximum absolute error estimator over training set =", absolute_error_estimator_max)
+                print("initial maximum relative error estimator over training set =", relative_error_estimator_max)
+                
+                iteration = 0
+                self._save_offline_checkpoint(iteration)
+            else:
+                # Resume from the last completed iteration, as restored by _init_offline_from_checkpoint
+                print("resume offline phase from checkpoint at N =", self.reduced_problem.N)
+                
+                self.reduced_problem.build_reduced_operators()
+                self.reduced_problem.build_error_estimation_operators()
+                absolute_error_estimator_max = self.greedy_error_estimators[- self._greedy_selected_batch_size]
+                relative_error_estimator_max = absolute_error_estimator_max/self.greedy_error_estimators[0]
+                print("maximum absolute error estimator over training set =", absolute_error_estimator_max)
+                print("maximum relative error estimator over training set =", relative_error_estimator_max)
+                
+                iteration = len(self.greedy_selected_parameters) - self._greedy_selected_batch_size
+                
             print("")
             
-            iteration = 0
             while self.reduced_problem.N < self.Nmax and relative_error_estimator_max >= self.tol:
                 print(TextLine("N = " + str(self.reduced_problem.N), fill="#"))
                 
-                print("truth solve for mu =", self.truth_problem.mu)
-                snapshot = self.truth_problem.solve()
-                self.truth_problem.export_solution(self.folder["snapshots"], "truth_" + str(iteration), snapshot)
-                snapshot = self.postprocess_snapshot(snapshot, iteration)
-                
+                # Parameters selected by the latest greedy iteration
+                mus = self.greedy_selected_parameters[- self._greedy_selected_batch_size:]
+                if len(mus) > 1 and self.greedy_truth_solves_process_pool_size is not None:
+                    print("concurrent truth solves for", len(mus), "parameters")
+                    self._solve_truth_problems_with_process_pool(mus)
+                    
+                snapshots = list()
+                for mu in mus:
+                    self.truth_problem.set_mu(mu)
+                    print("truth solve for mu =", self.truth_problem.mu)
+                    snapshot = self.truth_problem.solve()
+                    self.truth_problem.export_solution(self.folder["snapshots"], "truth_" + str(iteration), snapshot)
+                    snapshot = self.postprocess_snapshot(snapshot, iteration)
+                    if len(mus) > 1: # the truth solution storage is overwritten by the next truth solve
+                        snapshot = copy(snapshot)
+                    snapshots.append(snapshot)
+                    iteration += 1
+                    
                 print("update basis matrix")
-                self.update_basis_matrix(snapshot)
-                iteration += 1
+                if len(snapshots) == 1:
+                    self.update_basis_matrix(snapshots[0])
+                else:
+                    self.update_basis_matrix_block(snapshots)
                 
                 print("build reduced operators")
                 self.reduced_problem.build_reduced_operators()
@@ -121,12 +301,98 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
                 (absolute_error_estimator_max, relative_error_estimator_max) = self.greedy()
                 print("maximum absolute error estimator over training set =", absolute_error_estimator_max)
                 print("maximum relative error estimator over training set =", relative_error_estimator_max)
+                
+                self._save_offline_checkpoint(iteration)
 
                 print("")
                 
+            self._save_offline_checkpoint(iteration, completed=True)
+                
             print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase ends", fill="="))
             print("")
             
+        def _save_offline_checkpoint(self, iteration, completed=False):
+            # The checkpoint stores the number of snapshots computed so far, the corresponding reduced space dimension
+            # and the number of parameters selected by the latest greedy iteration, since basis functions, Riesz representers
+            # and greedy data are already saved to file at each iteration. The state of the adaptive training set mode
+            # (active training set and random number generator) and of the lazy evaluation mode (upper bounds of the error
+            # estimator) are saved as well, so that a resumed offline phase continues rather than restarts them
+            N = self.reduced_problem.N
+            if isinstance(N, dict):
+                N = dict(N)
+            if iteration is None:
+                N = None
+            checkpoint = {"iteration": iteration, "N": N, "batch": self._greedy_selected_batch_size, "completed": completed}
+            if self._active_training_set_indices is not None:
+                NumpyIO.save_file(self._active_training_set_indices, self.folder["post_processing"], "active_training_set")
+                checkpoint["active_training_set_random_state"] = self._active_training_set_random.bit_generator.state
+            if self._greedy_error_estimator_upper_bounds is not None:
+                NumpyIO.save_file(self._greedy_error_estimator_upper_bounds, self.folder["post_processing"], "error_estimator_upper_bounds")
+                checkpoint["error_estimator_upper_bounds"] = True
+            TextIO.save_file(checkpoint, self.folder["post_processing"], "offline_checkpoint")
+            
+        def _offline_checkpoint_is_available(self):
+            if not TextIO.exists_file(self.folder["post_processing"], "offline_checkpoint"):
+                return False # offline data were either already available, or generated without checkpointing
+            checkpoint = TextIO.load_file(self.folder["post_processing"], "offline_checkpoint")
+            return not checkpoint["completed"]
+            
+        def _init_offline_from_checkpoint(self):
+            checkpoint = TextIO.load_file(self.folder["post_processing"], "offline_checkpoint")
+            assert not checkpoint["completed"]
+            if checkpoint["iteration"] is not None:
+                # Basis functions file would be overwritten by the offline initialization of the reduced problem,
+                # so they are read in beforehand
+                basis_functions = BasisFunctionsMatrix(self.truth_problem.V)
+                basis_functions.init(self.reduced_problem.components)
+                basis_functions.load(self.reduced_problem.folder["basis"], "basis")
+            
+            # Initialize reduced problem for the offline phase
+            self.reduced_problem.init("offline")
+            if checkpoint["iteration"] is None: # offline phase was interrupted before the end of the first iteration
+                return
+                
+            # Restore basis functions, discarding the ones (if any) added after the checkpoint was saved
+            if len(self.reduced_problem.components) > 1:
+                for component in self.reduced_problem.components:
+                    N_bc = self.reduced_problem.N_bc[component]
+                    for n in range(N_bc, N_bc + checkpoint["N"][component]):
+                        self.reduced_problem.basis_functions.enrich(basis_functions[component][n], component=component)
+                    self.reduced_problem.N[component] = checkpoint["N"][component]
+            else:
+                N_bc = self.reduced_problem.N_bc
+                for n in range(N_bc, N_bc + checkpoint["N"]):
+                    self.reduced_problem.basis_functions.enrich(basis_functions[n])
+                self.reduced_problem.N = checkpoint["N"]
+            self.reduced_problem.basis_functions.save(self.reduced_problem.folder["basis"], "basis")
+            
+            # Restore Riesz representers, so that Riesz solves are not repeated. Representers possibly computed after
+            # the checkpoint was saved are kept, because they correspond to the basis functions which will be
+            # added again in the next iteration
+            for term in self.reduced_problem.riesz_terms:
+                self.reduced_problem.riesz[term].load(self.reduced_problem.folder["error_estimation"], "riesz_" + term)
+                
+            # Restore greedy data, discarding the ones (if any) added after the checkpoint was saved
+            self._greedy_selected_batch_size = checkpoint["batch"]
+            greedy_selected_parameters = GreedySelectedParametersList()
+            greedy_selected_parameters.load(self.folder["post_processing"], "mu_greedy")
+            self.greedy_selected_parameters = greedy_selected_parameters[:checkpoint["iteration"] + self._greedy_selected_batch_size]
+            greedy_error_estimators = GreedyErrorEstimatorsList()
+            greedy_error_estimators.load(self.folder["post_processing"], "error_estimator_max")
+            self.greedy_error_estimators = GreedyErrorEstimatorsList()
+            self.greedy_error_estimators.extend(greedy_error_estimators[:checkpoint["iteration"] + self._greedy_selected_batch_size])
+            
+            # Restore the parameter selected by the last completed greedy iteration
+            self.truth_problem.set_mu(self.greedy_selected_parameters[- self._greedy_selected_batch_size])
+            
+            # Restore the state of the adaptive training set and lazy evaluation modes
+            if checkpoint.get("active_training_set_random_state") is not None:
+                self._active_training_set_indices = NumpyIO.load_file(self.folder["post_processing"], "active_training_set")
+                self._active_training_set_random = random.default_rng()
+                self._active_training_set_random.bit_generator.state = checkpoint["active_training_set_random_state"]
+            if checkpoint.get("error_estimator_upper_bounds", False):
+                self._greedy_error_estimator_upper_bounds = NumpyIO.load_file(self.folder["post_processing"], "error_estimator_upper_bounds")
+            
         def update_basis_matrix(self, snapshot):
             """
             It updates basis matrix.
@@ -145,6 +411,48 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
                 self.reduced_problem.N += 1
                 self.reduced_problem.basis_functions.save(self.reduced_problem.folder["basis"], "basis")
                 
+        def update_basis_matrix_block(self, snapshots):
+            """
+            It updates basis matrix with several snapshots at once.
+            
+            :param snapshots: offline solutions calculated at the latest greedy iteration.
+            """
+            if type(self).update_basis_matrix is not RBReduction_Class.update_basis_matrix:
+                # Derived classes which customize the basis update (e.g. to add supremizers) are enriched one snapshot at a time
+                for snapshot in snapshots:
+                    self.update_basis_matrix(snapshot)
+            elif len(self.truth_problem.components) > 1:
+                for component in self.truth_problem.components:
+                    new_basis_functions = self.GS[component].apply_block(snapshots, self.reduced_problem.basis_functions[component][self.reduced_problem.N_bc[component]:], component=component)
+                    for new_basis_function in new_basis_functions:
+                        self.reduced_problem.basis_functions.enrich(new_basis_function, component=component)
+                    self.reduced_problem.N[component] += len(new_basis_functions)
+                self.reduced_problem.basis_functions.save(self.reduced_problem.folder["basis"], "basis")
+            else:
+                new_basis_functions = self.GS.apply_block(snapshots, self.reduced_problem.basis_functions[self.reduced_problem.N_bc:])
+                for new_basis_function in new_basis_functions:
+                    self.reduced_problem.basis_functions.enrich(new_basis_function)
+                self.reduced_problem.N += len(new_basis_functions)
+                self.reduced_problem.basis_functions.save(self.reduced_problem.folder["basis"], "basis")
+                
+        # Worker processes are spawned once for the whole offline phase, and each of them creates and initializes its own
+        # truth problem by means of the truth problem factory. Each worker stores the truth solution in the disk cache,
+        # from which it is then loaded by the main process
+        def _solve_truth_problems_with_process_pool(self, mus):
+            if self._truth_solves_process_pool is None:
+                assert self.training_set.mpi_comm.size == 1, "Concurrent truth solves are not supported in parallel runs"
+                self._truth_solves_process_pool = get_context("spawn").Pool(
+                    self.greedy_truth_solves_process_pool_size, initializer=_init_truth_problem_in_process_pool, initargs=(self.greedy_truth_problem_factory, ))
+            cache_folders = self._truth_solves_process_pool.map(_truth_solve_in_process_pool, [tuple(mu) for mu in mus])
+            for cache_folder in cache_folders:
+                assert os.path.abspath(cache_folder) == os.path.abspath(self.truth_problem.folder["cache"]), "Truth problems created by the factory should share the cache folder of the truth problem"
+                
+        def _close_truth_solves_process_pool(self):
+            if self._truth_solves_process_pool is not None:
+                self._truth_solves_process_pool.close()
+                self._truth_solves_process_pool.join()
+                self._truth_solves_process_pool = None
+                
         def greedy(self):
             """
             It chooses the next parameter in the offline stage in a greedy fashion: wrapper with post processing of the result (in particular, set greedily selected parameter and save to file)
@@ -152,10 +460,17 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
             :return: max error estimator and the comparison with the first one calculated.
             """
             (error_estimator_max, error_estimator_argmax) = self._greedy()
+            if self._greedy_selected_batch is not None: # multiple parameters mode
+                greedy_selected_batch = self._greedy_selected_batch
+                self._greedy_selected_batch = None
+            else:
+                greedy_selected_batch = [(error_estimator_max, error_estimator_argmax)]
             self.truth_problem.set_mu(self.training_set[error_estimator_argmax])
-            self.greedy_selected_parameters.append(self.training_set[error_estimator_argmax])
+            for (error_estimator, index) in greedy_selected_batch:
+                self.greedy_selected_parameters.append(self.training_set[index])
+                self.greedy_error_estimators.append(error_estimator)
+            self._greedy_selected_batch_size = len(greedy_selected_batch)
             self.greedy_selected_parameters.save(self.folder["post_processing"], "mu_greedy")
-            self.greedy_error_estimators.append(error_estimator_max)
             self.greedy_error_estimators.save(self.folder["post_processing"], "error_estimator_max")
             return (error_estimator_max, error_estimator_max/self.greedy_error_estimators[0])
             
@@ -179,12 +494,129 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
                 logger.log(DEBUG, "Error estimator for mu = " + str(mu) + " is " + str(error_estimator))
                 return error_estimator
                 
+            def solve_and_estimate_error_batch(mus):
+                error_estimators = self.reduced_problem.estimate_error_batch(mus)
+                for (mu, error_estimator) in zip(mus, error_estimators):
+                    logger.log(DEBUG, "Error estimator for mu = " + str(mu) + " is " + str(error_estimator))
+                return error_estimators
+                
             if self.reduced_problem.N == 0:
                 print("find initial mu")
             else:
                 print("find next mu")
                 
-            return self.training_set.max(solve_and_estimate_error)
+            if self.greedy_batch_size is None:
+                return self._maximize_error_estimator(solve_and_estimate_error)
+            else:
+                return self._maximize_error_estimator(solve_and_estimate_error_batch, batch_size=self.greedy_batch_size)
+                
+        # Maximize the error estimator over the training set, either lazily, over the active training set or over
+        # well separated training parameters if requested
+        def _maximize_error_estimator(self, solve_and_estimate_error, batch_size=None):
+            if self.greedy_lazy_evaluation:
+                return self._maximize_error_estimator_lazily(solve_and_estimate_error, batch_size)
+            elif self.greedy_adaptive_training_set is not None:
+                return self._maximize_error_estimator_over_active_training_set(solve_and_estimate_error, batch_size)
+            elif self.greedy_parameters_per_iteration > 1:
+                return self._maximize_error_estimator_over_well_separated_training_parameters(solve_and_estimate_error, batch_size)
+            else:
+                return self.training_set.max(solve_and_estimate_error, batch_size=batch_size, process_pool_size=self.greedy_process_pool_size)
+                
+        def _maximize_error_estimator_over_well_separated_training_parameters(self, solve_and_estimate_error, batch_size):
+            error_estimators = self.training_set.evaluate_all(solve_and_estimate_error, batch_size, self.greedy_process_pool_size)
+            # Do not select more parameters than the ones required to reach the maximum reduced space dimension
+            N = self.reduced_problem.N
+            if isinstance(N, dict):
+                N = min(N.values())
+            parameters_per_iteration = max(min(self.greedy_parameters_per_iteration, self.Nmax - N), 1)
+            # Map the parameter range to a box of unit diameter, so that distances are relative to its diameter
+            mu_range = asarray(self.truth_problem.mu_range, dtype=float).reshape(-1, 2)
+            mu_scaling = (mu_range[:, 1] - mu_range[:, 0])*sqrt(max(len(mu_range), 1))
+            mu_scaling[mu_scaling == 0.] = 1.
+            training_set = (asarray([self.training_set[i] for i in range(len(self.training_set))], dtype=float).reshape(len(self.training_set), len(mu_range)) - mu_range[:, 0])/mu_scaling
+            # Select training parameters in order of decreasing error estimator, skipping the ones too close to the selected ones
+            selected_indices = list()
+            for i in argsort(- error_estimators, kind="stable"):
+                if len(selected_indices) == parameters_per_iteration:
+                    break
+                if all(norm(training_set[i] - training_set[j]) >= self.greedy_parameters_separation for j in selected_indices):
+                    selected_indices.append(int(i))
+            print("selected", len(selected_indices), "well separated training parameters, with error estimators", [error_estimators[i] for i in selected_indices])
+            self._greedy_selected_batch = [(error_estimators[i], i) for i in selected_indices]
+            return self._greedy_selected_batch[0]
+                
+        def _maximize_error_estimator_lazily(self, solve_and_estimate_error, batch_size):
+            if self._greedy_error_estimator_upper_bounds is None:
+                self._greedy_error_estimator_upper_bounds = full(len(self.training_set), inf)
+            (error_estimator_max, error_estimator_argmax, evaluations) = self.training_set.lazy_max(solve_and_estimate_error, self._greedy_error_estimator_upper_bounds, batch_size)
+            print("error estimator evaluated for", evaluations, "training parameters, skipped for", len(self.training_set) - evaluations)
+            return (error_estimator_max, error_estimator_argmax)
+            
+        def _maximize_error_estimator_over_active_training_set(self, solve_and_estimate_error, batch_size):
+            if self._active_training_set_indices is None:
+                self._active_training_set_random = random.default_rng(self.greedy_adaptive_training_set["seed"])
+                self._active_training_set_indices = zeros(0, dtype=int)
+                self._activate_random_training_parameters(self.greedy_adaptive_training_set["initial_size"])
+            if len(self.greedy_error_estimators) == 0:
+                # The initial error estimator is the reference for the relative tolerance, hence it is maximized over the whole
+                # training set (as in the standard greedy). This sweep is only carried out once, but it is not cheap in general:
+                # even if the reduced space is still empty, error estimators may require a stability factor lower bound at every
+                # training parameter (e.g., by SCM or by the solution of a truth eigenvalue problem)
+                error_estimators = self.training_set.evaluate_all(solve_and_estimate_error, batch_size, self.greedy_process_pool_size)
+                self._enrich_active_training_set(error_estimators[self._active_training_set_indices])
+                error_estimator_argmax = argmax(error_estimators)
+                return (error_estimators[error_estimator_argmax], int(error_estimator_argmax))
+            active_training_set_indices = self._active_training_set_indices
+            error_estimators = self.training_set[active_training_set_indices.tolist()].evaluate_all(solve_and_estimate_error, batch_size, self.greedy_process_pool_size)
+            print("maximum error estimator over", len(active_training_set_indices), "active training parameters =", error_estimators.max())
+            if (
+                error_estimators.max()/self.greedy_error_estimators[0] < self.tol
+                    and
+                len(active_training_set_indices) < len(self.training_set)
+            ):
+                # Verify the tolerance on the remaining training parameters ...
+                inactive_training_set_indices = setdiff1d(range(len(self.training_set)), active_training_set_indices)
+                print("verify tolerance over", len(inactive_training_set_indices), "inactive training parameters")
+                inactive_error_estimators = self.training_set[inactive_training_set_indices.tolist()].evaluate_all(solve_and_estimate_error, batch_size, self.greedy_process_pool_size)
+                # ... and activate the ones (if any) violating it, starting from the largest error estimator
+                violating = [i for i in argsort(- inactive_error_estimators) if inactive_error_estimators[i]/self.greedy_error_estimators[0] >= self.tol]
+                if len(violating) > 0:
+                    print("tolerance is not met on", len(violating), "inactive training parameters")
+                    violating = violating[:max(self.greedy_adaptive_training_set["enrichment_size"], 1)]
+                    self._active_training_set_indices = asarray(list(active_training_set_indices) + list(inactive_training_set_indices[violating]), dtype=int)
+                error_estimator_argmax = argmax(inactive_error_estimators)
+                if inactive_error_estimators[error_estimator_argmax] > error_estimators.max():
+                    return (inactive_error_estimators[error_estimator_argmax], int(inactive_training_set_indices[error_estimator_argmax]))
+            else:
+                self._enrich_active_training_set(error_estimators)
+            error_estimator_argmax = argmax(error_estimators)
+            return (error_estimators[error_estimator_argmax], int(active_training_set_indices[error_estimator_argmax]))
+            
+        def _enrich_active_training_set(self, active_error_estimators):
+            active_training_set_indices = self._active_training_set_indices
+            inactive_training_set_indices = setdiff1d(range(len(self.training_set)), active_training_set_indices)
+            enrichment_size = min(self.greedy_adaptive_training_set["enrichment_size"], len(inactive_training_set_indices))
+            if enrichment_size > 0:
+                # The error estimator at each inactive training parameter is approximated by its value at the closest active
+                # training parameter: inactive parameters with the largest approximations (and, among them, the closest ones)
+                # are activated
+                active_training_set = asarray([self.training_set[i] for i in active_training_set_indices], dtype=float).reshape(len(active_training_set_indices), -1)
+                inactive_training_set = asarray([self.training_set[i] for i in inactive_training_set_indices], dtype=float).reshape(len(inactive_training_set_indices), -1)
+                if active_training_set.shape[1] > 0:
+                    (distances, closest) = KDTree(active_training_set).query(inactive_training_set)
+                else:
+                    (distances, closest) = (zeros(len(inactive_training_set_indices)), zeros(len(inactive_training_set_indices), dtype=int))
+                approximate_error_estimators = active_error_estimators[closest]
+                enrichment = lexsort((distances, - approximate_error_estimators))[:enrichment_size]
+                self._active_training_set_indices = asarray(list(active_training_set_indices) + list(inactive_training_set_indices[enrichment]), dtype=int)
+            self._activate_random_training_parameters(self.greedy_adaptive_training_set["exploration_size"])
+            
+        def _activate_random_training_parameters(self, size):
+            inactive_training_set_indices = setdiff1d(range(len(self.training_set)), self._active_training_set_indices)
+            size = min(size, len(inactive_training_set_indices))
+            if size > 0:
+                exploration = self._active_training_set_random.choice(inactive_training_set_indices, size=size, replace=False)
+                self._active_training_set_indices = asarray(list(self._active_training_set_indices) + list(exploration), dtype=int)
             
         def error_analysis(self, N_generator=None, filename=None, **kwargs):
             """
@@ -460,3 +892,16 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
             
     # return value (a class) for the decorator
     return RBReduction_Class
+    
+# Truth problem of each worker process of RBReduction._solve_truth_problems_with_process_pool
+_process_pool_truth_problem = None
+
+def _init_truth_problem_in_process_pool(truth_problem_factory):
+    global _process_pool_truth_problem
+    _process_pool_truth_problem = truth_problem_factory()
+    _process_pool_truth_problem.init()
+
+def _truth_solve_in_process_pool(mu):
+    _process_pool_truth_problem.set_mu(mu)
+    _process_pool_truth_problem.solve()
+    return _process_pool_truth_problem.folder["cache"]
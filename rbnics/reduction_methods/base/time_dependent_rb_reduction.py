@@ -284,7 +284,7 @@ def TimeDependentRBReduction(DifferentialProblemReductionMethod_DerivedClass):
             else:
                 print("find next mu")
                 
-            return self.training_set.max(solve_and_estimate_error)
+            return self._maximize_error_estimator(solve_and_estimate_error)
             
         # Compute the error of the reduced order approximation with respect to the full order one
         # over the testing set
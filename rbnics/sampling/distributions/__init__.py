@@ -21,8 +21,11 @@ from rbnics.sampling.distributions.discrete_distribution import DiscreteDistribu
 from rbnics.sampling.distributions.distribution import Distribution
 from rbnics.sampling.distributions.draw_from import DrawFrom
 from rbnics.sampling.distributions.equispaced_distribution import EquispacedDistribution
+from rbnics.sampling.distributions.halton_distribution import HaltonDistribution
+from rbnics.sampling.distributions.latin_hypercube_distribution import LatinHypercubeDistribution
 from rbnics.sampling.distributions.log_equispaced_distribution import LogEquispacedDistribution
 from rbnics.sampling.distributions.log_uniform_distribution import LogUniformDistribution
+from rbnics.sampling.distributions.sobol_distribution import SobolDistribution
 from rbnics.sampling.distributions.uniform_distribution import UniformDistribution
 
 __all__ = [
@@ -31,7 +34,10 @@ __all__ = [
     'Distribution',
     'DrawFrom',
     'EquispacedDistribution',
+    'HaltonDistribution',
+    'LatinHypercubeDistribution',
     'LogEquispacedDistribution',
     'LogUniformDistribution',
+    'SobolDistribution',
     'UniformDistribution'
 ]
@@ -16,6 +16,7 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from numpy import empty
 from rbnics.sampling.distributions.distribution import Distribution
 from rbnics.sampling.distributions.equispaced_distribution import EquispacedDistribution
 
@@ -31,6 +32,9 @@ class CompositeDistribution(Distribution):
             self.distribution_to_components[distribution].append(p)
         
     def sample(self, box, n):
+        return self._array_to_list(self.sample_array(box, n))
+        
+    def sample_array(self, box, n):
         # Divide box among the different distributions
         distribution_to_sub_box = dict()
         for (distribution, components) in self.distribution_to_components.items():
@@ -40,9 +44,8 @@ class CompositeDistribution(Distribution):
         # Consider first equispaced distributions, because they may change the value of n
         for (distribution, sub_box) in distribution_to_sub_box.items():
             if isinstance(distribution, EquispacedDistribution):
-                sub_box = distribution_to_sub_box[distribution]
-                sub_set = distribution.sample(sub_box, n)
-                n = len(sub_set) # may be greater or equal than the one originally provided
+                sub_set = distribution.sample_array(sub_box, n)
+                n = sub_set.shape[0] # may be greater or equal than the one originally provided
                 components = self.distribution_to_components[distribution]
                 components_to_sub_set[tuple(components)] = sub_set
         assert len(components_to_sub_set) in (0, 1)
@@ -50,15 +53,13 @@ class CompositeDistribution(Distribution):
         for (distribution, sub_box) in distribution_to_sub_box.items():
             if not isinstance(distribution, EquispacedDistribution):
                 components = self.distribution_to_components[distribution]
-                components_to_sub_set[tuple(components)] = distribution.sample(sub_box, n)
-        # Prepare a list that will store the set [mu_1, ... mu_n] ...
-        set_as_list = [[None]*len(box) for _ in range(n)]
+                components_to_sub_set[tuple(components)] = distribution.sample_array(sub_box, n)
+        # Assemble the (n, P) array storing the set [mu_1, ... mu_n]
+        set_ = empty((n, len(box)))
         for (components, sub_set) in components_to_sub_set.items():
-            assert len(sub_set) == n
-            for (index, sub_mu) in enumerate(sub_set):
-                assert len(components) == len(sub_mu)
-                for (p, sub_mu_p) in zip(components, sub_mu):
-                    set_as_list[index][p] = sub_mu_p
-        # ... and convert each mu to a tuple
-        set_ = [tuple(mu) for mu in set_as_list]
+            assert sub_set.shape == (n, len(components))
+            set_[:, list(components)] = sub_set
         return set_
+        
+    def is_reproducible(self):
+        return all(distribution.is_reproducible() for distribution in self.distribution_to_components)
@@ -16,20 +16,22 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from numpy import asarray, rint
 from rbnics.sampling.distributions.distribution import Distribution
 
 class DiscreteDistribution(Distribution):
     def __init__(self, distribution, box_step_size):
         self.distribution = distribution
         self.box_step_size = box_step_size
-            
+        
     def sample(self, box, n):
+        return self._array_to_list(self.sample_array(box, n))
+        
+    def sample_array(self, box, n):
         assert len(box) == len(self.box_step_size)
-        set_ = self.distribution.sample(box, n)
-        rounded_set = list()
-        for mu in set_:
-            rounded_mu = list()
-            for (p, step_size) in enumerate(self.box_step_size):
-                rounded_mu.append(round(mu[p]/step_size)*step_size)
-            rounded_set.append(tuple(rounded_mu))
-        return rounded_set
+        set_ = self.distribution.sample_array(box, n)
+        box_step_size = asarray(self.box_step_size, dtype=float)
+        return rint(set_/box_step_size)*box_step_size
+        
+    def is_reproducible(self):
+        return self.distribution.is_reproducible()
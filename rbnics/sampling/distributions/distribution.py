@@ -17,16 +17,49 @@
 #
 
 from abc import ABCMeta, abstractmethod
+from numpy import asarray
+from numpy.random import SeedSequence
 
 class Distribution(object, metaclass=ABCMeta):
     @abstractmethod
     def sample(self, box, n):
         raise NotImplementedError("The method sample is distribution-specific and needs to be overridden.")
         
-    # Override the following methods to use a Distribution as a dict key
+    # Return the sampled set as a (n, P) array. Distributions which can be sampled in a vectorized way
+    # should override this method, and implement sample by converting its output with _array_to_list
+    def sample_array(self, box, n):
+        set_ = self.sample(box, n)
+        return asarray(set_, dtype=float).reshape(len(set_), len(box))
+        
+    # Return True if the sequence of sets returned by successive calls to sample is always the same (e.g. because a seed
+    # has been provided), so that each process can sample the set by itself rather than receiving it from a single process
+    def is_reproducible(self):
+        return False
+        
+    # Return the seed for the current call to sample of a seeded distribution. Each call employs a different stream,
+    # spawned from the seed of the distribution, so that the same distribution can be used to sample (different) training
+    # and testing sets, while the sequence of sampled sets is still reproducible
+    def _spawn_seed(self):
+        if self.seed is None:
+            return None
+        seed = SeedSequence(self.seed, spawn_key=(self._spawned_seeds, ))
+        self._spawned_seeds += 1
+        return seed
+        
+    @staticmethod
+    def _array_to_list(set_):
+        return list(zip(*set_.T.tolist())) # faster than converting each row to a tuple
+        
+    @staticmethod
+    def _box_bounds(box):
+        box = asarray(box, dtype=float).reshape(len(box), 2)
+        return (box[:, 0], box[:, 1])
+        
+    # Override the following methods to use a Distribution as a dict key. Private attributes, which store the state of
+    # the distribution (e.g. the number of seeds spawned so far) rather than its definition, are not taken into account
     def __hash__(self):
         dict_for_hash = list()
-        for (k, v) in self.__dict__.items():
+        for (k, v) in self._public_dict().items():
             if isinstance(v, dict):
                 dict_for_hash.append(tuple(v.values()))
             elif isinstance(v, list):
@@ -36,7 +69,10 @@ class Distribution(object, metaclass=ABCMeta):
         return hash((type(self).__name__, tuple(dict_for_hash)))
         
     def __eq__(self, other):
-        return (type(self).__name__, self.__dict__) == (type(other).__name__, other.__dict__)
+        return (type(self).__name__, self._public_dict()) == (type(other).__name__, other._public_dict())
+        
+    def _public_dict(self):
+        return {k: v for (k, v) in self.__dict__.items() if not k.startswith("_")}
         
     def __ne__(self, other):
         return not(self == other)
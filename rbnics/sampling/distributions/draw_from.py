@@ -16,6 +16,7 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from numpy import asarray
 from rbnics.sampling.distributions.distribution import Distribution
 
 class DrawFrom(Distribution):
@@ -25,10 +26,22 @@ class DrawFrom(Distribution):
         self.kwargs = kwargs
         
     def sample(self, box, n):
-        set_ = list() # of tuples
-        for i in range(n):
-            mu = list() # of numbers
-            for box_p in box:
-                mu.append(box_p[0] + self.generator(*self.args, **self.kwargs)*(box_p[1] - box_p[0]))
-            set_.append(tuple(mu))
-        return set_
+        return self._array_to_list(self.sample_array(box, n))
+        
+    def sample_array(self, box, n):
+        (lower, upper) = self._box_bounds(box)
+        return lower + self._generate(n, len(box))*(upper - lower)
+        
+    # Draw all values at once if generator supports the size keyword argument (as numpy.random
+    # generators do), otherwise call generator once for each component of each parameter
+    def _generate(self, n, P):
+        if "size" not in self.kwargs:
+            try:
+                values = asarray(self.generator(*self.args, size=(n, P), **self.kwargs), dtype=float)
+            except TypeError:
+                pass
+            else:
+                if values.shape == (n, P):
+                    return values
+        values = asarray([[self.generator(*self.args, **self.kwargs) for _ in range(P)] for _ in range(n)], dtype=float)
+        return values.reshape(n, P)
@@ -0,0 +1,39 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from numpy import random
+from scipy.stats import qmc
+from rbnics.sampling.distributions.distribution import Distribution
+
+class HaltonDistribution(Distribution):
+    def __init__(self, seed=None, scramble=True):
+        self.seed = seed
+        self._spawned_seeds = 0
+        self.scramble = scramble
+        
+    def sample(self, box, n):
+        return self._array_to_list(self.sample_array(box, n))
+        
+    def sample_array(self, box, n):
+        (lower, upper) = self._box_bounds(box)
+        sampler = qmc.Halton(len(box), scramble=self.scramble, seed=random.default_rng(self._spawn_seed()))
+        unit_set = sampler.random(n)
+        return lower + unit_set*(upper - lower)
+        
+    def is_reproducible(self):
+        return self.seed is not None or not self.scramble
@@ -0,0 +1,40 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from numpy import arange, random, tile
+from rbnics.sampling.distributions.distribution import Distribution
+
+class LatinHypercubeDistribution(Distribution):
+    def __init__(self, seed=None):
+        self.seed = seed
+        self._spawned_seeds = 0
+        
+    def sample(self, box, n):
+        return self._array_to_list(self.sample_array(box, n))
+        
+    def sample_array(self, box, n):
+        (lower, upper) = self._box_bounds(box)
+        generator = random.default_rng(self._spawn_seed())
+        # Each component is divided in n strata: each stratum is sampled exactly once,
+        # in a random order which is independent for each component
+        strata = generator.permuted(tile(arange(n), (len(box), 1)), axis=1).T
+        unit_set = (strata + generator.random((n, len(box))))/n
+        return lower + unit_set*(upper - lower)
+        
+    def is_reproducible(self):
+        return self.seed is not None
@@ -16,7 +16,7 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from math import exp, log
+from numpy import exp, log
 from rbnics.sampling.distributions.distribution import Distribution
 from rbnics.sampling.distributions.equispaced_distribution import EquispacedDistribution
 
@@ -25,6 +25,11 @@ class LogEquispacedDistribution(Distribution):
         self.equispaced_distribution = EquispacedDistribution()
         
     def sample(self, box, n):
+        return self._array_to_list(self.sample_array(box, n))
+        
+    def sample_array(self, box, n):
         log_box = [(log(box_p[0]), log(box_p[1])) for box_p in box]
-        log_set = self.equispaced_distribution.sample(log_box, n)
-        return [tuple(exp(log_mu_p) for log_mu_p in log_mu) for log_mu in log_set]
+        return exp(self.equispaced_distribution.sample_array(log_box, n))
+        
+    def is_reproducible(self):
+        return True
@@ -16,15 +16,20 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from math import exp, log
+from numpy import exp, log
 from rbnics.sampling.distributions.distribution import Distribution
 from rbnics.sampling.distributions.uniform_distribution import UniformDistribution
 
 class LogUniformDistribution(Distribution):
-    def __init__(self):
-        self.uniform_distribution = UniformDistribution()
+    def __init__(self, seed=None):
+        self.uniform_distribution = UniformDistribution(seed)
         
     def sample(self, box, n):
+        return self._array_to_list(self.sample_array(box, n))
+        
+    def sample_array(self, box, n):
         log_box = [(log(box_p[0]), log(box_p[1])) for box_p in box]
-        log_set = self.uniform_distribution.sample(log_box, n)
-        return [tuple(exp(log_mu_p) for log_mu_p in log_mu) for log_mu in log_set]
+        return exp(self.uniform_distribution.sample_array(log_box, n))
+        
+    def is_reproducible(self):
+        return self.uniform_distribution.is_reproducible()
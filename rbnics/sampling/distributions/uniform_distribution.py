@@ -20,11 +20,20 @@ from numpy import random
 from rbnics.sampling.distributions.distribution import Distribution
 
 class UniformDistribution(Distribution):
+    def __init__(self, seed=None):
+        self.seed = seed
+        self._spawned_seeds = 0
+        
     def sample(self, box, n):
-        set_ = list() # of tuples
-        for i in range(n):
-            mu = list() # of numbers
-            for box_p in box:
-                mu.append(random.uniform(box_p[0], box_p[1]))
-            set_.append(tuple(mu))
-        return set_
+        return self._array_to_list(self.sample_array(box, n))
+        
+    def sample_array(self, box, n):
+        (lower, upper) = self._box_bounds(box)
+        if self.seed is None:
+            generator = random # use global state, so that numpy.random.seed is honored
+        else:
+            generator = random.default_rng(self._spawn_seed())
+        return lower + generator.random((n, len(box)))*(upper - lower)
+        
+    def is_reproducible(self):
+        return self.seed is not None
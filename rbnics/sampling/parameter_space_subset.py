@@ -17,12 +17,15 @@
 #
 
 import operator # to find closest parameters
-from math import sqrt
-from mpi4py.MPI import COMM_WORLD
+from heapq import heapify, heappop
+from math import ceil, sqrt
+from multiprocessing import get_context
+from mpi4py.MPI import COMM_WORLD, SUM
 from numpy import zeros as array
-from numpy import argmax
+from numpy import argmax, asarray, atleast_1d
+from scipy.spatial import cKDTree as KDTree
 from rbnics.sampling.distributions import CompositeDistribution, UniformDistribution
-from rbnics.utils.decorators import overload
+from rbnics.utils.decorators import list_of, overload
 from rbnics.utils.io import ExportableList
 from rbnics.utils.mpi import parallel_io as parallel_generate, parallel_max
 
@@ -31,6 +34,51 @@ class ParameterSpaceSubset(ExportableList): # equivalent to a list of tuples
         ExportableList.__init__(self, "text")
         self.mpi_comm = COMM_WORLD
         self.distributed_max = True
+        self._reset_indices()
+        
+    # Indices for nearest neighbors and membership queries are built lazily, and need to be reset every time
+    # the set is changed. They are not available (and are thus replaced by a linear search) if parameters
+    # are not hashable, or are not tuples of numbers of the same length, e.g. when time is added to parameters
+    def _reset_indices(self):
+        self._kd_tree = None
+        self._membership_index = None
+        
+    def _get_kd_tree(self):
+        if self._kd_tree is None:
+            self._kd_tree = False
+            if (
+                len(self._list) > 0
+                    and
+                all(isinstance(mu, tuple) and len(mu) == len(self._list[0]) for mu in self._list)
+                    and
+                len(self._list[0]) > 0
+            ):
+                try:
+                    self._kd_tree = KDTree(asarray(self._list, dtype=float))
+                except (TypeError, ValueError):
+                    pass
+        return self._kd_tree
+        
+    def _get_membership_index(self):
+        if self._membership_index is None:
+            try:
+                self._membership_index = set(self._list)
+            except TypeError:
+                self._membership_index = False
+        return self._membership_index
+        
+    def append(self, element):
+        ExportableList.append(self, element)
+        self._reset_indices()
+        
+    def extend(self, other_list):
+        ExportableList.extend(self, other_list)
+        self._reset_indices()
+        
+    def load(self, directory, filename):
+        output = ExportableList.load(self, directory, filename)
+        self._reset_indices()
+        return output
         
     @overload
     def __getitem__(self, key: int):
@@ -42,6 +90,24 @@ class ParameterSpaceSubset(ExportableList): # equivalent to a list of tuples
         output.distributed_max = self.distributed_max
         output._list = self._list[key]
         return output
+        
+    @overload
+    def __getitem__(self, key: list_of(int)):
+        output = ParameterSpaceSubset()
+        output.distributed_max = self.distributed_max
+        output._list = [self._list[i] for i in key]
+        return output
+        
+    def __setitem__(self, key, item):
+        ExportableList.__setitem__(self, key, item)
+        self._reset_indices()
+        
+    def __contains__(self, mu):
+        membership_index = self._get_membership_index()
+        if membership_index is not False:
+            return mu in membership_index
+        else:
+            return mu in self._list
     
     # Method for generation of parameter space subsets
     def generate(self, box, n, sampling=None):
@@ -51,25 +117,29 @@ class ParameterSpaceSubset(ExportableList): # equivalent to a list of tuples
             elif isinstance(sampling, tuple):
                 assert len(sampling) == len(box)
                 sampling = CompositeDistribution(sampling)
-            def run_sampling():
-                return sampling.sample(box, n)
-            self._list = parallel_generate(run_sampling, self.mpi_comm)
+            if sampling.is_reproducible():
+                # Every process samples the same set by itself, avoiding communication
+                self._list = sampling.sample(box, n)
+            else:
+                def run_sampling():
+                    return sampling.sample(box, n)
+                self._list = parallel_generate(run_sampling, self.mpi_comm)
         else:
             for i in range(n):
                 self._list.append(tuple())
+        self._reset_indices()
         
-    def max(self, generator, postprocessor=None):
+    # Maximize generator over the set. If batch_size is provided, generator is called with lists
+    # of (at most) batch_size parameters, and should return an array of values (one for each parameter).
+    # If process_pool_size is provided, evaluations are distributed among a pool of local processes
+    def max(self, generator, postprocessor=None, batch_size=None, process_pool_size=None):
         if postprocessor is None:
             def postprocessor(value):
                 return value
-        if self.distributed_max:
-            local_list_indices = list(range(self.mpi_comm.rank, len(self._list), self.mpi_comm.size)) # start from index rank and take steps of length equal to size
-        else:
-            local_list_indices = list(range(len(self._list)))
-        values = array(len(local_list_indices))
+        local_list_indices = self._local_list_indices()
+        values = self._evaluate(generator, local_list_indices, batch_size, process_pool_size)
         values_with_postprocessing = array(len(local_list_indices))
         for i in range(len(local_list_indices)):
-            values[i] = generator(self._list[local_list_indices[i]])
             values_with_postprocessing[i] = postprocessor(values[i])
         if self.distributed_max:
             local_i_max = argmax(values_with_postprocessing)
@@ -83,13 +153,125 @@ class ParameterSpaceSubset(ExportableList): # equivalent to a list of tuples
             global_value_max = values[global_i_max]
         return (global_value_max, global_i_max)
         
+    # Maximize generator over the set, as in max, assuming that upper_bounds[i] is an upper bound of the value of generator
+    # at the i-th parameter (e.g. a stale value computed at a previous greedy iteration, or inf if not available).
+    # Parameters are evaluated in order of decreasing upper bound, until the maximum is confirmed, i.e. no remaining upper
+    # bound exceeds it; upper_bounds is updated in place with the computed values. If batch_size is provided, generator is
+    # called with lists of (at most) batch_size parameters, as in max. The process pool is not used by this method.
+    # Return the maximum, its index and the number of evaluations of generator.
+    def lazy_max(self, generator, upper_bounds, batch_size=None):
+        assert len(upper_bounds) == len(self._list)
+        if batch_size is None:
+            def batch_generator(mus):
+                return [generator(mu) for mu in mus]
+            batch_size = 1
+        else:
+            assert batch_size > 0
+            batch_generator = generator
+        heap = [(- upper_bounds[i], i) for i in self._local_list_indices()]
+        heapify(heap)
+        local_value_max = - float("inf")
+        local_i_max = -1
+        local_evaluations = 0
+        while len(heap) > 0 and - heap[0][0] > local_value_max:
+            batch_list_indices = [heappop(heap)[1] for _ in range(min(batch_size, len(heap)))]
+            values = batch_generator([self._list[i] for i in batch_list_indices])
+            for (i, value) in zip(batch_list_indices, values):
+                upper_bounds[i] = value
+                if value > local_value_max:
+                    local_value_max = value
+                    local_i_max = i
+            local_evaluations += len(batch_list_indices)
+        if self.distributed_max:
+            (global_value_max, global_i_max) = parallel_max(local_value_max, local_i_max, None, self.mpi_comm)
+            assert isinstance(global_i_max, tuple)
+            assert len(global_i_max) == 1
+            global_i_max = global_i_max[0]
+            global_evaluations = self.mpi_comm.allreduce(local_evaluations, op=SUM)
+        else:
+            (global_value_max, global_i_max, global_evaluations) = (local_value_max, local_i_max, local_evaluations)
+        return (global_value_max, global_i_max, global_evaluations)
+        
+    # Evaluate generator over the part of the set which would be assigned to the current processor by max,
+    # and return a list of (parameter, value) pairs. batch_size and process_pool_size have the same meaning as in max
+    def evaluate(self, generator, batch_size=None, process_pool_size=None):
+        local_list_indices = self._local_list_indices()
+        values = self._evaluate(generator, local_list_indices, batch_size, process_pool_size)
+        return [(self._list[i], values[local_i]) for (local_i, i) in enumerate(local_list_indices)]
+        
+    # Evaluate generator over the whole set, distributing evaluations among processors as in max,
+    # and return on every processor an array of values (one for each parameter)
+    def evaluate_all(self, generator, batch_size=None, process_pool_size=None):
+        local_list_indices = self._local_list_indices()
+        values = self._evaluate(generator, local_list_indices, batch_size, process_pool_size)
+        if self.distributed_max:
+            all_values = array(len(self._list))
+            for (list_indices, values_) in self.mpi_comm.allgather((local_list_indices, values)):
+                all_values[list_indices] = values_
+            return all_values
+        else:
+            return values
+        
+    def _local_list_indices(self):
+        if self.distributed_max:
+            return list(range(self.mpi_comm.rank, len(self._list), self.mpi_comm.size)) # start from index rank and take steps of length equal to size
+        else:
+            return list(range(len(self._list)))
+        
+    def _evaluate(self, generator, list_indices, batch_size, process_pool_size=None):
+        if process_pool_size is not None:
+            return self._evaluate_with_process_pool(generator, list_indices, batch_size, process_pool_size)
+        values = array(len(list_indices))
+        if batch_size is None:
+            for i in range(len(list_indices)):
+                values[i] = generator(self._list[list_indices[i]])
+        else:
+            assert batch_size > 0
+            for i in range(0, len(list_indices), batch_size):
+                batch_list_indices = list_indices[i:i + batch_size]
+                values[i:i + len(batch_list_indices)] = generator([self._list[j] for j in batch_list_indices])
+        return values
+        
+    # Worker processes are forked when the pool is created, so that they inherit (rather than receive a pickled copy of)
+    # generator and all data it depends on, e.g. reduced operators and error estimation operators. These data are thus shared
+    # among all workers through copy-on-write memory pages, and each worker only sends back (index, values) pairs.
+    # Since these data change at every call (e.g., at every greedy iteration), a new pool is forked for each call.
+    # Forking after MPI has been initialized is only safe if the child processes never call MPI (or PETSc), which is
+    # the case for generators that only carry out online computations, and if no other process shares the communicator:
+    # the pool is thus restricted to serial runs. Pool workers exit without finalizing MPI.
+    def _evaluate_with_process_pool(self, generator, list_indices, batch_size, process_pool_size):
+        global _process_pool_generator
+        assert process_pool_size > 0
+        assert self.mpi_comm.size == 1, "A pool of local processes cannot be forked in parallel runs"
+        if batch_size is None:
+            task_size = max(1, int(ceil(len(list_indices)/(4.*process_pool_size))))
+        else:
+            assert batch_size > 0
+            task_size = batch_size
+        tasks = [(i, [self._list[j] for j in list_indices[i:i + task_size]]) for i in range(0, len(list_indices), task_size)]
+        assert _process_pool_generator is None
+        _process_pool_generator = (generator, batch_size is not None)
+        try:
+            with get_context("fork").Pool(process_pool_size) as pool:
+                results = pool.map(_evaluate_in_process_pool, tasks)
+        finally:
+            _process_pool_generator = None
+        values = array(len(list_indices))
+        for (i, values_i) in results:
+            values[i:i + len(values_i)] = values_i
+        return values
+        
     def serialize_maximum_computations(self):
         assert self.distributed_max is True
         self.distributed_max = False
-    
+        
     def diff(self, other_set):
         output = ParameterSpaceSubset()
         output.distributed_max = self.distributed_max
+        if isinstance(other_set, list): # use the membership index also for plain lists
+            other_set_list = other_set
+            other_set = ParameterSpaceSubset()
+            other_set._list = other_set_list
         output._list = [mu for mu in self._list if mu not in other_set]
         return output
         
@@ -108,10 +290,27 @@ class ParameterSpaceSubset(ExportableList): # equivalent to a list of tuples
         if M == 0:
             return output
         
-        parameters_and_distances = list()
-        for xi_i in self:
-            distance = sqrt(sum([(x - y)**2 for (x, y) in zip(mu, xi_i)]))
-            parameters_and_distances.append((xi_i, distance))
-        parameters_and_distances.sort(key=operator.itemgetter(1))
-        output._list = [xi_i for (xi_i, _) in parameters_and_distances[:M]]
+        kd_tree = self._get_kd_tree()
+        if kd_tree is not False:
+            (_, indices) = kd_tree.query(mu, k=M)
+            output._list = [self._list[i] for i in atleast_1d(indices)]
+        else:
+            parameters_and_distances = list()
+            for xi_i in self:
+                distance = sqrt(sum([(x - y)**2 for (x, y) in zip(mu, xi_i)]))
+                parameters_and_distances.append((xi_i, distance))
+            parameters_and_distances.sort(key=operator.itemgetter(1))
+            output._list = [xi_i for (xi_i, _) in parameters_and_distances[:M]]
         return output
+        
+# Generator to be evaluated by worker processes of ParameterSpaceSubset._evaluate_with_process_pool
+_process_pool_generator = None
+
+def _evaluate_in_process_pool(task):
+    (first_index, mus) = task
+    (generator, batched) = _process_pool_generator
+    if batched:
+        values = generator(mus)
+    else:
+        values = [generator(mu) for mu in mus]
+    return (first_index, list(values))
@@ -18,6 +18,7 @@
 
 import os
 import hashlib
+from numpy import array, asarray
 from rbnics.backends import export, import_, LinearProgramSolver
 from rbnics.backends.common.linear_program_solver import Error as LinearProgramSolverError, Matrix, Vector
 from rbnics.problems.base import ParametrizedProblem
@@ -47,6 +48,12 @@ class SCMApproximation(ParametrizedProblem):
         self.upper_bound_vectors = UpperBoundsList() # list of Q-dimensional vectors storing the infimizing elements at the greedily selected parameters
         self.N = 0
         
+        self._greedy_selected_parameters_subset = dict() # dict, over N, of the first N parameters selected during the training phase
+        # Upper bound vectors stored as rows of a (N x Q) array
+        self._upper_bound_vectors_array = None
+        # Linear program, which is reused for all lower bound computations
+        self._linear_program = None
+        
         # Storage for online computations
         self._stability_factor_lower_bound = 0.
         self._stability_factor_upper_bound = 0.
@@ -99,6 +106,10 @@ class SCMApproximation(ParametrizedProblem):
         self.truth_problem.init()
         # Init exact stability factor computations
         self.stability_factor_calculator.init()
+        # Bounding box may change, and so does the linear program for lower bounds
+        self._linear_program = None
+        # Greedy selected parameters may change as well, and so do their subsets
+        self._greedy_selected_parameters_subset = dict()
         # Read/Initialize reduced order data structures
         if current_stage == "online":
             self.bounding_box_min.load(self.folder["reduced_operators"], "bounding_box_min")
@@ -136,25 +147,26 @@ class SCMApproximation(ParametrizedProblem):
             self._stability_factor_lower_bound_cache[self.mu, N] = self._stability_factor_lower_bound
         return self._stability_factor_lower_bound
         
+    # Set a lower bound for the stability factor, e.g. computed by a different process
+    def set_stability_factor_lower_bound(self, stability_factor_lower_bound, N=None):
+        if N is None:
+            N = self.N
+        self._stability_factor_lower_bound = stability_factor_lower_bound
+        self._stability_factor_lower_bound_cache[self.mu, N] = stability_factor_lower_bound
+        
     def _get_stability_factor_lower_bound(self, N):
         assert N <= len(self.greedy_selected_parameters)
         Q = self.truth_problem.Q["stability_factor_left_hand_matrix"]
         M_e = N
         M_p = min(N, len(self.training_set) - len(self.greedy_selected_parameters))
         
-        # 1. Constrain the Q variables to be in the bounding box
-        bounds = list() # of Q pairs
-        for q in range(Q):
-            assert self.bounding_box_min[q] <= self.bounding_box_max[q]
-            bounds.append((self.bounding_box_min[q], self.bounding_box_max[q]))
-            
-        # 2. Add three different sets of constraints.
+        # 1. Add three different sets of constraints.
         #    Our constrains are of the form
         #       a^T * x >= b
         constraints_matrix = Matrix(M_e + M_p + 1, Q)
         constraints_vector = Vector(M_e + M_p + 1)
         
-        # 2a. Add constraints: a constraint is added for the closest samples to mu among the selected parameters
+        # 1a. Add constraints: a constraint is added for the closest samples to mu among the selected parameters
         mu_bak = self.mu
         closest_selected_parameters = self._closest_selected_parameters(M_e, N, self.mu)
         for (j, omega) in enumerate(closest_selected_parameters):
@@ -172,7 +184,7 @@ class SCMApproximation(ParametrizedProblem):
             (constraints_vector[j], _) = self.evaluate_stability_factor() # note that computations for this call may be already cached
         self.set_mu(mu_bak)
         
-        # 2b. Add constraints: also constrain the closest point in the complement of selected parameters,
+        # 1b. Add constraints: also constrain the closest point in the complement of selected parameters,
         #                      with RHS depending on previously computed lower bounds
         mu_bak = self.mu
         closest_selected_parameters_complement = self._closest_unselected_parameters(M_p, N, self.mu)
@@ -194,7 +206,7 @@ class SCMApproximation(ParametrizedProblem):
                 constraints_vector[M_e + j] = 0.
         self.set_mu(mu_bak)
         
-        # 2c. Add constraints: also constrain the stability factor for mu to be positive
+        # 1c. Add constraints: also constrain the stability factor for mu to be positive
         # Compute theta
         current_theta = self.truth_problem.compute_theta("stability_factor_left_hand_matrix")
         
@@ -205,15 +217,25 @@ class SCMApproximation(ParametrizedProblem):
         # Assemble the RHS of the constraint
         constraints_vector[M_e + M_p] = 0.
         
-        # 3. Add cost function coefficients
+        # 2. Add cost function coefficients
         cost = Vector(Q)
         for q in range(Q):
             cost[q] = current_theta[q]
         
-        # 4. Solve the linear programming problem
-        linear_program = LinearProgramSolver(cost, constraints_matrix, constraints_vector, bounds)
+        # 3. Solve the linear programming problem, constraining the Q variables to be in the bounding box.
+        #    Bound constraints do not depend on mu, so the linear program is created only once and its cost
+        #    and constraints are updated at each call
+        if self._linear_program is None:
+            bounds = list() # of Q pairs
+            for q in range(Q):
+                assert self.bounding_box_min[q] <= self.bounding_box_max[q]
+                bounds.append((self.bounding_box_min[q], self.bounding_box_max[q]))
+            self._linear_program = LinearProgramSolver(cost, constraints_matrix, constraints_vector, bounds)
+        else:
+            self._linear_program.set_cost(cost)
+            self._linear_program.set_inequality_constraints(constraints_matrix, constraints_vector)
         try:
-            stability_factor_lower_bound = linear_program.solve()
+            stability_factor_lower_bound = self._linear_program.solve()
         except LinearProgramSolverError:
             print("SCM warning at mu = " + str(self.mu) + ": error occured while solving linear program.")
             print("Please consider switching to a different solver. A truth eigensolve will be performed.")
@@ -234,25 +256,14 @@ class SCMApproximation(ParametrizedProblem):
         return self._stability_factor_upper_bound
         
     def _get_stability_factor_upper_bound(self, N):
-        Q = self.truth_problem.Q["stability_factor_left_hand_matrix"]
-        upper_bound_vectors = self.upper_bound_vectors
-        
-        stability_factor_upper_bound = None
-        current_theta = self.truth_problem.compute_theta("stability_factor_left_hand_matrix")
-        
-        for j in range(N):
-            upper_bound_vector = upper_bound_vectors[j]
-            
-            # Compute the cost function for fixed omega
-            obj = 0.
-            for q in range(Q):
-                obj += upper_bound_vector[q]*current_theta[q]
-            
-            if stability_factor_upper_bound is None or obj < stability_factor_upper_bound:
-                stability_factor_upper_bound = obj
+        assert N > 0
+        assert N <= len(self.upper_bound_vectors)
+        if self._upper_bound_vectors_array is None or len(self._upper_bound_vectors_array) != len(self.upper_bound_vectors):
+            self._upper_bound_vectors_array = array([asarray(upper_bound_vector) for upper_bound_vector in self.upper_bound_vectors])
+        current_theta = array(self.truth_problem.compute_theta("stability_factor_left_hand_matrix"))
         
-        assert stability_factor_upper_bound is not None
-        self._stability_factor_upper_bound = stability_factor_upper_bound
+        # Minimize the cost function over all omega at once
+        self._stability_factor_upper_bound = float(self._upper_bound_vectors_array[:N].dot(current_theta).min())
                     
     def _cache_key(self, N):
         return (self.mu, N)
@@ -260,8 +271,11 @@ class SCMApproximation(ParametrizedProblem):
     def _cache_file(self, N):
         return hashlib.sha1(str(self._cache_key(N)).encode("utf-8")).hexdigest()
         
+    # Subsets are stored for each N, so that their nearest neighbors indices are built only once
     def _closest_selected_parameters(self, M, N, mu):
-        return self.greedy_selected_parameters[:N].closest(M, mu)
+        if N not in self._greedy_selected_parameters_subset:
+            self._greedy_selected_parameters_subset[N] = self.greedy_selected_parameters[:N]
+        return self._greedy_selected_parameters_subset[N].closest(M, mu)
         
     def _closest_unselected_parameters(self, M, N, mu):
         if N not in self.greedy_selected_parameters_complement:
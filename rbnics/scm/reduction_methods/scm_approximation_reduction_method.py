@@ -22,6 +22,7 @@ from rbnics.backends import transpose
 from rbnics.backends.online import OnlineVector
 from rbnics.reduction_methods.base import ReductionMethod
 from rbnics.scm.problems import ParametrizedStabilityFactorEigenProblem
+from rbnics.utils.config import config
 from rbnics.utils.io import ErrorAnalysisTable, Folders, GreedyErrorEstimatorsList, SpeedupAnalysisTable, TextBox, TextLine, Timer
 
 # Empirical interpolation method for the interpolation of parametrized functions
@@ -39,6 +40,7 @@ class SCMApproximationReductionMethod(ReductionMethod):
         self.folder["post_processing"] = os.path.join(self.folder_prefix, "post_processing")
         self.greedy_selected_parameters = SCM_approximation.greedy_selected_parameters
         self.greedy_error_estimators = GreedyErrorEstimatorsList()
+        self.process_pool_size = None
 
     # OFFLINE: set the elements in the training set.
     def initialize_training_set(self, ntrain, enable_import=True, sampling=None, **kwargs):
@@ -50,6 +52,14 @@ class SCMApproximationReductionMethod(ReductionMethod):
     def initialize_testing_set(self, ntest, enable_import=False, sampling=None, **kwargs):
         return ReductionMethod.initialize_testing_set(self, self.SCM_approximation.mu_range, ntest, enable_import, sampling, **kwargs)
         
+    # Solve the linear programs for the stability factor lower bounds during the greedy with a pool of
+    # local processes (None to disable). Lower bounds computed by the pool are stored in the cache, which
+    # has to be backed by disk since the RAM cache may only keep the most recent ones
+    def set_greedy_process_pool_size(self, process_pool_size):
+        assert process_pool_size is None or process_pool_size > 0
+        assert process_pool_size is None or "disk" in config.get("SCM", "cache"), "A pool of local processes requires the disk cache of SCM"
+        self.process_pool_size = process_pool_size
+        
     # Perform the offline phase of SCM
     def offline(self):
         need_to_do_offline_stage = self._init_offline()
@@ -168,6 +178,9 @@ class SCMApproximationReductionMethod(ReductionMethod):
         
     # Choose the next parameter in the offline stage in a greedy fashion
     def greedy(self):
+        if self.process_pool_size is not None:
+            self._compute_stability_factor_lower_bounds_with_process_pool()
+            
         def solve_and_estimate_error(mu):
             self.SCM_approximation.set_mu(mu)
             
@@ -189,6 +202,22 @@ class SCMApproximationReductionMethod(ReductionMethod):
         self.greedy_error_estimators.save(self.folder["post_processing"], "error_estimator_max")
         return (error_estimator_max, error_estimator_max/self.greedy_error_estimators[0])
         
+    # Compute the stability factor lower bounds for all parameters in the training set by solving
+    # the linear programs concurrently, and store them in the cache. Each linear program at the current N
+    # only requires cached data, i.e. lower bounds at N - 1 on the training set (computed in the previous
+    # iteration) and stability factors at the greedily selected parameters (computed in the offline loop)
+    def _compute_stability_factor_lower_bounds_with_process_pool(self):
+        def compute_stability_factor_lower_bound(mu):
+            self.SCM_approximation.set_mu(mu)
+            return self.SCM_approximation.get_stability_factor_lower_bound()
+            
+        N = self.SCM_approximation.N
+        mu_bak = self.SCM_approximation.mu
+        for (mu, stability_factor_lower_bound) in self.training_set.evaluate(compute_stability_factor_lower_bound, process_pool_size=self.process_pool_size):
+            self.SCM_approximation.set_mu(mu)
+            self.SCM_approximation.set_stability_factor_lower_bound(stability_factor_lower_bound, N)
+        self.SCM_approximation.set_mu(mu_bak)
+        
     # Initialize data structures required for the error analysis phase
     def _init_error_analysis(self, **kwargs):
         # Initialize reduced order data structures in the SCM online problem
@@ -16,7 +16,9 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from collections import MutableMapping
+import hashlib
+import sys
+from collections import MutableMapping, OrderedDict
 from functools import wraps
 from logging import DEBUG, getLogger
 from pylru import lrucache
@@ -26,9 +28,14 @@ logger = getLogger("rbnics/utils/cache/cache.py")
 class Cache(object):
     def __init__(self, config_section=None, key_generator=None, import_=None, export=None, filename_generator=None):
         self._config_section = config_section
+        # Statistics on RAM cache usage
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
         if self._config_section is None:
             self._storage = dict()
             self._key_generator = None
+            self._key_tolerance = None
             self._import = None
             self._export = None
             self._filename_generator = None
@@ -40,17 +47,35 @@ class Cache(object):
                 cache_size = config.get(self._config_section, "RAM cache limit")
                 assert isinstance(cache_size, str)
                 if cache_size == "unlimited":
-                    self._storage = dict()
+                    cache_size = None
                 else:
                     assert cache_size.isdigit()
                     cache_size = int(cache_size)
                     assert cache_size > 0
-                    self._storage = lrucache(cache_size)
+                cache_memory = config.get(self._config_section, "RAM cache memory limit")
+                assert isinstance(cache_memory, str)
+                if cache_memory == "unlimited":
+                    if cache_size is None:
+                        self._storage = dict()
+                    else:
+                        self._storage = lrucache(cache_size, self._on_eviction)
+                else:
+                    assert cache_memory.isdigit()
+                    cache_memory = int(cache_memory)
+                    assert cache_memory > 0
+                    self._storage = MemoryLimitedStorage(cache_memory, cache_size, self._on_eviction)
+                cache_key_tolerance = float(config.get(self._config_section, "RAM cache key tolerance"))
+                assert cache_key_tolerance >= 0.
+                if cache_key_tolerance > 0.:
+                    self._key_tolerance = cache_key_tolerance
+                else:
+                    self._key_tolerance = None
                 assert key_generator is not None
                 self._key_generator = key_generator
             else:
                 self._storage = DisabledStorage()
                 self._key_generator = key_generator
+                self._key_tolerance = None
             if "disk" in cache_options:
                 cache_size = config.get(self._config_section, "disk cache limit")
                 assert isinstance(cache_size, str)
@@ -78,6 +103,16 @@ class Cache(object):
         """
         self._storage.clear()
         
+    def statistics(self):
+        """
+        Returns the number of hits, misses and evictions of RAM cache.
+        """
+        return {"hits": self._hits, "misses": self._misses, "evictions": self._evictions}
+        
+    def _on_eviction(self, storage_key, storage_value):
+        self._evictions += 1
+        logger.log(DEBUG, "Evicted key " + str(storage_key) + " from cache")
+        
     def __contains__(self, key):
         """
         Checks if key is in current RAM cache.
@@ -93,20 +128,23 @@ class Cache(object):
         try:
             storage_value = self._storage[storage_key]
         except KeyError as key_error:
+            self._misses += 1
             if self._filename_generator is not None:
-                storage_filename = self._filename_generator(*args, **kwargs)
+                storage_filename = self._compute_storage_filename(args, kwargs, storage_key)
                 try:
-                    self._storage[storage_key] = self._import(storage_filename)
+                    storage_value = self._import(storage_filename)
                 except OSError:
                     logger.log(DEBUG, "Could not load key " + str(storage_key) + " (corresponding to args = " + str(args) + " and kwargs = " + str(kwargs) + ") from cache or disk")
                     raise key_error
                 else:
                     logger.log(DEBUG, "Loaded key " + str(storage_key) + " (corresponding to args = " + str(args) + " and kwargs = " + str(kwargs) + ") from disk")
-                    return self._storage[storage_key]
+                    self._storage[storage_key] = storage_value # may be dropped straight away if it exceeds the memory limit
+                    return storage_value
             else:
                 logger.log(DEBUG, "Could not load key " + str(storage_key) + " (corresponding to args = " + str(args) + " and kwargs = " + str(kwargs) + ") from cache")
                 raise key_error
         else:
+            self._hits += 1
             logger.log(DEBUG, "Loaded key " + str(storage_key) + " (corresponding to args = " + str(args) + " and kwargs = " + str(kwargs) + ") from cache")
             return storage_value
         
@@ -117,7 +155,7 @@ class Cache(object):
         (args, kwargs, storage_key) = self._compute_storage_key(key)
         self._storage[storage_key] = value
         if self._filename_generator is not None:
-            storage_filename = self._filename_generator(*args, **kwargs)
+            storage_filename = self._compute_storage_filename(args, kwargs, storage_key)
             self._export(storage_filename)
         
     def __delitem__(self, key):
@@ -149,8 +187,18 @@ class Cache(object):
                 storage_key = args[0]
             else:
                 storage_key = args
+        if self._key_tolerance is not None:
+            storage_key = _quantize_key(storage_key, self._key_tolerance)
         return (args, kwargs, storage_key)
         
+    def _compute_storage_filename(self, args, kwargs, storage_key):
+        # When keys are quantized, disk filenames are generated from the quantized storage key as well, so that
+        # a key which is found in RAM storage is also found on disk (and vice versa)
+        if self._key_tolerance is not None:
+            return hashlib.sha1(str(storage_key).encode("utf-8")).hexdigest()
+        else:
+            return self._filename_generator(*args, **kwargs)
+        
     def __iter__(self):
         """
         Iterate over current RAM cache.
@@ -188,6 +236,16 @@ def cache(fun):
         
     return wrapper
     
+# Replace floating point numbers in key by the index of the closest multiple of tolerance, so that
+# keys which only differ by (approximately) less than tolerance are mapped to the same storage key
+def _quantize_key(key, tolerance):
+    if isinstance(key, tuple):
+        return tuple(_quantize_key(key_i, tolerance) for key_i in key)
+    elif isinstance(key, float):
+        return int(round(key/tolerance))
+    else:
+        return key
+        
 class DisabledStorage(MutableMapping):
     def __getitem__(self, key):
         raise KeyError
@@ -206,3 +264,103 @@ class DisabledStorage(MutableMapping):
 
     def __keytransform__(self, key):
         return key
+        
+class MemoryLimitedStorage(MutableMapping):
+    """
+    RAM storage with a limit on the overall memory occupied by values (and, optionally, on their number).
+    Eviction follows a segmented LRU policy, which accounts both for recency and frequency of use:
+    keys are first stored in a probationary segment, and moved to a protected segment when accessed again.
+    Keys are evicted from the least recently used end of the probationary segment first, and only then from the
+    protected one, so that frequently used keys are not evicted by a burst of keys which are used only once.
+    """
+    
+    def __init__(self, memory_limit, size_limit=None, callback=None):
+        self._memory_limit = memory_limit
+        self._protected_memory_limit = 0.8*memory_limit # leave some room for new keys in the probationary segment
+        self._size_limit = size_limit
+        self._callback = callback
+        self._probationary = OrderedDict()
+        self._protected = OrderedDict()
+        self._value_memory = dict()
+        self._memory = 0
+        self._protected_memory = 0
+        
+    def __getitem__(self, key):
+        if key in self._protected:
+            self._protected.move_to_end(key)
+            return self._protected[key]
+        elif key in self._probationary:
+            value = self._probationary.pop(key)
+            self._protected[key] = value
+            self._protected_memory += self._value_memory[key]
+            # Move least recently used protected keys back to the probationary segment, if necessary
+            while self._protected_memory > self._protected_memory_limit and len(self._protected) > 1:
+                (demoted_key, demoted_value) = self._protected.popitem(last=False)
+                self._protected_memory -= self._value_memory[demoted_key]
+                self._probationary[demoted_key] = demoted_value
+            return value
+        else:
+            raise KeyError(key)
+            
+    def __setitem__(self, key, value):
+        if key in self:
+            del self[key]
+        value_memory = _memory_of(value)
+        if value_memory > self._memory_limit: # would evict the whole storage, and still not fit
+            if self._callback is not None:
+                self._callback(key, value)
+            return
+        self._probationary[key] = value
+        self._value_memory[key] = value_memory
+        self._memory += value_memory
+        while self._memory > self._memory_limit or (self._size_limit is not None and len(self) > self._size_limit):
+            self._evict()
+            
+    def _evict(self):
+        if len(self._probationary) > 0:
+            (key, value) = self._probationary.popitem(last=False)
+        else:
+            (key, value) = self._protected.popitem(last=False)
+            self._protected_memory -= self._value_memory[key]
+        self._memory -= self._value_memory.pop(key)
+        if self._callback is not None:
+            self._callback(key, value)
+            
+    def __delitem__(self, key):
+        if key in self._protected:
+            del self._protected[key]
+            self._protected_memory -= self._value_memory[key]
+        else:
+            del self._probationary[key]
+        self._memory -= self._value_memory.pop(key)
+        
+    def __contains__(self, key):
+        return key in self._protected or key in self._probationary
+        
+    def __iter__(self):
+        yield from self._probationary
+        yield from self._protected
+        
+    def __len__(self):
+        return len(self._probationary) + len(self._protected)
+        
+    def clear(self):
+        self._probationary.clear()
+        self._protected.clear()
+        self._value_memory.clear()
+        self._memory = 0
+        self._protected_memory = 0
+        
+def _memory_of(value):
+    if hasattr(value, "nbytes"): # numpy arrays
+        return value.nbytes
+    elif hasattr(value, "content"): # online matrices and vectors
+        return _memory_of(value.content)
+    elif callable(getattr(value, "local_size", None)): # backend vectors (e.g. dolfin ones), storing double precision reals
+        return value.local_size()*8
+    elif callable(getattr(value, "vector", None)): # functions
+        return _memory_of(value.vector())
+    elif isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_memory_of(value_i) for value_i in value)
+    else:
+        return sys.getsizeof(value)
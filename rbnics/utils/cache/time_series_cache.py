@@ -29,7 +29,7 @@ class TimeSeriesCache(Cache):
         if self._filename_generator is not None:
             # Patch value's append method to save to file
             (args, kwargs, storage_key) = self._compute_storage_key(key)
-            storage_filename = self._filename_generator(*args, **kwargs)
+            storage_filename = self._compute_storage_filename(args, kwargs, storage_key)
             original_append = value.append
             def patched_append(self_, item):
                 self._export(storage_filename, item, len(self_))
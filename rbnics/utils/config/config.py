@@ -34,21 +34,29 @@ class Config(object):
         "EIM": {
             "cache": {"disk", "RAM"},
             "disk cache limit": "unlimited",
-            "RAM cache limit": "1"
+            "RAM cache limit": "1",
+            "RAM cache memory limit": "unlimited",
+            "RAM cache key tolerance": "0"
         },
         "problems": {
             "cache": {"disk", "RAM"},
             "disk cache limit": "unlimited",
-            "RAM cache limit": "1"
+            "RAM cache limit": "1",
+            "RAM cache memory limit": "unlimited",
+            "RAM cache key tolerance": "0"
         },
         "reduced problems": {
             "cache": {"RAM"},
-            "RAM cache limit": "unlimited"
+            "RAM cache limit": "unlimited",
+            "RAM cache memory limit": "unlimited",
+            "RAM cache key tolerance": "0"
         },
         "SCM": {
             "cache": {"disk", "RAM"},
             "disk cache limit": "unlimited",
-            "RAM cache limit": "1"
+            "RAM cache limit": "1",
+            "RAM cache memory limit": "unlimited",
+            "RAM cache key tolerance": "0"
         }
     }
     
@@ -47,6 +47,9 @@ class GreedySelectedParametersList(object):
         output.parameter_space_subset = self.parameter_space_subset[key]
         return output
         
+    def __contains__(self, mu):
+        return mu in self.parameter_space_subset
+        
     def __iter__(self):
         return iter(self.parameter_space_subset)
         
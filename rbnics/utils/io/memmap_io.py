@@ -0,0 +1,85 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+from ast import literal_eval
+import numpy
+from rbnics.utils.mpi import parallel_io
+
+# Single file storage of an array, preceded by a header (a dict) which may contain additional information.
+# The header is written as text on the first line of the file, padded so that the array starts at an aligned offset,
+# and the array is then loaded as a memory map, so that loading is fast and memory is shared among processes.
+# The header may only contain Python literals, since it is parsed back with ast.literal_eval.
+class MemmapIO(object):
+    _alignment = 64
+    
+    # Save a variable to file
+    @staticmethod
+    def save_file(header, content, directory, filename):
+        if not filename.endswith(".mmap"):
+            filename = filename + ".mmap"
+        header = dict(header)
+        header["dtype"] = content.dtype.str
+        header["shape"] = content.shape
+        header = repr(header).encode()
+        assert b"\n" not in header
+        header += b" "*(- (len(header) + 1) % MemmapIO._alignment) + b"\n"
+        def save_file_task():
+            # Write to a temporary file first, so that processes which are currently mapping
+            # the file in memory are not affected
+            with open(os.path.join(str(directory), filename + ".tmp"), "wb") as outfile:
+                outfile.write(header)
+                outfile.write(numpy.ascontiguousarray(content).tobytes())
+            os.replace(os.path.join(str(directory), filename + ".tmp"), os.path.join(str(directory), filename))
+        parallel_io(save_file_task)
+    
+    # Load a variable from file. Returns the header and the content, as a copy-on-write memory map
+    @staticmethod
+    def load_file(directory, filename):
+        if not filename.endswith(".mmap"):
+            filename = filename + ".mmap"
+        with open(os.path.join(str(directory), filename), "rb") as infile:
+            header = infile.readline()
+        offset = len(header)
+        header = literal_eval(header.decode())
+        dtype = header.pop("dtype")
+        shape = header.pop("shape")
+        if numpy.prod(shape) > 0:
+            content = numpy.memmap(os.path.join(str(directory), filename), dtype=dtype, mode="c", offset=offset, shape=shape)
+        else: # memory maps of size zero are not allowed
+            content = numpy.zeros(shape, dtype=dtype)
+        return (header, content)
+            
+    # Check if the file exists
+    @staticmethod
+    def exists_file(directory, filename):
+        if not filename.endswith(".mmap"):
+            filename = filename + ".mmap"
+        def exists_file_task():
+            return os.path.exists(os.path.join(str(directory), filename))
+        return parallel_io(exists_file_task)
+        
+    # Remove the file, if it exists
+    @staticmethod
+    def remove_file(directory, filename):
+        if not filename.endswith(".mmap"):
+            filename = filename + ".mmap"
+        def remove_file_task():
+            if os.path.exists(os.path.join(str(directory), filename)):
+                os.remove(os.path.join(str(directory), filename))
+        parallel_io(remove_file_task)
@@ -99,8 +99,10 @@ setup(name="RBniCS",
           "cvxopt>=1.2.0",
           "mpi4py",
           "multipledispatch>=0.5.0",
+          "numpy>=1.20",
           "pylru",
           "pytest-runner",
+          "scipy>=1.7",
           "sympy>=1.0",
           "toposort"
       ],
@@ -23,6 +23,7 @@ from dolfin import assemble, dx, grad, FunctionSpace, inner, TestFunction, Trial
 from rbnics.backends import BasisFunctionsMatrix
 from rbnics.backends import transpose as factory_transpose
 from rbnics.backends.dolfin import transpose as dolfin_transpose
+from rbnics.backends.dolfin.wrapping import basis_functions_matrix_to_dense_matrix
 from rbnics.backends.online.numpy import Matrix as NumpyMatrix
 from test_utils import RandomDolfinFunction
 
@@ -51,6 +52,12 @@ class Data(object):
         # Return
         return (Z, A)
         
+    def generate_random_with_dense_matrix(self):
+        (Z, A) = self.generate_random()
+        # Store basis functions as a dense matrix in advance, as it happens when Z is reused for every affine term
+        basis_functions_matrix_to_dense_matrix(Z)
+        return (Z, A)
+        
     def evaluate_builtin(self, Z, A):
         result_builtin = NumpyMatrix({"u": self.N}, {"u": self.N})
         for j in range(self.N):
@@ -68,8 +75,8 @@ class Data(object):
         assert isclose(relative_error, 0., atol=1e-12)
 
 @pytest.mark.parametrize("Th", [2**i for i in range(3, 7)])
-@pytest.mark.parametrize("N", [10 + 4*j for j in range(1, 4)])
-@pytest.mark.parametrize("test_type", ["builtin"] + list(all_transpose.keys()))
+@pytest.mark.parametrize("N", [10 + 4*j for j in range(1, 4)] + [50, 100])
+@pytest.mark.parametrize("test_type", ["builtin"] + list(all_transpose.keys()) + ["factory (dense matrix)"])
 def test_dolfin_Z_T_dot_A_Z(Th, N, test_type, benchmark):
     data = Data(Th, N)
     print("Th = " + str(Th) + ", Nh = " + str(data.V.dim()) + ", N = " + str(N))
@@ -79,5 +86,9 @@ def test_dolfin_Z_T_dot_A_Z(Th, N, test_type, benchmark):
     else:
         print("Testing", test_type, "backend")
         global transpose
-        transpose = all_transpose[test_type]
-        benchmark(data.evaluate_backend, setup=data.generate_random, teardown=data.assert_backend)
+        if test_type == "factory (dense matrix)":
+            transpose = all_transpose["factory"]
+            benchmark(data.evaluate_backend, setup=data.generate_random_with_dense_matrix, teardown=data.assert_backend)
+        else:
+            transpose = all_transpose[test_type]
+            benchmark(data.evaluate_backend, setup=data.generate_random, teardown=data.assert_backend)
@@ -20,6 +20,7 @@ import pytest
 from numpy import isclose
 from dolfin import FunctionSpace, UnitSquareMesh
 from rbnics.backends import BasisFunctionsMatrix
+from rbnics.backends.dolfin.wrapping import basis_functions_matrix_to_dense_matrix
 from test_utils import RandomDolfinFunction, RandomNumpyVector
 
 class Data(object):
@@ -39,6 +40,12 @@ class Data(object):
         # Return
         return (Z, uN)
         
+    def generate_random_with_dense_matrix(self):
+        (Z, uN) = self.generate_random()
+        # Store basis functions as a dense matrix in advance, as it happens when Z is reused for several reduced solutions
+        basis_functions_matrix_to_dense_matrix(Z)
+        return (Z, uN)
+        
     def evaluate_builtin(self, Z, uN):
         result_builtin = uN[0]*Z[0].vector()
         for i in range(1, self.N):
@@ -55,8 +62,8 @@ class Data(object):
         assert isclose(relative_error, 0., atol=1e-12)
 
 @pytest.mark.parametrize("Th", [2**i for i in range(3, 7)])
-@pytest.mark.parametrize("N", [10 + 4*j for j in range(1, 4)])
-@pytest.mark.parametrize("test_type", ["builtin", "__mul__"])
+@pytest.mark.parametrize("N", [10 + 4*j for j in range(1, 4)] + [50, 100])
+@pytest.mark.parametrize("test_type", ["builtin", "__mul__", "__mul__ (dense matrix)"])
 def test_dolfin_Z_uN(Th, N, test_type, benchmark):
     data = Data(Th, N)
     print("Th = " + str(Th) + ", Nh = " + str(data.V.dim()) + ", N = " + str(N))
@@ -65,4 +72,7 @@ def test_dolfin_Z_uN(Th, N, test_type, benchmark):
         benchmark(data.evaluate_builtin, setup=data.generate_random)
     else:
         print("Testing", test_type, "backend")
-        benchmark(data.evaluate_backend, setup=data.generate_random, teardown=data.assert_backend)
+        if test_type == "__mul__ (dense matrix)":
+            benchmark(data.evaluate_backend, setup=data.generate_random_with_dense_matrix, teardown=data.assert_backend)
+        else:
+            benchmark(data.evaluate_backend, setup=data.generate_random, teardown=data.assert_backend)
@@ -0,0 +1,94 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from numpy import zeros
+from rbnics.utils.cache.cache import MemoryLimitedStorage
+
+# Common data: each value occupies 800 bytes, so that the storage holds at most 5 values
+value_memory = zeros(100).nbytes
+memory_limit = 5*value_memory
+
+# Auxiliary functions
+def create_storage(size_limit=None):
+    evicted = list()
+    
+    def callback(key, value):
+        evicted.append(key)
+    
+    storage = MemoryLimitedStorage(memory_limit, size_limit, callback)
+    return (storage, evicted)
+
+# Test eviction of least recently used keys when the memory limit is exceeded
+def test_memory_limited_storage_eviction():
+    (storage, evicted) = create_storage()
+    for key in range(5):
+        storage[key] = zeros(100)
+    assert len(storage) == 5
+    assert len(evicted) == 0
+    storage[5] = zeros(100)
+    assert evicted == [0]
+    assert 0 not in storage
+    assert len(storage) == 5
+    
+    # Keys which are accessed again are evicted only after the ones used once
+    storage[1]
+    for key in range(6, 10):
+        storage[key] = zeros(100)
+    assert evicted == [0, 2, 3, 4, 5]
+    assert 1 in storage
+    storage[10] = zeros(100)
+    assert evicted == [0, 2, 3, 4, 5, 6]
+    assert 1 in storage
+    
+    # Values are accounted for once, even when replaced or deleted
+    storage[7] = zeros(100)
+    del storage[8]
+    assert len(storage) == 4
+    storage[11] = zeros(100)
+    assert evicted == [0, 2, 3, 4, 5, 6]
+    
+    # Values larger than the memory limit are not stored
+    storage[12] = zeros(1000)
+    assert 12 not in storage
+    assert evicted == [0, 2, 3, 4, 5, 6, 12]
+
+# Test the protected segment, which is limited to a fraction of the memory limit
+def test_memory_limited_storage_protected_segment():
+    (storage, evicted) = create_storage()
+    for key in range(5):
+        storage[key] = zeros(100)
+    for key in range(5):
+        storage[key]
+    
+    # Key 0 has been moved back to the probationary segment, and is thus the first to be evicted
+    storage[5] = zeros(100)
+    assert evicted == [0]
+    storage[6] = zeros(100)
+    assert evicted == [0, 5]
+    for key in range(1, 5):
+        assert key in storage
+
+# Test eviction when the number of stored values is limited
+def test_memory_limited_storage_size_limit():
+    (storage, evicted) = create_storage(size_limit=2)
+    storage["a"] = zeros(1)
+    storage["b"] = zeros(1)
+    storage["a"]
+    storage["c"] = zeros(1)
+    assert evicted == ["b"]
+    assert list(sorted(storage)) == ["a", "c"]
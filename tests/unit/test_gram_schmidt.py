@@ -0,0 +1,81 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from math import sqrt
+from numpy import allclose, eye, isclose, linspace, random
+from dolfin import assemble, dx, Expression, FunctionSpace, grad, inner, interpolate, TestFunction, TrialFunction, UnitIntervalMesh
+from rbnics.backends.dolfin import copy as dolfin_copy, GramSchmidt as DolfinGramSchmidt, transpose as dolfin_transpose
+from rbnics.backends.dolfin.wrapping import gram_schmidt_projection_step as dolfin_gram_schmidt_projection_step
+from rbnics.backends.online.numpy import copy as numpy_copy, Function as NumpyFunction, GramSchmidt as NumpyGramSchmidt, Matrix as NumpyMatrix, transpose as numpy_transpose
+from rbnics.backends.online.numpy.wrapping import gram_schmidt_projection_step as numpy_gram_schmidt_projection_step
+
+"""
+Orthonormalize a set of snapshots by block classical Gram-Schmidt with reorthogonalization, both one snapshot at a time
+and several snapshots at once, and compare to the basis obtained by modified Gram-Schmidt
+"""
+
+def _test_gram_schmidt(gram_schmidt, snapshots, X, copy, gram_schmidt_projection_step, transpose):
+    snapshots_copy = [copy(snapshot) for snapshot in snapshots]
+    
+    # Orthonormalize the first snapshots one at a time, and the remaining ones at once
+    basis_functions = list()
+    for snapshot in snapshots[:3]:
+        basis_functions.append(gram_schmidt.apply(snapshot, basis_functions))
+    basis_functions.extend(gram_schmidt.apply_block(snapshots[3:], basis_functions))
+    assert len(basis_functions) == len(snapshots)
+    
+    # Snapshots are not changed
+    for (snapshot, snapshot_copy) in zip(snapshots, snapshots_copy):
+        assert allclose(snapshot.vector()[:], snapshot_copy.vector()[:])
+        
+    # Basis functions are orthonormal with respect to the inner product
+    for (i, basis_function_i) in enumerate(basis_functions):
+        for (j, basis_function_j) in enumerate(basis_functions):
+            assert isclose(transpose(basis_function_i)*X*basis_function_j, 1. if i == j else 0., atol=1.e-10)
+            
+    # Basis functions coincide with the ones obtained by modified Gram-Schmidt
+    for (n, (snapshot, basis_function)) in enumerate(zip(snapshots, basis_functions)):
+        expected_basis_function = copy(snapshot)
+        for previous_basis_function in basis_functions[:n]:
+            expected_basis_function = gram_schmidt_projection_step(expected_basis_function, X, previous_basis_function, transpose)
+        expected_basis_function /= sqrt(transpose(expected_basis_function)*X*expected_basis_function)
+        assert allclose(basis_function.vector()[:], expected_basis_function.vector()[:], atol=1.e-10)
+        
+# ~~~ Dolfin test function ~~~ #
+def test_gram_schmidt_dolfin():
+    mesh = UnitIntervalMesh(100)
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    X = assemble(inner(u, v)*dx + inner(grad(u), grad(v))*dx)
+    snapshots = [interpolate(Expression("exp(- mu*x[0])", mu=mu, element=V.ufl_element()), V) for mu in linspace(1., 5., 8)]
+    _test_gram_schmidt(DolfinGramSchmidt(V, X), snapshots, X, dolfin_copy, dolfin_gram_schmidt_projection_step, dolfin_transpose)
+    
+# ~~~ Numpy test function ~~~ #
+def test_gram_schmidt_numpy():
+    N = 20
+    generator = random.default_rng(0)
+    A = generator.random((N, N))
+    X = NumpyMatrix(N, N)
+    X[:, :] = A.dot(A.T) + eye(N)
+    snapshots = list()
+    for _ in range(8):
+        snapshot = NumpyFunction(N)
+        snapshot.vector()[:] = generator.random(N)
+        snapshots.append(snapshot)
+    _test_gram_schmidt(NumpyGramSchmidt(None, X), snapshots, X, numpy_copy, numpy_gram_schmidt_projection_step, numpy_transpose)
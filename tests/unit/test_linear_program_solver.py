@@ -48,3 +48,74 @@ def test_linear_program_solver():
     solver = LinearProgramSolver(c, A, b, bounds)
     optimal_cost = solver.solve()
     assert isclose(optimal_cost, 0.625)
+
+"""
+Solve
+    min    x + y
+    s.t.   0.2 <= x <= 1
+           0.3 <= y <= 1
+The optimal solution is at the lower bounds
+    x = 0.2, y = 0.3
+with cost
+    0.5
+"""
+
+def test_linear_program_solver_lower_bounds():
+    c = Vector(2)
+    A = Matrix(0, 2)
+    b = Vector(0)
+    bounds = [(0.2, 1.), (0.3, 1.)]
+
+    c[0], c[1] = 1., 1.
+
+    solver = LinearProgramSolver(c, A, b, bounds)
+    optimal_cost = solver.solve()
+    assert isclose(optimal_cost, 0.5)
+
+"""
+Solve again the first linear program, after updating cost and inequality constraints of the second one.
+Then solve
+    max    x + y
+    s.t.   x + y <= 1.5
+           x - y <= 0.5
+           0 <= x <= 1
+           0 <= y <= 1
+whose optimal cost is
+    -1.5
+(since the minimum of - x - y is computed), and finally solve again the first linear program.
+"""
+
+def test_linear_program_solver_update():
+    c = Vector(2)
+    A = Matrix(0, 2)
+    b = Vector(0)
+    bounds = [(0., 1.)]*2
+
+    solver = LinearProgramSolver(c, A, b, bounds)
+
+    def solve_first_linear_program():
+        c = Vector(2)
+        A = Matrix(2, 2)
+        b = Vector(2)
+        c[0], c[1] = 0.5, 1.
+        A[0, 0], A[0, 1] = 1., 1.
+        A[1, 0], A[1, 1] = -1., 1.
+        b[0], b[1] = 1., -0.5
+        solver.set_cost(c)
+        solver.set_inequality_constraints(A, b)
+        return solver.solve()
+
+    assert isclose(solve_first_linear_program(), 0.625)
+
+    c = Vector(2)
+    A = Matrix(2, 2)
+    b = Vector(2)
+    c[0], c[1] = -1., -1.
+    A[0, 0], A[0, 1] = -1., -1.
+    A[1, 0], A[1, 1] = -1., 1.
+    b[0], b[1] = -1.5, -0.5
+    solver.set_cost(c)
+    solver.set_inequality_constraints(A, b)
+    assert isclose(solver.solve(), -1.5)
+
+    assert isclose(solve_first_linear_program(), 0.625)
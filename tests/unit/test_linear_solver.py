@@ -16,7 +16,9 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from numpy import dot, isclose
+import pytest
+from numpy import allclose, dot, eye, isclose, random, tril, triu
+from numpy.linalg import LinAlgError, solve as dense_solve
 from numpy.linalg import norm as monitor_norm
 import matplotlib
 import matplotlib.pyplot as plt
@@ -99,6 +101,12 @@ def _test_linear_solver_sparse(callback_type):
     solver = LinearSolver(problem_wrapper, solution)
     solver.solve()
     
+    # Solve again for a block of right-hand sides, reusing the factorization of the left-hand side
+    block_solutions = solver.solve_block([callback(f), callback(f)])
+    assert len(block_solutions) == 2
+    for block_solution in block_solutions:
+        assert allclose(block_solution.vector().get_local(), solution.vector().get_local())
+    
     # Compute the error
     error = Function(V)
     error.vector().add_local(+ solution.vector().get_local())
@@ -164,6 +172,12 @@ def _test_linear_solver_dense(V, a, f, X, exact_solution):
     solver.solve()
     solution_array = solution.vector()
     
+    # Solve again for a block of right-hand sides, reusing the factorization of the left-hand side
+    block_solutions = solver.solve_block([problem_wrapper.vector_eval(), problem_wrapper.vector_eval()])
+    assert len(block_solutions) == 2
+    for block_solution in block_solutions:
+        assert allclose(block_solution.vector(), solution_array)
+    
     # Compute the error
     error = Function(*exact_solution.vector().get_local().shape)
     error.vector()[:] = exact_solution.vector().get_local()
@@ -175,6 +189,75 @@ def _test_linear_solver_dense(V, a, f, X, exact_solution):
     assert isclose(error_norm, 0., atol=1.e-5)
     return error_norm
     
+# ~~~ Factorization of dense matrices ~~~ #
+def test_linear_solver_factorize():
+    from rbnics.backends.online.numpy.wrapping import factorize
+    
+    random_state = random.RandomState(0)
+    R = random_state.rand(10, 10)
+    b = random_state.rand(10)
+    B = random_state.rand(10, 3)
+    
+    # The factorization depends on the structure of the matrix, but the solution does not
+    matrices = {
+        "symmetric positive definite": dot(R.T, R) + 10*eye(10),
+        "lower triangular": tril(R) + 10*eye(10),
+        "upper triangular": triu(R) + 10*eye(10),
+        "general": R + 10*eye(10)
+    }
+    for (structure, A) in matrices.items():
+        factorization = factorize(A)
+        assert factorization.structure == structure
+        assert allclose(factorization.solve(b), dense_solve(A, b))
+        assert allclose(factorization.solve(B), dense_solve(A, B))
+        
+    # The factorization is reused as long as the matrix is unchanged
+    A = matrices["general"]
+    factorization = factorize(A)
+    assert factorize(A) is factorization
+    A[0, 1] += 1.
+    assert factorize(A) is not factorization
+    assert allclose(factorize(A).solve(b), dense_solve(A, b))
+    
+    # Singular matrices are not factorized
+    A[0, :] = 0.
+    with pytest.raises(LinAlgError):
+        factorize(A)
+        
+# ~~~ Block of right-hand sides ~~~ #
+def test_linear_solver_solve_block():
+    from rbnics.backends.online.numpy import copy, Function, LinearSolver, Matrix, Vector
+    
+    random_state = random.RandomState(0)
+    A = Matrix(10, 10)
+    A[:, :] = random_state.rand(10, 10) + 10*eye(10)
+    F = [Vector(10) for _ in range(3)]
+    for F_j in F:
+        F_j[:] = random_state.rand(10)
+    bcs = (1., 2.)
+    
+    # Solve for each right-hand side separately, and then as a block
+    solutions = list()
+    for F_j in F:
+        solution = Function(10)
+        LinearSolver(copy(A), solution, copy(F_j), bcs).solve()
+        solutions.append(solution)
+    A_copy = copy(A)
+    F_copy = [copy(F_j) for F_j in F]
+    solver = LinearSolver(A, Function(10), copy(F[0]), bcs)
+    lhs_with_bcs = copy(solver.lhs)
+    block_solutions = solver.solve_block(F)
+    assert len(block_solutions) == 3
+    for (block_solution, solution) in zip(block_solutions, solutions):
+        assert allclose(block_solution.vector(), solution.vector())
+        assert allclose(block_solution.vector()[:2], bcs)
+        
+    # Boundary conditions are applied to copies of the right-hand sides, and only once to the left-hand side
+    for (F_j, F_j_copy) in zip(F, F_copy):
+        assert allclose(F_j, F_j_copy)
+    assert allclose(solver.lhs, lhs_with_bcs)
+    assert not allclose(solver.lhs, A_copy)
+    
 # ~~~ Test function ~~~ #
 def test_linear_solver():
     (error_sparse_tensor_callbacks, V, a, f, X, exact_solution) = _test_linear_solver_sparse("tensor callbacks")
@@ -0,0 +1,61 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import pytest
+from numpy import arange, array_equal, memmap, zeros
+from rbnics.utils.io import MemmapIO
+
+# Test save and load of arrays of different types and shapes
+def test_memmap_io_round_trip(tempdir):
+    for content in (arange(12.).reshape(3, 4), arange(5), zeros((0, 3))):
+        MemmapIO.save_file({"N": 3, "name": "A"}, content, tempdir, "content")
+        assert MemmapIO.exists_file(tempdir, "content")
+        assert os.path.isfile(os.path.join(tempdir, "content.mmap"))
+        (header, loaded_content) = MemmapIO.load_file(tempdir, "content")
+        assert header == {"N": 3, "name": "A"}
+        assert loaded_content.dtype == content.dtype
+        assert loaded_content.shape == content.shape
+        assert array_equal(loaded_content, content)
+        if content.size > 0:
+            assert isinstance(loaded_content, memmap)
+            assert loaded_content.offset % 64 == 0
+    MemmapIO.remove_file(tempdir, "content")
+    assert not MemmapIO.exists_file(tempdir, "content")
+
+# Test that loaded arrays can be changed without affecting the file, nor other loaded copies
+def test_memmap_io_copy_on_write(tempdir):
+    content = arange(6.)
+    MemmapIO.save_file(dict(), content, tempdir, "content")
+    (_, loaded_content_1) = MemmapIO.load_file(tempdir, "content")
+    loaded_content_1[0] = 10.
+    (_, loaded_content_2) = MemmapIO.load_file(tempdir, "content")
+    assert array_equal(loaded_content_2, content)
+    
+    # Overwriting the file does not affect arrays which are currently loaded
+    MemmapIO.save_file(dict(), 2*content, tempdir, "content")
+    assert array_equal(loaded_content_2, content)
+    (_, loaded_content_3) = MemmapIO.load_file(tempdir, "content")
+    assert array_equal(loaded_content_3, 2*content)
+    
+# Test that headers are parsed as Python literals only
+def test_memmap_io_literal_header(tempdir):
+    with open(os.path.join(tempdir, "content.mmap"), "wb") as outfile:
+        outfile.write(b"{'dtype': '<f8', 'shape': (0, ), 'name': open('content.mmap')}\n")
+    with pytest.raises(ValueError):
+        MemmapIO.load_file(tempdir, "content")
@@ -0,0 +1,184 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from numpy import allclose, arange, einsum, shares_memory, zeros
+from rbnics.backends.online.numpy import AffineExpansionStorage, Matrix, product, sum, Vector
+from rbnics.backends.online.numpy.product import _product_as_tensor_contraction, product_base
+
+"""
+Store affine expansions of matrices and vectors in the numpy online backend, where the content of all matrices (or vectors)
+is stored contiguously, and test views, enlargement and the product with thetas as a tensor contraction
+"""
+
+# Auxiliary functions
+def generate_matrix(M, N, offset):
+    matrix = Matrix(M, N)
+    matrix[:, :] = arange(offset, offset + M*N, dtype=float).reshape(M, N)
+    return matrix
+    
+def generate_vector(N, offset):
+    vector = Vector(N)
+    vector[:] = arange(offset, offset + N, dtype=float)
+    return vector
+    
+def generate_matrices_storage(Q, M, N):
+    storage = AffineExpansionStorage(Q)
+    for q in range(Q):
+        storage[q] = generate_matrix(M, N, 100.*q)
+    return storage
+    
+def generate_vectors_storage(Q, N):
+    storage = AffineExpansionStorage(Q)
+    for q in range(Q):
+        storage[q] = generate_vector(N, 100.*q)
+    return storage
+    
+def generate_matrices_storage_2(Q1, Q2, M, N):
+    storage = AffineExpansionStorage(Q1, Q2)
+    for q1 in range(Q1):
+        for q2 in range(Q2):
+            storage[q1, q2] = generate_matrix(M, N, 100.*(Q2*q1 + q2))
+    return storage
+    
+# Test that matrices and vectors in the affine expansion are views of the contiguous storage
+def test_online_affine_expansion_storage_content_as_tensor():
+    storage = generate_matrices_storage(3, 4, 5)
+    assert storage._content_as_tensor.shape == (3, 4, 5)
+    for q in range(3):
+        assert allclose(storage._content_as_tensor[q], generate_matrix(4, 5, 100.*q).content)
+        assert shares_memory(storage[q].content, storage._content_as_tensor)
+    storage._content_as_tensor[1, 2, 3] = -1.
+    assert storage[1][2, 3] == -1.
+    storage[2][0, 1] = -2.
+    assert storage._content_as_tensor[2, 0, 1] == -2.
+    
+    storage = generate_vectors_storage(3, 4)
+    assert storage._content_as_tensor.shape == (3, 4)
+    for q in range(3):
+        assert allclose(storage._content_as_tensor[q], generate_vector(4, 100.*q).content)
+        assert shares_memory(storage[q].content, storage._content_as_tensor)
+        
+    storage = generate_matrices_storage_2(2, 3, 4, 4)
+    assert storage._content_as_tensor.shape == (2, 3, 4, 4)
+    for q1 in range(2):
+        for q2 in range(3):
+            assert allclose(storage._content_as_tensor[q1, q2], generate_matrix(4, 4, 100.*(3*q1 + q2)).content)
+            assert shares_memory(storage[q1, q2].content, storage._content_as_tensor)
+            
+    # Storing a new affine expansion replaces the contiguous storage
+    storage = generate_matrices_storage(3, 4, 5)
+    content_as_tensor = storage._content_as_tensor
+    for q in range(3):
+        storage[q] = generate_matrix(2, 2, 10.*q)
+    assert storage._content_as_tensor is not content_as_tensor
+    assert storage._content_as_tensor.shape == (3, 2, 2)
+    
+# Test slicing of the affine expansion as views of the contiguous storage
+def test_online_affine_expansion_storage_getitem_as_view():
+    storage = generate_matrices_storage(3, 4, 5)
+    view = storage[:2, :3]
+    assert view._content_as_tensor.shape == (3, 2, 3)
+    assert shares_memory(view._content_as_tensor, storage._content_as_tensor)
+    for q in range(3):
+        assert (view[q].M, view[q].N) == (2, 3)
+        assert allclose(view[q].content, storage[q].content[:2, :3])
+        assert shares_memory(view[q].content, storage._content_as_tensor)
+    assert storage[:2, :3] is view # precomputed slices are reused
+    
+    # Changes to the storage are reflected in the view, and vice versa
+    storage[1][0, 2] = -1.
+    assert view[1][0, 2] == -1.
+    view[2][1, 1] = -2.
+    assert storage[2][1, 1] == -2.
+    
+    # Views of views, and of the whole storage
+    view_of_view = view[:1, :2]
+    assert shares_memory(view_of_view._content_as_tensor, storage._content_as_tensor)
+    assert allclose(view_of_view._content_as_tensor, storage._content_as_tensor[:, :1, :2])
+    assert allclose(storage[:4, :5]._content_as_tensor, storage._content_as_tensor)
+    
+    storage = generate_vectors_storage(3, 4)
+    view = storage[:2]
+    assert view._content_as_tensor.shape == (3, 2)
+    for q in range(3):
+        assert view[q].N == 2
+        assert allclose(view[q].content, storage[q].content[:2])
+    view[0][1] = -3.
+    assert storage[0][1] == -3.
+    
+# Test enlargement of the affine expansion, which preserves current entries and fills in new ones with zeros
+def test_online_affine_expansion_storage_enlarge():
+    storage = generate_matrices_storage(3, 4, 5)
+    storage.enlarge(6, 7)
+    assert storage._content_as_tensor.shape == (3, 6, 7)
+    for q in range(3):
+        assert (storage[q].M, storage[q].N) == (6, 7)
+        expected = zeros((6, 7))
+        expected[:4, :5] = generate_matrix(4, 5, 100.*q).content
+        assert allclose(storage[q].content, expected)
+        assert shares_memory(storage[q].content, storage._content_as_tensor)
+        
+    # Capacity is doubled on reallocation, so that a further small enlargement does not reallocate
+    content_as_tensor_with_capacity = storage._content_as_tensor_with_capacity
+    assert content_as_tensor_with_capacity.shape == (3, 8, 10)
+    storage[0][5, 6] = 1.
+    storage.enlarge(7, 8)
+    assert storage._content_as_tensor_with_capacity is content_as_tensor_with_capacity
+    assert shares_memory(storage._content_as_tensor, content_as_tensor_with_capacity)
+    for q in range(3):
+        expected = zeros((7, 8))
+        expected[:4, :5] = generate_matrix(4, 5, 100.*q).content
+        if q == 0:
+            expected[5, 6] = 1.
+        assert allclose(storage[q].content, expected)
+        
+    # Views after enlargement refer to the enlarged storage
+    view = storage[:5, :6]
+    assert shares_memory(view._content_as_tensor, storage._content_as_tensor)
+    assert allclose(view._content_as_tensor, storage._content_as_tensor[:, :5, :6])
+    
+    storage = generate_vectors_storage(3, 4)
+    storage.enlarge(5)
+    for q in range(3):
+        assert storage[q].N == 5
+        assert allclose(storage[q].content, list(generate_vector(4, 100.*q).content) + [0.])
+        
+    # Storage which is not contiguous cannot be enlarged
+    storage = AffineExpansionStorage(2)
+    storage[0] = generate_matrix(2, 2, 0.)
+    storage[1] = generate_matrix(3, 3, 0.)
+    assert storage._content_as_tensor is None
+    assert storage.enlarge(4, 4) is NotImplemented
+    
+# Test that the product with thetas, computed as a tensor contraction, matches the sum of products of each term
+def test_online_affine_expansion_storage_product_as_tensor_contraction():
+    thetas = (1.5, -2., 0.5)
+    for storage in (generate_matrices_storage(3, 4, 5), generate_vectors_storage(3, 4), generate_matrices_storage(3, 4, 5)[:2, :3]):
+        output = sum(product(thetas, storage))
+        expected_output = sum(product_base(thetas, storage, None))
+        assert type(output) is type(expected_output)
+        assert allclose(output.content, expected_output.content)
+        assert allclose(_product_as_tensor_contraction(thetas, storage, None).sum_product_return_value.content, expected_output.content)
+        assert allclose(output.content, einsum("i,i...->...", thetas, storage._content_as_tensor))
+        
+    thetas2 = (2., -1., 3.)
+    storage = generate_matrices_storage_2(2, 3, 4, 4)
+    output = sum(product(thetas[:2], storage, thetas2))
+    expected_output = sum(product_base(thetas[:2], storage, thetas2))
+    assert allclose(output.content, expected_output.content)
+    assert allclose(output.content, einsum("i,ij...,j->...", thetas[:2], storage._content_as_tensor, thetas2))
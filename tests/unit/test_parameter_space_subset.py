@@ -0,0 +1,127 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from math import sqrt
+from numpy import allclose
+from rbnics.sampling import ParameterSpaceSubset
+
+# Common data
+box = [(2., 5.), (10., 1000.)]
+n = 100
+
+# Auxiliary functions
+def generate(n, sampling=None):
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling)
+    return parameter_space_subset
+
+def closest_by_linear_search(parameter_space_subset, M, mu):
+    def distance(xi):
+        return sqrt(sum([(x - y)**2 for (x, y) in zip(mu, xi)]))
+    return sorted(parameter_space_subset, key=distance)[:M]
+
+# Test membership and nearest neighbors queries
+def test_parameter_space_subset_membership_and_closest():
+    parameter_space_subset = generate(n)
+    other_parameter_space_subset = generate(n)
+    for mu in parameter_space_subset:
+        assert mu in parameter_space_subset
+    for mu in other_parameter_space_subset:
+        assert mu not in parameter_space_subset
+    mu = other_parameter_space_subset[0]
+    assert parameter_space_subset.closest(5, mu)._list == closest_by_linear_search(parameter_space_subset, 5, mu)
+    assert parameter_space_subset.diff(parameter_space_subset[:10])._list == parameter_space_subset[10:]._list
+    
+    # Indices are updated when the set is changed
+    parameter_space_subset.append(mu)
+    assert mu in parameter_space_subset
+    assert parameter_space_subset.closest(1, mu)._list == [mu]
+    parameter_space_subset[-1] = other_parameter_space_subset[1]
+    assert mu not in parameter_space_subset
+    assert other_parameter_space_subset[1] in parameter_space_subset
+    
+    # Parameters which are not hashable are searched linearly
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.extend([list(mu) for mu in other_parameter_space_subset])
+    assert list(mu) in parameter_space_subset
+    assert list(mu) not in parameter_space_subset[1:]
+    assert parameter_space_subset.closest(1, mu)._list == [list(mu)]
+    
+# Test evaluation over the whole set
+def test_parameter_space_subset_evaluate_all():
+    parameter_space_subset = generate(n)
+    
+    def generator(mu):
+        return mu[0]*mu[1]
+        
+    def batch_generator(mus):
+        return [generator(mu) for mu in mus]
+        
+    expected_values = [generator(mu) for mu in parameter_space_subset]
+    assert allclose(parameter_space_subset.evaluate_all(generator), expected_values)
+    assert allclose(parameter_space_subset.evaluate_all(batch_generator, batch_size=7), expected_values)
+    parameter_space_subset.serialize_maximum_computations()
+    assert allclose(parameter_space_subset.evaluate_all(generator), expected_values)
+    
+# Test maximization with pruning by upper bounds
+def test_parameter_space_subset_lazy_max():
+    parameter_space_subset = generate(n)
+    
+    def generator(mu):
+        return mu[0]*mu[1]
+        
+    def batch_generator(mus):
+        return [generator(mu) for mu in mus]
+        
+    (value_max, i_max) = parameter_space_subset.max(generator)
+    
+    # Without upper bounds every parameter is evaluated
+    upper_bounds = [float("inf")]*n
+    (lazy_value_max, lazy_i_max, evaluations) = parameter_space_subset.lazy_max(generator, upper_bounds)
+    assert (lazy_value_max, lazy_i_max) == (value_max, i_max)
+    assert evaluations == n
+    assert allclose(upper_bounds, [generator(mu) for mu in parameter_space_subset])
+    
+    # Halving the generator leaves upper bounds valid, and parameters with upper bounds below the maximum are skipped
+    def halved_generator(mu):
+        return generator(mu)/2.
+        
+    (lazy_value_max, lazy_i_max, evaluations) = parameter_space_subset.lazy_max(halved_generator, upper_bounds)
+    assert (lazy_value_max, lazy_i_max) == (value_max/2., i_max)
+    assert evaluations < n
+    
+    # Evaluations in batches are pruned as well
+    upper_bounds = [generator(mu) for mu in parameter_space_subset]
+    (lazy_value_max, lazy_i_max, evaluations) = parameter_space_subset.lazy_max(batch_generator, upper_bounds, batch_size=4)
+    assert (lazy_value_max, lazy_i_max) == (value_max, i_max)
+    assert evaluations == 4
+    
+# Test evaluation distributed among a pool of local processes
+def test_parameter_space_subset_process_pool():
+    parameter_space_subset = generate(n)
+    
+    def generator(mu):
+        return mu[0]*mu[1]
+        
+    def batch_generator(mus):
+        return [generator(mu) for mu in mus]
+        
+    (value_max, i_max) = parameter_space_subset.max(generator)
+    assert parameter_space_subset.max(generator, process_pool_size=2) == (value_max, i_max)
+    assert parameter_space_subset.max(batch_generator, batch_size=7, process_pool_size=2) == (value_max, i_max)
+    assert allclose(parameter_space_subset.evaluate_all(generator, process_pool_size=2), [generator(mu) for mu in parameter_space_subset])
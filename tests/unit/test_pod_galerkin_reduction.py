@@ -0,0 +1,274 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import pytest
+from numbers import Number
+from numpy import allclose
+from dolfin import CompiledSubDomain, Constant, DirichletBC, div, FiniteElement, grad, inner, Measure, MeshFunction, MixedElement, split, TestFunction, TrialFunction, UnitSquareMesh, VectorElement
+from rbnics import EllipticCoerciveProblem, EquispacedDistribution, ParabolicCoerciveProblem, PODGalerkin, StokesProblem
+from rbnics.backends.dolfin.wrapping import assemble_operator_for_supremizers, compute_theta_for_supremizers, FunctionSpace
+
+"""
+Reduce, with a POD-Galerkin method, a thermal block problem on the unit square (either steady or unsteady), with
+conductivity mu[0] on the left half and 1 on the right half, a flux mu[1] on the top boundary and a homogeneous
+Dirichlet boundary condition on the left boundary, as well as a Stokes problem on the unit square, with viscosity mu[0]
+on the left half and 1 on the right half, a body force (1, mu[1]), no slip boundary conditions on the left, bottom and
+top boundaries and a free outflow on the right boundary. Snapshots are compressed both with the standard POD and with
+the incremental SVD.
+"""
+
+# Auxiliary functions
+def ThermalBlock(Parent):
+    class ThermalBlock_Class(Parent):
+        def __init__(self, V, **kwargs):
+            self._name = kwargs["name"] # required by the parent initialization
+            Parent.__init__(self, V, **kwargs)
+            self.subdomains, self.boundaries = kwargs["subdomains"], kwargs["boundaries"]
+            self.u = TrialFunction(V)
+            self.v = TestFunction(V)
+            self.dx = Measure("dx")(subdomain_data=self.subdomains)
+            self.ds = Measure("ds")(subdomain_data=self.boundaries)
+        
+        def name(self):
+            return self._name
+        
+        def compute_theta(self, term):
+            mu = self.mu
+            if term == "m":
+                return (1., )
+            elif term == "a":
+                return (mu[0], 1.)
+            elif term == "f":
+                return (mu[1], )
+            else:
+                raise ValueError("Invalid term for compute_theta().")
+        
+        def assemble_operator(self, term):
+            v = self.v
+            dx = self.dx
+            if term == "m":
+                u = self.u
+                m0 = u*v*dx
+                return (m0, )
+            elif term == "a":
+                u = self.u
+                a0 = inner(grad(u), grad(v))*dx(1)
+                a1 = inner(grad(u), grad(v))*dx(2)
+                return (a0, a1)
+            elif term == "f":
+                ds = self.ds
+                f0 = v*ds(1)
+                return (f0, )
+            elif term == "dirichlet_bc":
+                bc0 = [DirichletBC(self.V, Constant(0.), self.boundaries, 2)]
+                return (bc0, )
+            elif term == "inner_product":
+                u = self.u
+                x0 = inner(grad(u), grad(v))*dx
+                return (x0, )
+            elif term == "projection_inner_product":
+                u = self.u
+                x0 = u*v*dx
+                return (x0, )
+            else:
+                raise ValueError("Invalid term for assemble_operator().")
+    
+    return ThermalBlock_Class
+
+class Stokes(StokesProblem):
+    def __init__(self, V, **kwargs):
+        self._name = kwargs["name"] # required by the parent initialization
+        StokesProblem.__init__(self, V, **kwargs)
+        self.subdomains, self.boundaries = kwargs["subdomains"], kwargs["boundaries"]
+        (self.u, self.p) = split(TrialFunction(V))
+        (self.v, self.q) = split(TestFunction(V))
+        self.dx = Measure("dx")(subdomain_data=self.subdomains)
+    
+    def name(self):
+        return self._name
+    
+    @compute_theta_for_supremizers
+    def compute_theta(self, term):
+        mu = self.mu
+        if term == "a":
+            return (mu[0], 1.)
+        elif term in ("b", "bt", "g", "dirichlet_bc_u"):
+            return (1., )
+        elif term == "f":
+            return (1., mu[1])
+        else:
+            raise ValueError("Invalid term for compute_theta().")
+    
+    @assemble_operator_for_supremizers
+    def assemble_operator(self, term):
+        dx = self.dx
+        if term == "a":
+            u = self.u
+            v = self.v
+            a0 = inner(grad(u), grad(v))*dx(1)
+            a1 = inner(grad(u), grad(v))*dx(2)
+            return (a0, a1)
+        elif term == "b":
+            u = self.u
+            q = self.q
+            b0 = - q*div(u)*dx
+            return (b0, )
+        elif term == "bt":
+            p = self.p
+            v = self.v
+            bt0 = - p*div(v)*dx
+            return (bt0, )
+        elif term == "f":
+            v = self.v
+            f0 = inner(Constant((1., 0.)), v)*dx
+            f1 = inner(Constant((0., 1.)), v)*dx
+            return (f0, f1)
+        elif term == "g":
+            q = self.q
+            g0 = Constant(0.)*q*dx
+            return (g0, )
+        elif term == "dirichlet_bc_u":
+            bc0 = [DirichletBC(self.V.sub(0), Constant((0., 0.)), self.boundaries, boundary_id) for boundary_id in (1, 2)]
+            return (bc0, )
+        elif term == "inner_product_u":
+            u = self.u
+            v = self.v
+            x0 = inner(grad(u), grad(v))*dx
+            return (x0, )
+        elif term == "inner_product_p":
+            p = self.p
+            q = self.q
+            x0 = p*q*dx
+            return (x0, )
+        else:
+            raise ValueError("Invalid term for assemble_operator().")
+
+def generate_mesh():
+    mesh = UnitSquareMesh(8, 8)
+    subdomains = MeshFunction("size_t", mesh, mesh.topology().dim(), 2)
+    CompiledSubDomain("x[0] <= 0.5").mark(subdomains, 1)
+    boundaries = MeshFunction("size_t", mesh, mesh.topology().dim() - 1, 0)
+    CompiledSubDomain("on_boundary && near(x[1], 1.)").mark(boundaries, 1)
+    CompiledSubDomain("on_boundary && near(x[0], 0.)").mark(boundaries, 2)
+    return (mesh, subdomains, boundaries)
+
+def generate_elliptic_problem(tempdir, name):
+    (mesh, subdomains, boundaries) = generate_mesh()
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    problem = ThermalBlock(EllipticCoerciveProblem)(V, subdomains=subdomains, boundaries=boundaries, name=os.path.join(tempdir, name))
+    problem.set_mu_range([(0.1, 10.), (-1., 1.)])
+    return problem
+
+def generate_parabolic_problem(tempdir, name):
+    (mesh, subdomains, boundaries) = generate_mesh()
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    problem = ThermalBlock(ParabolicCoerciveProblem)(V, subdomains=subdomains, boundaries=boundaries, name=os.path.join(tempdir, name))
+    problem.set_mu_range([(0.1, 10.), (-1., 1.)])
+    problem.set_time_step_size(0.1)
+    problem.set_final_time(0.5)
+    return problem
+
+def generate_stokes_problem(tempdir, name):
+    (mesh, subdomains, boundaries) = generate_mesh()
+    CompiledSubDomain("on_boundary && near(x[1], 0.)").mark(boundaries, 1)
+    element_u = VectorElement("Lagrange", mesh.ufl_cell(), 2)
+    element_p = FiniteElement("Lagrange", mesh.ufl_cell(), 1)
+    V = FunctionSpace(mesh, MixedElement(element_u, element_p), components=[["u", "s"], "p"])
+    problem = Stokes(V, subdomains=subdomains, boundaries=boundaries, name=os.path.join(tempdir, name))
+    problem.set_mu_range([(0.1, 10.), (-1., 1.)])
+    return problem
+
+def _test_pod_galerkin_reduction_incremental_svd(tempdir, name, generate_problem, Nmax, training_set_size, incremental_svd_rank, nested_POD=None):
+    reduction_methods = dict()
+    reduced_problems = dict()
+    errors = dict()
+    for rank in (None, incremental_svd_rank):
+        problem = generate_problem(tempdir, name + ("IncrementalSVD" if rank is not None else "POD"))
+        reduction_method = PODGalerkin(problem)
+        if nested_POD is not None:
+            reduction_method.set_Nmax(Nmax, nested_POD=nested_POD)
+            reduction_method.set_tolerance(0., nested_POD=0.)
+        else:
+            reduction_method.set_Nmax(Nmax)
+            reduction_method.set_tolerance(0.)
+        if rank is not None:
+            reduction_method.set_incremental_svd_rank(rank)
+        reduction_method.initialize_training_set(training_set_size, sampling=EquispacedDistribution())
+        reduced_problem = reduction_method.offline()
+        reduced_problem.set_mu((5., 0.5))
+        reduced_problem.solve()
+        reduction_methods[rank] = reduction_method
+        reduced_problems[rank] = reduced_problem
+        errors[rank] = reduced_problem.compute_error()
+    
+    # PODs of every component, including the ones redeclared by derived classes, stream snapshots through the
+    # incremental SVD, and the number of stored modes is bounded by the rank rather than by the number of snapshots
+    if isinstance(reduction_methods[None].POD, dict):
+        components = list(reduction_methods[None].POD.keys())
+        PODs = {rank: reduction_method.POD for (rank, reduction_method) in reduction_methods.items()}
+        Ns = {rank: {component: reduced_problem.N[component] for component in components} for (rank, reduced_problem) in reduced_problems.items()}
+    else:
+        components = [None]
+        PODs = {rank: {None: reduction_method.POD} for (rank, reduction_method) in reduction_methods.items()}
+        Ns = {rank: {None: reduced_problem.N} for (rank, reduced_problem) in reduced_problems.items()}
+    for component in components:
+        POD = PODs[None][component]
+        POD_incremental = PODs[incremental_svd_rank][component]
+        assert POD.incremental_svd_rank is None
+        assert POD_incremental.incremental_svd_rank == incremental_svd_rank
+        assert len(POD_incremental.snapshots_matrix) == 0
+        assert len(POD_incremental.incremental_svd_modes) <= incremental_svd_rank
+        assert len(POD_incremental.incremental_svd_modes) < len(POD.snapshots_matrix)
+        
+        # The rank is not smaller than the one of the snapshots matrix, hence the incremental SVD is exact
+        N = Ns[None][component]
+        assert Ns[incremental_svd_rank][component] == N
+        eigenvalues = POD.eigenvalues[:N]
+        assert allclose(POD_incremental.eigenvalues[:N], eigenvalues, rtol=1.e-6, atol=1.e-10*eigenvalues[0])
+    
+    # Reduced spaces coincide, and so do the errors of reduced solutions (possibly over time)
+    def assert_errors_equal(error_incremental, error):
+        if not isinstance(error, Number):
+            (error_incremental, error) = (list(error_incremental), list(error))
+        assert allclose(error_incremental, error, rtol=1.e-4, atol=1.e-10)
+    
+    if isinstance(errors[None], dict):
+        assert errors[incremental_svd_rank].keys() == errors[None].keys()
+        for component in errors[None].keys():
+            assert_errors_equal(errors[incremental_svd_rank][component], errors[None][component])
+    else:
+        assert_errors_equal(errors[incremental_svd_rank], errors[None])
+
+# ~~~ Elliptic case: test function ~~~ #
+def test_pod_galerkin_reduction_incremental_svd_elliptic(tempdir):
+    # Snapshots are mu[1] times the solution for one of the four sampled values of mu[0], hence their rank is four
+    _test_pod_galerkin_reduction_incremental_svd(tempdir, "ThermalBlock", generate_elliptic_problem, 3, 16, 5)
+    
+# ~~~ Stokes case: test function ~~~ #
+def test_pod_galerkin_reduction_incremental_svd_stokes(tempdir):
+    # Snapshots depend linearly on the body force for each of the four sampled values of mu[0], hence their rank is at most
+    # eight. Supremizers are compressed by a POD which is redeclared by the Stokes reduction method
+    _test_pod_galerkin_reduction_incremental_svd(tempdir, "Stokes", generate_stokes_problem, 3, 16, 10)
+    
+# ~~~ Parabolic case: test function ~~~ #
+@pytest.mark.parametrize("nested_POD", [None, 3])
+def test_pod_galerkin_reduction_incremental_svd_parabolic(tempdir, nested_POD):
+    # Time trajectories (or their nested POD modes) of the two sampled values of mu[0] consist of at most ten
+    # nonzero snapshots (or of six modes), and the zero initial condition is discarded by the incremental SVD
+    _test_pod_galerkin_reduction_incremental_svd(tempdir, "UnsteadyThermalBlock" + str(nested_POD), generate_parabolic_problem, 3, 4, 12, nested_POD)
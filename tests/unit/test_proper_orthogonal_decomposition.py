@@ -0,0 +1,62 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from numpy import allclose, isclose, linspace
+from dolfin import assemble, dx, Expression, FunctionSpace, inner, interpolate, TestFunction, TrialFunction, UnitIntervalMesh
+from rbnics.backends import ProperOrthogonalDecomposition, transpose
+
+"""
+Compress the snapshots
+    u(x; mu) = exp(- mu x),   x in [0, 1]
+for mu in [1, 5], both with the standard POD and with the incremental SVD
+"""
+
+def _test_proper_orthogonal_decomposition(V, X, incremental_svd_rank):
+    # Define the POD
+    pod = ProperOrthogonalDecomposition(V, X)
+    if incremental_svd_rank is not None:
+        pod.set_incremental_svd_rank(incremental_svd_rank)
+    
+    # Store snapshots
+    for mu in linspace(1., 5., 20):
+        pod.store_snapshot(interpolate(Expression("exp(- mu*x[0])", mu=mu, element=V.ufl_element()), V))
+    
+    # Compress
+    (eigenvalues, _, basis_functions, N) = pod.apply(5, 0.)
+    assert N == 5
+    return (eigenvalues, pod.retained_energy[:N], basis_functions)
+
+# ~~~ Test function ~~~ #
+def test_proper_orthogonal_decomposition_incremental_svd():
+    mesh = UnitIntervalMesh(100)
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    X = assemble(inner(u, v)*dx)
+    
+    (eigenvalues, retained_energy, basis_functions) = _test_proper_orthogonal_decomposition(V, X, None)
+    (eigenvalues_incremental, retained_energy_incremental, basis_functions_incremental) = _test_proper_orthogonal_decomposition(V, X, 5)
+    
+    # Snapshots decay fast enough for the truncated incremental SVD to match the standard POD
+    assert allclose(eigenvalues_incremental, eigenvalues, rtol=1.e-6, atol=1.e-12*eigenvalues[0])
+    assert allclose(retained_energy_incremental, retained_energy, rtol=1.e-10)
+    
+    # Basis functions are orthonormal and coincide up to their sign
+    for (basis_function, basis_function_incremental) in zip(basis_functions, basis_functions_incremental):
+        assert isclose(transpose(basis_function_incremental)*X*basis_function_incremental, 1.)
+        assert isclose(abs(transpose(basis_function)*X*basis_function_incremental), 1.)
@@ -0,0 +1,456 @@
+# Copyright (C) 2015-2019 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import io
+import json
+import os
+import pytest
+from math import sqrt
+from numpy import allclose, array_equal, asarray, isclose, isnan
+from numpy.linalg import norm
+from dolfin import CompiledSubDomain, Constant, DirichletBC, FunctionSpace, grad, inner, Measure, MeshFunction, TestFunction, TrialFunction, UnitSquareMesh
+from rbnics import assemble_operator_for_stability_factor, compute_theta_for_stability_factor, EllipticCoerciveCompliantProblem, EllipticCoerciveProblem, EquispacedDistribution, generate_function_space_for_stability_factor, OnlineEvaluationEngine, ReducedBasis, SCM
+from rbnics.backends import transpose
+
+"""
+Reduce a thermal block problem on the unit square, with conductivity mu[0] on the left half and 1 on the right half,
+a flux mu[1] on the top boundary and a Dirichlet boundary condition on the left boundary, which is non homogeneous
+if a lifting is required.
+"""
+
+# Auxiliary functions
+def ThermalBlock(Parent):
+    class ThermalBlock_Class(Parent):
+        def __init__(self, V, **kwargs):
+            self._name = kwargs["name"] # required by the parent initialization
+            Parent.__init__(self, V, **kwargs)
+            self.subdomains, self.boundaries = kwargs["subdomains"], kwargs["boundaries"]
+            self.lifting = kwargs["lifting"]
+            self.u = TrialFunction(V)
+            self.v = TestFunction(V)
+            self.dx = Measure("dx")(subdomain_data=self.subdomains)
+            self.ds = Measure("ds")(subdomain_data=self.boundaries)
+        
+        def name(self):
+            return self._name
+        
+        def get_stability_factor_lower_bound(self):
+            return min(self.compute_theta("a"))
+        
+        def compute_theta(self, term):
+            mu = self.mu
+            if term == "a":
+                return (mu[0], 1.)
+            elif term == "f":
+                return (mu[1], )
+            elif term == "dirichlet_bc":
+                return (1., )
+            else:
+                raise ValueError("Invalid term for compute_theta().")
+        
+        def assemble_operator(self, term):
+            v = self.v
+            dx = self.dx
+            if term == "a":
+                u = self.u
+                a0 = inner(grad(u), grad(v))*dx(1)
+                a1 = inner(grad(u), grad(v))*dx(2)
+                return (a0, a1)
+            elif term == "f":
+                ds = self.ds
+                f0 = v*ds(1)
+                return (f0, )
+            elif term == "dirichlet_bc":
+                bc0 = [DirichletBC(self.V, Constant(1. if self.lifting else 0.), self.boundaries, 2)]
+                return (bc0, )
+            elif term == "inner_product":
+                u = self.u
+                x0 = inner(grad(u), grad(v))*dx
+                return (x0, )
+            else:
+                raise ValueError("Invalid term for assemble_operator().")
+    
+    return ThermalBlock_Class
+
+def ThermalBlockSCM():
+    ThermalBlock_Base = ThermalBlock(EllipticCoerciveProblem)
+    
+    @SCM()
+    class ThermalBlockSCM_Class(ThermalBlock_Base):
+        @generate_function_space_for_stability_factor
+        def __init__(self, V, **kwargs):
+            ThermalBlock_Base.__init__(self, V, **kwargs)
+            self._eigen_solver_parameters.update({
+                "bounding_box_minimum": {"problem_type": "gen_hermitian", "spectral_transform": "shift-and-invert", "spectral_shift": 1.e-5, "linear_solver": "mumps"},
+                "bounding_box_maximum": {"problem_type": "gen_hermitian", "spectral_transform": "shift-and-invert", "spectral_shift": 1.e5, "linear_solver": "mumps"},
+                "stability_factor": {"problem_type": "gen_hermitian", "spectral_transform": "shift-and-invert", "spectral_shift": 1.e-5, "linear_solver": "mumps"}
+            })
+        
+        @compute_theta_for_stability_factor
+        def compute_theta(self, term):
+            return ThermalBlock_Base.compute_theta(self, term)
+        
+        @assemble_operator_for_stability_factor
+        def assemble_operator(self, term):
+            return ThermalBlock_Base.assemble_operator(self, term)
+    
+    return ThermalBlockSCM_Class
+
+def generate_problem(tempdir, name, Problem, lifting=False):
+    mesh = UnitSquareMesh(8, 8)
+    subdomains = MeshFunction("size_t", mesh, mesh.topology().dim(), 2)
+    CompiledSubDomain("x[0] <= 0.5").mark(subdomains, 1)
+    boundaries = MeshFunction("size_t", mesh, mesh.topology().dim() - 1, 0)
+    CompiledSubDomain("on_boundary && near(x[1], 1.)").mark(boundaries, 1)
+    CompiledSubDomain("on_boundary && near(x[0], 0.)").mark(boundaries, 2)
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    problem = Problem(V, subdomains=subdomains, boundaries=boundaries, lifting=lifting, name=os.path.join(tempdir, name))
+    problem.set_mu_range([(0.1, 10.), (-1., 1.)])
+    if lifting:
+        problem.set_mu((1., 1.))
+    return problem
+
+def generate_reduction_method(problem, Nmax=4, training_set_size=20):
+    reduction_method = ReducedBasis(problem)
+    reduction_method.set_Nmax(Nmax)
+    reduction_method.set_tolerance(0.)
+    reduction_method.initialize_training_set(training_set_size)
+    return reduction_method
+
+# Test that error estimation operators updated incrementally after each enrichment equal the ones assembled from scratch
+@pytest.mark.parametrize("lifting", [False, True])
+def test_reduced_basis_incremental_error_estimation_operators(tempdir, lifting):
+    problem = generate_problem(tempdir, "ThermalBlock", ThermalBlock(EllipticCoerciveProblem), lifting=lifting)
+    reduction_method = generate_reduction_method(problem)
+    reduced_problem = reduction_method.offline()
+    assert reduced_problem.N == 4
+    assert reduced_problem.N_bc == (1 if lifting else 0)
+    
+    X = reduced_problem._error_estimation_inner_product
+    riesz = reduced_problem.riesz
+    for q0 in range(2):
+        assert len(riesz["a"][q0]) == 4 + reduced_problem.N_bc
+        for q1 in range(2):
+            assert allclose(reduced_problem.error_estimation_operator["a", "a"][q0, q1], transpose(riesz["a"][q0])*X*riesz["a"][q1])
+        assert allclose(reduced_problem.error_estimation_operator["a", "f"][q0, 0], transpose(riesz["a"][q0])*X*riesz["f"][0][0])
+    assert isclose(reduced_problem.error_estimation_operator["f", "f"][0, 0], transpose(riesz["f"][0][0])*X*riesz["f"][0][0])
+
+# Test that reduced operators projected incrementally after each enrichment equal the ones projected from scratch,
+# also after the basis has been rebuilt (e.g., by POD) and then enriched again
+@pytest.mark.parametrize("lifting", [False, True])
+def test_reduced_basis_incremental_projection(tempdir, lifting):
+    problem = generate_problem(tempdir, "ThermalBlockIncrementalProjection" + str(lifting), ThermalBlock(EllipticCoerciveProblem), lifting=lifting)
+    reduction_method = generate_reduction_method(problem)
+    reduction_method.set_incremental_projection(True)
+    reduced_problem = reduction_method.offline()
+    assert reduced_problem._incremental_projection
+    assert len(reduced_problem._incremental_projection_cache) > 0
+    
+    def assert_reduced_operators_equal_to_projection_from_scratch():
+        Z = reduced_problem.basis_functions
+        for q in range(2):
+            assert allclose(reduced_problem.operator["a"][q], transpose(Z)*problem.operator["a"][q]*Z)
+        assert allclose(reduced_problem.operator["f"][0], transpose(Z)*problem.operator["f"][0])
+        assert allclose(reduced_problem.inner_product[0], transpose(Z)*problem.inner_product[0]*Z)
+        
+    assert_reduced_operators_equal_to_projection_from_scratch()
+    
+    # Rebuild the basis with copies of all but the first basis function in reverse order: the previous basis functions
+    # are not the first ones of the rebuilt basis, hence operators are projected from scratch
+    basis_functions = list(reduced_problem.basis_functions)
+    reduced_problem.basis_functions.clear()
+    for basis_function in reversed(basis_functions[1:]):
+        reduced_problem.basis_functions.enrich(basis_function)
+    reduced_problem.build_reduced_operators()
+    assert_reduced_operators_equal_to_projection_from_scratch()
+    
+    # Enrich the rebuilt basis: operators are projected incrementally again
+    reduced_problem.basis_functions.enrich(basis_functions[0])
+    reduced_problem.build_reduced_operators()
+    assert_reduced_operators_equal_to_projection_from_scratch()
+    
+    # Disable incremental projection
+    reduction_method.set_incremental_projection(False)
+    assert not reduced_problem._incremental_projection
+    assert len(reduced_problem._incremental_projection_cache) == 0
+
+# Test that vectorized error estimation for a batch of parameters agrees with error estimation for one parameter at a time
+@pytest.mark.parametrize("Parent, lifting", [
+    (EllipticCoerciveProblem, False),
+    (EllipticCoerciveProblem, True),
+    (EllipticCoerciveCompliantProblem, False)
+])
+def test_reduced_basis_estimate_error_batch(tempdir, Parent, lifting):
+    problem = generate_problem(tempdir, "ThermalBlock" + Parent.__name__ + str(lifting), ThermalBlock(Parent), lifting=lifting)
+    reduction_method = generate_reduction_method(problem)
+    reduced_problem = reduction_method.offline()
+    mus = reduction_method.training_set[:10]
+    mu = (5., 0.5)
+    reduced_problem.set_mu(mu)
+    
+    # The vectorized implementation is actually used, and the current parameter is preserved
+    assert reduced_problem._get_residual_norm_squared_and_stability_factor_lower_bound_batch(mus) is not NotImplemented
+    error_estimators = reduced_problem.estimate_error_batch(mus)
+    assert reduced_problem.mu == mu
+    assert problem.mu == mu
+    
+    # Compare to the error estimators computed for one parameter at a time
+    expected_error_estimators = list()
+    for mu_i in mus:
+        reduced_problem.set_mu(mu_i)
+        reduced_problem.solve()
+        expected_error_estimators.append(reduced_problem.estimate_error())
+    assert allclose(error_estimators, expected_error_estimators)
+
+# Test the adaptive training set mode of the greedy, with an analytic error estimator equal to the (scaled) distance from
+# the closest parameter selected so far
+def test_reduced_basis_greedy_adaptive_training_set(tempdir):
+    problem = generate_problem(tempdir, "ThermalBlockAdaptive", ThermalBlock(EllipticCoerciveProblem))
+    reduction_method = ReducedBasis(problem)
+    reduction_method.set_Nmax(100)
+    reduction_method.set_tolerance(0.3)
+    reduction_method.initialize_training_set(100, sampling=EquispacedDistribution())
+    reduction_method.set_greedy_adaptive_training_set(initial_size=10, enrichment_size=3, exploration_size=1, seed=0)
+    training_set = reduction_method.training_set
+    training_set_indices = {mu: i for (i, mu) in enumerate(training_set)}
+    mu_scaling = asarray([10. - 0.1, 1. - (-1.)])
+    selected_parameters = list()
+    evaluated_indices = list()
+    
+    def analytic_error_estimator(mu):
+        if len(selected_parameters) == 0:
+            return 1.
+        else:
+            return min(norm((asarray(mu) - asarray(selected_mu))/mu_scaling) for selected_mu in selected_parameters)
+    
+    def error_estimator(mu):
+        evaluated_indices.append(training_set_indices[mu])
+        return analytic_error_estimator(mu)
+    
+    def maximize_error_estimator():
+        del evaluated_indices[:]
+        (error_estimator_max, error_estimator_argmax) = reduction_method._maximize_error_estimator(error_estimator)
+        reduction_method.greedy_error_estimators.append(error_estimator_max)
+        return (error_estimator_max, error_estimator_argmax)
+    
+    # The initial error estimator is maximized over the whole training set, and the initial active set is enriched
+    (error_estimator_max, error_estimator_argmax) = maximize_error_estimator()
+    assert sorted(evaluated_indices) == list(range(len(training_set)))
+    assert error_estimator_max == 1.
+    assert len(reduction_method._active_training_set_indices) == 10 + 3 + 1
+    assert len(set(reduction_method._active_training_set_indices)) == 10 + 3 + 1
+    
+    # Iterate until the tolerance is met on the active set, enriching it at every iteration
+    verified = False
+    while error_estimator_max/reduction_method.greedy_error_estimators[0] >= reduction_method.tol:
+        selected_parameters.append(training_set[error_estimator_argmax])
+        active_training_set_indices = reduction_method._active_training_set_indices.copy()
+        (error_estimator_max, error_estimator_argmax) = maximize_error_estimator()
+        assert sorted(evaluated_indices[:len(active_training_set_indices)]) == sorted(active_training_set_indices)
+        assert isclose(error_estimator_max, max(analytic_error_estimator(training_set[i]) for i in evaluated_indices))
+        if len(evaluated_indices) == len(active_training_set_indices):
+            # Tolerance is not met on the active set, which is hence enriched
+            assert error_estimator_argmax in active_training_set_indices
+            assert len(reduction_method._active_training_set_indices) == min(len(active_training_set_indices) + 3 + 1, len(training_set))
+        else:
+            # Tolerance is met on the active set, and it is verified on the remaining training parameters
+            verified = True
+            assert sorted(evaluated_indices) == list(range(len(training_set)))
+        assert len(selected_parameters) < len(training_set)
+    assert verified
+    assert len(reduction_method._active_training_set_indices) < len(training_set)
+    
+    # The final maximum error estimator over the whole training set is below the tolerance
+    assert max(analytic_error_estimator(mu) for mu in training_set)/reduction_method.greedy_error_estimators[0] < reduction_method.tol
+    
+    # Parameters violating the tolerance outside the active set are activated by the verification sweep
+    violating_indices = [i for i in range(len(training_set)) if i not in reduction_method._active_training_set_indices][:3]
+    active_training_set_indices = reduction_method._active_training_set_indices.copy()
+    
+    def violating_error_estimator(mu):
+        evaluated_indices.append(training_set_indices[mu])
+        return 1. if training_set_indices[mu] in violating_indices else 0.
+    
+    del evaluated_indices[:]
+    (error_estimator_max, error_estimator_argmax) = reduction_method._maximize_error_estimator(violating_error_estimator)
+    assert sorted(evaluated_indices) == list(range(len(training_set)))
+    assert error_estimator_max == 1.
+    assert error_estimator_argmax in violating_indices
+    assert array_equal(reduction_method._active_training_set_indices[:len(active_training_set_indices)], active_training_set_indices)
+    assert sorted(reduction_method._active_training_set_indices[len(active_training_set_indices):]) == violating_indices
+
+# Test the selection of several well separated parameters at each greedy iteration, with an analytic error estimator
+def test_reduced_basis_greedy_multiple_parameters(tempdir):
+    problem = generate_problem(tempdir, "ThermalBlockMultipleParameters", ThermalBlock(EllipticCoerciveProblem))
+    reduction_method = ReducedBasis(problem)
+    reduction_method.set_Nmax(10)
+    reduction_method.initialize_training_set(100, sampling=EquispacedDistribution())
+    reduction_method.set_greedy_multiple_parameters(4, separation=0.2)
+    reduction_method._init_offline()
+    assert reduction_method.reduced_problem.N == 0
+    training_set = reduction_method.training_set
+    mu_scaling = asarray([10. - 0.1, 1. - (-1.)])*sqrt(2.)
+    
+    def scaled_distance(mu_1, mu_2):
+        return norm((asarray(mu_1) - asarray(mu_2))/mu_scaling)
+    
+    def error_estimator(mu):
+        return (mu[0] - 0.1)/9.9 + 2.*mu[1]
+    
+    error_estimators = [error_estimator(mu) for mu in training_set]
+    for (Nmax, expected_size) in ((10, 4), (2, 2)):
+        reduction_method.set_Nmax(Nmax)
+        (error_estimator_max, error_estimator_argmax) = reduction_method._maximize_error_estimator(error_estimator)
+        selected_batch = reduction_method._greedy_selected_batch
+        selected_indices = [index for (_, index) in selected_batch]
+        
+        # The number of selected parameters is clipped to the ones required to reach the maximum reduced space dimension
+        assert len(selected_batch) == expected_size
+        
+        # Parameters are selected in order of decreasing error estimator, starting from the maximum one
+        assert (error_estimator_max, error_estimator_argmax) == selected_batch[0]
+        assert isclose(error_estimator_max, max(error_estimators))
+        assert all(isclose(error_estimators[index], selected_error_estimator) for (selected_error_estimator, index) in selected_batch)
+        assert all(selected_batch[i][0] >= selected_batch[i + 1][0] for i in range(len(selected_batch) - 1))
+        
+        # Selected parameters are well separated in the scaled parameter space, and any unselected parameter with a larger
+        # error estimator than the last selected one is too close to a selected one
+        for (i, index_i) in enumerate(selected_indices):
+            for index_j in selected_indices[:i]:
+                assert scaled_distance(training_set[index_i], training_set[index_j]) >= 0.2
+        for index in range(len(training_set)):
+            if index not in selected_indices and error_estimators[index] > selected_batch[-1][0]:
+                assert min(scaled_distance(training_set[index], training_set[selected_index]) for selected_index in selected_indices) < 0.2
+    
+    # Separation is measured in the scaled parameter space: the parameter with the second largest error estimator is not
+    # selected, since it is too close to the first selected one in the scaled parameter space (but not in the original one)
+    second_index = sorted(range(len(training_set)), key=lambda index: error_estimators[index])[-2]
+    assert norm(asarray(training_set[second_index]) - asarray(training_set[error_estimator_argmax])) >= 0.2
+    assert second_index not in selected_indices
+
+# Test that stability factor lower bounds computed by a pool of local processes during the SCM greedy agree with
+# the ones computed serially
+def test_reduced_basis_scm_process_pool(tempdir):
+    SCM_approximations = dict()
+    for process_pool_size in (None, 2):
+        problem = generate_problem(tempdir, "ThermalBlockSCM" + str(process_pool_size), ThermalBlockSCM())
+        reduction_method = ReducedBasis(problem)
+        reduction_method.set_Nmax(4, SCM=3)
+        reduction_method.set_tolerance(0., SCM=0.)
+        reduction_method.initialize_training_set(16, SCM=16, sampling=EquispacedDistribution())
+        reduction_method.SCM_reduction.set_greedy_process_pool_size(process_pool_size)
+        SCM_approximations[process_pool_size] = reduction_method.SCM_reduction.offline()
+    (serial_SCM_approximation, pooled_SCM_approximation) = (SCM_approximations[None], SCM_approximations[2])
+    assert serial_SCM_approximation.N == 3
+    assert pooled_SCM_approximation.N == 3
+    assert list(pooled_SCM_approximation.greedy_selected_parameters) == list(serial_SCM_approximation.greedy_selected_parameters)
+    for mu in serial_SCM_approximation.training_set:
+        serial_SCM_approximation.set_mu(mu)
+        pooled_SCM_approximation.set_mu(mu)
+        for N in range(1, 4):
+            assert isclose(pooled_SCM_approximation.get_stability_factor_lower_bound(N), serial_SCM_approximation.get_stability_factor_lower_bound(N))
+
+# Test evaluation of a batch of parameters by the online evaluation engine
+def test_reduced_basis_online_evaluation_engine_evaluate(tempdir):
+    problem = generate_problem(tempdir, "ThermalBlockOnlineEvaluate", ThermalBlock(EllipticCoerciveCompliantProblem))
+    reduction_method = generate_reduction_method(problem)
+    reduced_problem = reduction_method.offline()
+    engine = OnlineEvaluationEngine(reduced_problem)
+    mus = reduction_method.training_set[:6]._list
+    
+    # Evaluation with the full reduced basis size, and with a given N
+    for N in (None, 2):
+        arrays = engine.evaluate(mus, N=N)
+        assert array_equal(arrays["N"], [N or 4]*len(mus))
+        assert arrays["solution"].shape == (len(mus), N or 4)
+        for (i, mu) in enumerate(mus):
+            reduced_problem.set_mu(mu)
+            solution = reduced_problem.solve(N)
+            assert allclose(arrays["solution"][i], asarray(solution.vector()))
+            assert isclose(arrays["output"][i], reduced_problem.compute_output())
+            assert isclose(arrays["error_estimator"][i], reduced_problem.estimate_error())
+    arrays = engine.evaluate(mus, N=2, quantities=("error_estimator", ))
+    assert set(arrays.keys()) == {"N", "error_estimator"}
+    
+    # Evaluation with a tolerance, which selects N for each parameter, padding solutions with nan
+    error_estimators = dict()
+    for (i, mu) in enumerate(mus):
+        reduced_problem.set_mu(mu)
+        for N in range(1, 5):
+            reduced_problem.solve(N)
+            error_estimators[i, N] = reduced_problem.estimate_error()
+    tolerance = sorted([error_estimators[i, 2] for i in range(len(mus))])[len(mus)//2]
+    arrays = engine.evaluate(mus, tolerance=tolerance)
+    for (i, mu) in enumerate(mus):
+        N_mu = min([N for N in range(1, 5) if error_estimators[i, N] <= tolerance], default=4)
+        assert arrays["N"][i] == N_mu
+        assert isclose(arrays["error_estimator"][i], error_estimators[i, N_mu])
+        reduced_problem.set_mu(mu)
+        solution = reduced_problem.solve(N_mu)
+        assert allclose(arrays["solution"][i, :N_mu], asarray(solution.vector()))
+        assert isnan(arrays["solution"][i, N_mu:]).all()
+    assert len(set(arrays["N"])) > 1
+    
+    # Invalid arguments
+    with pytest.raises(ValueError):
+        engine.evaluate(mus, N=2, tolerance=tolerance)
+    with pytest.raises(ValueError):
+        engine.evaluate([(1., 0., 0.)])
+    with pytest.raises(ValueError):
+        engine.evaluate(mus, quantities=("velocity", ))
+        
+# Test the line based JSON protocol of the online evaluation engine
+def test_reduced_basis_online_evaluation_engine_serve(tempdir):
+    problem = generate_problem(tempdir, "ThermalBlockOnlineServe", ThermalBlock(EllipticCoerciveCompliantProblem))
+    reduction_method = generate_reduction_method(problem)
+    reduced_problem = reduction_method.offline()
+    engine = OnlineEvaluationEngine(reduced_problem)
+    mus = reduction_method.training_set[:6]._list
+    tolerance = sorted(engine.evaluate(mus, N=2, quantities=("error_estimator", ))["error_estimator"])[len(mus)//2]
+    queries = [
+        {"mu": [list(mu) for mu in mus], "N": 2},
+        {"mu": [list(mu) for mu in mus], "tolerance": tolerance, "quantities": ["solution"]},
+        [list(mu) for mu in mus],
+        {"N": 2},
+        {"mu": [[1., 0., 0.]]},
+        {"mu": [list(mus[0])], "quantities": ["velocity"]},
+        {"mu": [list(mus[0])], "N": "2"}
+    ]
+    input_stream = io.StringIO("\n".join([json.dumps(query) for query in queries] + ["", "not a JSON object"]) + "\n")
+    output_stream = io.StringIO()
+    engine.serve(input_stream, output_stream)
+    answers = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+    assert len(answers) == len(queries) + 1 # empty lines are skipped
+    
+    # Valid queries
+    arrays = engine.evaluate(mus, N=2)
+    assert set(answers[0].keys()) == {"N", "solution", "output", "error_estimator"}
+    assert answers[0]["N"] == [2]*len(mus)
+    for quantity in ("solution", "output", "error_estimator"):
+        assert allclose(answers[0][quantity], arrays[quantity])
+    arrays = engine.evaluate(mus, tolerance=tolerance, quantities=("solution", ))
+    assert set(answers[1].keys()) == {"N", "solution"}
+    assert answers[1]["N"] == arrays["N"].tolist()
+    for (answer_solution, solution) in zip(answers[1]["solution"], arrays["solution"]):
+        assert [value is None for value in answer_solution] == isnan(solution).tolist() # nan are converted to null
+        assert allclose([value for value in answer_solution if value is not None], solution[~isnan(solution)])
+    
+    # Invalid queries
+    for (answer, error) in zip(answers[2:], ("TypeError", "ValueError", "ValueError", "ValueError", "TypeError", "JSONDecodeError")):
+        assert list(answer.keys()) == ["error"]
+        assert answer["error"].startswith(error + ": ")
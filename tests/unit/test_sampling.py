@@ -17,13 +17,13 @@
 #
 
 from math import log
-from numpy import linspace, random
+from numpy import allclose, floor, linspace, random, unique
 import scipy.stats as stats
 import matplotlib
 import matplotlib.pyplot as plt
 from distutils.version import LooseVersion
 from rbnics.sampling import ParameterSpaceSubset
-from rbnics.sampling.distributions import DrawFrom, EquispacedDistribution, LogUniformDistribution, UniformDistribution
+from rbnics.sampling.distributions import DrawFrom, EquispacedDistribution, HaltonDistribution, LatinHypercubeDistribution, LogUniformDistribution, SobolDistribution, UniformDistribution
 
 # Common data
 box = [(2., 5.), (10., 1000.)]
@@ -181,3 +181,46 @@ def test_sampling_composite_log_uniform_and_beta():
     plot(0, box, parameter_space_subset, bins, stats_loguniform, loc=box[0][min], scale=box[0][max]-box[0][min])
     plot(1, box, parameter_space_subset, bins, stats.beta, a=2, b=5, loc=box[1][min], scale=box[1][max]-box[1][min])
     plt.show()
+
+# Latin hypercube generator
+def test_sampling_latin_hypercube():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=LatinHypercubeDistribution())
+    # Each of the n strata of each component is sampled exactly once
+    for p in range(len(box)):
+        strata = floor([(mu[p] - box[p][min])/(box[p][max] - box[p][min])*n for mu in parameter_space_subset])
+        assert len(unique(strata)) == n
+    plot(0, box, parameter_space_subset, bins, stats.uniform, loc=box[0][min], scale=box[0][max]-box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats.uniform, loc=box[1][min], scale=box[1][max]-box[1][min])
+    plt.show()
+
+# Sobol generator
+def test_sampling_sobol():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=SobolDistribution())
+    plot(0, box, parameter_space_subset, bins, stats.uniform, loc=box[0][min], scale=box[0][max]-box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats.uniform, loc=box[1][min], scale=box[1][max]-box[1][min])
+    plt.show()
+
+# Halton generator
+def test_sampling_halton():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=HaltonDistribution())
+    plot(0, box, parameter_space_subset, bins, stats.uniform, loc=box[0][min], scale=box[0][max]-box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats.uniform, loc=box[1][min], scale=box[1][max]-box[1][min])
+    plt.show()
+
+# Seeded generators: successive sets sampled by the same distribution are different, while the sequence of sets
+# sampled by distributions with the same seed is reproducible
+def test_sampling_seed():
+    for Distribution in (UniformDistribution, LatinHypercubeDistribution, SobolDistribution, HaltonDistribution):
+        distribution = Distribution(seed=1)
+        assert distribution.is_reproducible()
+        training_set = distribution.sample_array(box, 100)
+        testing_set = distribution.sample_array(box, 100)
+        assert not allclose(training_set, testing_set)
+        other_distribution = Distribution(seed=1)
+        assert other_distribution == distribution
+        assert allclose(other_distribution.sample_array(box, 100), training_set)
+        assert allclose(other_distribution.sample_array(box, 100), testing_set)
+        assert not allclose(Distribution(seed=2).sample_array(box, 100), training_set)
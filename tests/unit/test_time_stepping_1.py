@@ -17,7 +17,7 @@
 #
 
 import pytest
-from numpy import dot, isclose
+from numpy import allclose, asarray, dot, eye, isclose
 from numpy.linalg import norm as monitor_norm
 from dolfin import assemble, Constant, derivative, DirichletBC, DOLFIN_EPS, dx, Expression, FunctionSpace, grad, inner, IntervalMesh, PETScOptions, pi, plot, project, sin, TestFunction, TrialFunction
 import matplotlib
@@ -288,3 +288,95 @@ def test_time_stepping_1():
         assert isclose(error_dense_beuler, error_sparse_form_callbacks_beuler).all()
         if has_IDA:
             _test_time_stepping_1_dense("ida", V, dt, monitor_dt, T, u, u_dot, g, r, j_u, j_u_dot, X, exact_solution_expression, exact_solution, exact_solution_dot)
+    
+# ~~~ Batch of dense problems ~~~ #
+@pytest.mark.time_stepping
+@pytest.mark.parametrize("time_invariant_lhs", [None, True, False])
+def test_time_stepping_1_solve_batch(time_invariant_lhs, monkeypatch):
+    from math import cos, sin
+    import rbnics.backends.online.numpy.time_stepping as numpy_time_stepping
+    from rbnics.backends.online.numpy import Function, Matrix, TimeStepping, Vector
+    
+    # Count factorizations carried out by solve_batch
+    factorizations = list()
+    Factorization = numpy_time_stepping.Factorization
+    
+    class CountingFactorization(Factorization):
+        def __init__(self, matrix):
+            Factorization.__init__(self, matrix)
+            factorizations.append(self)
+            
+    monkeypatch.setattr(numpy_time_stepping, "Factorization", CountingFactorization)
+    
+    # Define a family of problems u_t + K(mu) u = f(t), with boundary conditions on the first two unknowns
+    N = 6
+    K = 2*eye(N) - eye(N, k=1) - eye(N, k=-1)
+    
+    class ProblemWrapper(TimeDependentProblemWrapper):
+        def __init__(self, mu):
+            self.mu = mu
+            
+        def set_time(self, t):
+            pass
+            
+        def residual_eval(self, t, solution, solution_dot):
+            residual = Vector(N)
+            residual[:] = solution_dot.vector() + dot(eye(N) + self.mu*K, solution.vector()) - cos(t)
+            return residual
+            
+        def jacobian_eval(self, t, solution, solution_dot, solution_dot_coefficient):
+            jacobian = Matrix(N, N)
+            jacobian[:, :] = solution_dot_coefficient*eye(N) + eye(N) + self.mu*K
+            return jacobian
+            
+        def bc_eval(self, t):
+            return (sin(t), sin(t))
+            
+        def ic_eval(self):
+            return Function(N)
+            
+        def monitor(self, t, solution, solution_dot):
+            self.solutions_over_time.append(asarray(solution.vector()).copy())
+            
+    parameters = {
+        "initial_time": 0.0,
+        "time_step_size": 0.1,
+        "final_time": 1.0,
+        "integrator_type": "beuler",
+        "problem_type": "linear",
+        "time_invariant_lhs": time_invariant_lhs
+    }
+    mus = [1., 2., 1.]
+    
+    # Solve each problem separately
+    solutions_over_time = list()
+    for mu in mus:
+        problem_wrapper = ProblemWrapper(mu)
+        problem_wrapper.solutions_over_time = list()
+        solver = TimeStepping(problem_wrapper, Function(N), Function(N))
+        solver.set_parameters(parameters)
+        solver.solve()
+        solutions_over_time.append(problem_wrapper.solutions_over_time)
+        
+    # Solve all problems at once
+    problem_wrapper = ProblemWrapper(None)
+    
+    def set_problem(i):
+        problem_wrapper.mu = mus[i]
+        
+    solver = TimeStepping(problem_wrapper, Function(N), Function(N))
+    solver.set_parameters(parameters)
+    del factorizations[:]
+    batch_solutions_over_time = solver.solve_batch(set_problem, len(mus))
+    assert len(batch_solutions_over_time) == len(mus)
+    for (batch_solutions_over_time_i, solutions_over_time_i) in zip(batch_solutions_over_time, solutions_over_time):
+        assert len(batch_solutions_over_time_i) == len(solutions_over_time_i) == 11
+        for (batch_solution, solution) in zip(batch_solutions_over_time_i, solutions_over_time_i):
+            assert allclose(batch_solution.vector(), solution)
+            
+    # Problems sharing the same left-hand side are solved together, and left-hand sides are factorized
+    # only once unless they are required to be re-evaluated at every time step
+    if time_invariant_lhs is False:
+        assert len(factorizations) == 2*10
+    else:
+        assert len(factorizations) == 2